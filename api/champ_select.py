@@ -0,0 +1,152 @@
+# api/champ_select.py
+from dataclasses import dataclass, replace
+
+TEAM_SIZE = 5
+
+# Slot value no session holds: a slot that couldn't be drawn yet
+UNRENDERED = -1
+
+PICK_FIELDS = {"champ": "champion_id", "spell1": "spell1_id", "spell2": "spell2_id"}
+
+
+@dataclass(frozen=True)
+class PickSlot:
+    champion_id: int = 0
+    spell1_id: int = 0
+    spell2_id: int = 0
+
+
+EMPTY_PICKS = (PickSlot(),) * TEAM_SIZE
+EMPTY_BANS = (0,) * TEAM_SIZE
+EMPTY_PLAYERS = ("",) * TEAM_SIZE
+
+
+@dataclass(frozen=True)
+class ChampSelectSnapshot:
+    """
+    What the champ select screen shows: 5 picks and 5 bans per side (0 =
+    empty), and the puuid of the player in each pick slot ("" = hidden).
+    """
+    blue_picks: tuple = EMPTY_PICKS
+    red_picks: tuple = EMPTY_PICKS
+    blue_bans: tuple = EMPTY_BANS
+    red_bans: tuple = EMPTY_BANS
+    blue_players: tuple = EMPTY_PLAYERS
+    red_players: tuple = EMPTY_PLAYERS
+
+    @classmethod
+    def from_session(cls, data):
+        """Build a snapshot from an LCU /lol-champ-select/v1/session payload."""
+        blue_team = []
+        red_team = []
+        blue_players = []
+        red_players = []
+        for champ in data.get("myTeam", []) + data.get("theirTeam", []):
+            slot = PickSlot(
+                champion_id=champ.get("championId") or 0,
+                spell1_id=champ.get("spell1Id") or 0,
+                spell2_id=champ.get("spell2Id") or 0,
+            )
+            if champ.get("team") == 1:
+                blue_team.append(slot)
+                blue_players.append(champ.get("puuid") or "")
+            else:
+                red_team.append(slot)
+                red_players.append(champ.get("puuid") or "")
+
+        # Blue bans fill left to right, red bans right to left
+        blue_bans = [0] * TEAM_SIZE
+        red_bans = [0] * TEAM_SIZE
+        blue_ban_index = 0
+        red_ban_index = TEAM_SIZE - 1
+        for group in data.get("actions", []):
+            for action in group:
+                if action.get("type") != "ban" or not action.get("completed"):
+                    continue
+                champ_id = action.get("championId") or 0
+                if champ_id <= 0:
+                    continue
+                if action.get("isAllyAction"):
+                    if blue_ban_index < TEAM_SIZE:
+                        blue_bans[blue_ban_index] = champ_id
+                        blue_ban_index += 1
+                elif red_ban_index >= 0:
+                    red_bans[red_ban_index] = champ_id
+                    red_ban_index -= 1
+
+        return cls(
+            blue_picks=_pad(blue_team, PickSlot()),
+            red_picks=_pad(red_team, PickSlot()),
+            blue_bans=tuple(blue_bans),
+            red_bans=tuple(red_bans),
+            blue_players=_pad(blue_players, ""),
+            red_players=_pad(red_players, ""),
+        )
+
+    def changes(self, previous):
+        """
+        Yield (kind, side, index, value) for every slot that differs from
+        `previous`. kind is "champ", "spell1", "spell2", "ban" or "player"
+        (value is the slot's puuid); side is "blue" or "red".
+        """
+        if previous == self:
+            return
+        for side, picks, old_picks in (
+            ("blue", self.blue_picks, previous.blue_picks),
+            ("red", self.red_picks, previous.red_picks),
+        ):
+            for i, (new, old) in enumerate(zip(picks, old_picks)):
+                if new == old:
+                    continue
+                if new.champion_id != old.champion_id:
+                    yield "champ", side, i, new.champion_id
+                if new.spell1_id != old.spell1_id:
+                    yield "spell1", side, i, new.spell1_id
+                if new.spell2_id != old.spell2_id:
+                    yield "spell2", side, i, new.spell2_id
+
+        for side, bans, old_bans in (
+            ("blue", self.blue_bans, previous.blue_bans),
+            ("red", self.red_bans, previous.red_bans),
+        ):
+            for i, (new, old) in enumerate(zip(bans, old_bans)):
+                if new != old:
+                    yield "ban", side, i, new
+
+        for side, players, old_players in (
+            ("blue", self.blue_players, previous.blue_players),
+            ("red", self.red_players, previous.red_players),
+        ):
+            for i, (new, old) in enumerate(zip(players, old_players)):
+                if new != old:
+                    yield "player", side, i, new
+
+    def with_unrendered(self, slots):
+        """
+        Copy with the given (kind, side, index) pick, spell or ban slots set
+        to UNRENDERED, so changes() against it yields them again.
+        """
+        if not slots:
+            return self
+        picks = {"blue": list(self.blue_picks), "red": list(self.red_picks)}
+        bans = {"blue": list(self.blue_bans), "red": list(self.red_bans)}
+        for kind, side, index in slots:
+            if kind == "ban":
+                bans[side][index] = UNRENDERED
+            else:
+                picks[side][index] = replace(picks[side][index], **{PICK_FIELDS[kind]: UNRENDERED})
+        return replace(
+            self,
+            blue_picks=tuple(picks["blue"]),
+            red_picks=tuple(picks["red"]),
+            blue_bans=tuple(bans["blue"]),
+            red_bans=tuple(bans["red"]),
+        )
+
+
+EMPTY_SNAPSHOT = ChampSelectSnapshot()
+
+
+def _pad(items, empty):
+    items = items[:TEAM_SIZE]
+    return tuple(items) + (empty,) * (TEAM_SIZE - len(items))
@@ -1,10 +1,66 @@
 import os
+import glob
+import hashlib
 import json
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from api.transport import get_shared_transport
+from api.icon_pack import IconPack, build_icon_pack
+from utils.files import write_atomic
+
+
+def champion_mapping(data):
+    """champion key -> champion name, from a parsed champion.json."""
+    return {int(entry["key"]): entry["id"] for entry in data["data"].values()}
+
+
+def spell_mapping(data):
+    """spellId -> icon filename, from a parsed summoner.json."""
+    spell_id_to_filename = {}
+
+    for spell in data["data"].values():
+        id_name = spell["id"]               # e.g. "SummonerFlash"
+        key = spell["key"]                 # e.g. "4" or "SummonerFlash"
+
+        # Only use numeric keys
+        if key.isdigit():
+            filename = id_name + ".png"
+            spell_id_to_filename[key] = filename
+
+    return spell_id_to_filename
+
+
+def entry_checksum(entry):
+    """
+    Checksum of a champion or spell entry, leaving out what changes every
+    patch anyway (version, sprite offsets). A new checksum means the entry
+    was edited this patch, the only time its art may have changed too.
+    """
+    entry = {key: value for key, value in entry.items() if key not in ("version", "image")}
+    return hashlib.sha1(json.dumps(entry, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def icon_images(champion_data, spell_data):
+    """
+    Icon key ("champion/Ahri.png", "spell/SummonerFlash.png") -> (the image
+    file Data Dragon names for it (image.full), entry_checksum()).
+    """
+    images = {}
+    for entry in champion_data["data"].values():
+        images[f"champion/{entry['id']}.png"] = ((entry.get("image") or {}).get("full"),
+                                                 entry_checksum(entry))
+    for spell in spell_data["data"].values():
+        if spell["key"].isdigit():
+            images[f"spell/{spell['id']}.png"] = ((spell.get("image") or {}).get("full"),
+                                                  entry_checksum(spell))
+    return images
+
 
 class ChampionData:
-    def __init__(self, base_path="assets/champions"):
+    def __init__(self, base_path="assets/champions", transport=None, refresh=True,
+                 ddragon_root="https://ddragon.leagueoflegends.com"):
         self.base_path = base_path
+        self.transport = transport or get_shared_transport()
+        self.ddragon_root = ddragon_root  # e.g. "http://127.0.0.1:8000" for a local stub
         os.makedirs(self.base_path, exist_ok=True)
 
         # Champion files
@@ -16,103 +72,222 @@ class ChampionData:
         self.spell_json_path = os.path.join("assets", "summoner.json")
         os.makedirs(self.spell_base_path, exist_ok=True)
 
+        # Just the mappings above, per patch: what every launch actually loads
+        self.index_path = os.path.join("assets", "data_index.json")
+
+        # Patch, Data Dragon file name and ETag of every stored icon
+        self.manifest_path = os.path.join("assets", "icon_manifest.json")
+
+        # Packed icons of the current patch (assets/icons_<patch>.pack), if built
+        self.icon_pack = None
+
         # Local mappings
         self.current_patch = None
         self.id_to_name = {}            # champion key -> champion name
         self.spell_id_to_filename = {}  # spellId -> filename
 
-        # Load everything
-        self.load()
+        # Load everything. With refresh=False only the local cache is read and
+        # the caller is expected to run refresh() later (e.g. on a worker thread).
+        if refresh:
+            self.load()
+        else:
+            self.load_cached()
 
     # ---------------- PATCH + CHAMPIONS ----------------
     def load(self):
+        self.load_cached()
+        self.refresh()
+
+    def load_cached(self):
+        """Load whatever patch data is on disk. Never touches the network."""
+        self.current_patch = self.get_cached_patch()
+        if not self.load_index():
+            # No index for this patch yet: parse the full files once
+            self.load_champion_json()
+            self.load_spell_json()
+            self.write_index()
+        self.open_icon_pack()
+
+    def refresh(self, progress=None):
+        """
+        Check Data Dragon for a new patch and swap its data in, then make
+        sure every icon of the current patch is on disk.
+
+        Safe to run on a worker thread: the new files are written to temp
+        files and renamed into place, and the lookup tables are replaced
+        only once fully built. Returns True if a new patch was loaded.
+        """
+        changed = False
         latest_patch = self.fetch_latest_patch()
-        cached_patch = self.get_cached_patch()
+        if latest_patch and latest_patch != self.get_cached_patch():
+            champion_text = self.download_champion_json(latest_patch)
+            spell_text = self.download_spell_json(latest_patch)
+            if champion_text is not None and spell_text is not None:
+                changed = self.install_patch(latest_patch, champion_text, spell_text)
+
+        # Drop icons whose image changed in this patch (or that it no longer has)
+        if self.current_patch and self.read_patch_cache().get("assets_patch") != self.current_patch:
+            self.retire_changed_icons()
+
+        # New patch, or a prefetch that was interrupted last time
+        if self.current_patch and self.read_patch_cache().get("icons_patch") != self.current_patch:
+            self.prefetch_icons(progress=progress)
+
+        # Pack the complete icon set once per patch
+        if (self.current_patch and self.read_patch_cache().get("icons_patch") == self.current_patch
+                and not os.path.exists(self.icon_pack_path(self.current_patch))):
+            self.build_icon_pack()
+        elif changed:
+            self.open_icon_pack()
+        return changed
+
+    def install_patch(self, patch, champion_text, spell_text):
+        """Parse a downloaded patch once, store it and swap its mappings in."""
+        try:
+            id_to_name = champion_mapping(json.loads(champion_text))
+            spell_id_to_filename = spell_mapping(json.loads(spell_text))
+        except (ValueError, KeyError) as e:
+            print("Failed to parse patch data:", e)
+            return False
 
-        if cached_patch != latest_patch:
-            self.update_patch(latest_patch)
-            self.download_champion_json(latest_patch)
-            self.download_spell_json(latest_patch)
+        write_atomic(self.champion_json_path, champion_text)
+        write_atomic(self.spell_json_path, spell_text)
+        self.update_patch(patch)  # before the index, so the index matches it
 
-        self.load_champion_json()
-        self.load_spell_json()
+        self.id_to_name = id_to_name
+        self.spell_id_to_filename = spell_id_to_filename
+        self.write_index()
+        # The old patch's pack would keep serving its icons under the same names
+        self.open_icon_pack()
+        return True
 
     def fetch_latest_patch(self):
-        url = "https://ddragon.leagueoflegends.com/api/versions.json"
+        """
+        Latest patch on Data Dragon, or None on failure. The validators of
+        versions.json are stored with the patch they listed (latest_patch),
+        which need not be installed yet: a 304 answers with that patch, so a
+        failed install is retried on the next refresh.
+        """
+        url = f"{self.ddragon_root}/api/versions.json"
+        cache = self.read_patch_cache()
+
+        # Conditional request: a 304 means latest_patch is still the latest
+        headers = {}
+        if cache.get("latest_patch"):
+            if cache.get("etag"):
+                headers["If-None-Match"] = cache["etag"]
+            if cache.get("last_modified"):
+                headers["If-Modified-Since"] = cache["last_modified"]
+
         try:
-            r = requests.get(url, timeout=5)
+            r = self.transport.get(url, headers=headers, timeout=5, endpoint="ddragon versions")
+            if r.status_code == 304 and headers:
+                return cache["latest_patch"]
             r.raise_for_status()
-            return r.json()[0]
+            latest_patch = r.json()[0]
         except Exception as e:
             print("Failed to fetch latest patch:", e)
             return None
 
-    def get_cached_patch(self):
+        self.write_patch_cache(
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+            latest_patch=latest_patch
+        )
+        return latest_patch
+
+    def read_patch_cache(self):
         if not os.path.exists(self.patch_file):
-            return None
+            return {}
         try:
             with open(self.patch_file, "r") as f:
-                return json.load(f).get("patch")
+                return json.load(f)
         except:
-            return None
+            return {}
+
+    def write_patch_cache(self, **fields):
+        """
+        Update fields of cached_patch.json (patch, etag, last_modified,
+        latest_patch, assets_patch, icons_patch).
+        """
+        cache = self.read_patch_cache()
+        for key, value in fields.items():
+            if value is None:
+                cache.pop(key, None)
+            else:
+                cache[key] = value
+        write_atomic(self.patch_file, json.dumps(cache))
+
+    def get_cached_patch(self):
+        return self.read_patch_cache().get("patch")
 
     def update_patch(self, patch):
+        self.write_patch_cache(patch=patch)
         self.current_patch = patch
-        with open(self.patch_file, "w") as f:
-            json.dump({"patch": patch}, f)
 
     # ---------------- CHAMPIONS ----------------
     def download_champion_json(self, patch):
-        url = f"https://ddragon.leagueoflegends.com/cdn/{patch}/data/en_US/champion.json"
+        """Return the champion.json text for `patch`, or None on failure."""
+        url = f"{self.ddragon_root}/cdn/{patch}/data/en_US/champion.json"
         try:
-            r = requests.get(url)
+            r = self.transport.get(url, endpoint="ddragon champion.json")
             r.raise_for_status()
-            with open(self.champion_json_path, "w", encoding="utf-8") as f:
-                f.write(r.text)
+            return r.text
         except Exception as e:
             print("Failed to download champion.json:", e)
+            return None
 
     def load_champion_json(self):
         if not os.path.exists(self.champion_json_path):
             return
         with open(self.champion_json_path, "r", encoding="utf-8") as f:
             data = json.load(f)
-        self.id_to_name = {int(entry["key"]): entry["id"] for entry in data["data"].values()}
+        self.id_to_name = champion_mapping(data)
 
     def get_champion_name(self, champ_id):
         return self.id_to_name.get(champ_id)
 
-    def get_champion_icon(self, champ_id):
+    def find_champion_icon(self, champ_id):
+        """Icon path if it is in the pack or on disk, else None. Never downloads."""
         name = self.get_champion_name(champ_id)
         if not name:
             return None
         icon_path = os.path.join(self.base_path, f"{name}.png")
+        if self.icon_pack is not None and f"champion/{name}.png" in self.icon_pack:
+            return icon_path  # served from the pack, no filesystem lookup
         if os.path.exists(icon_path):
             return icon_path
-        patch = self.get_cached_patch()
-        if not patch:
+        return None
+
+    def get_champion_icon(self, champ_id):
+        """Icon path, downloading the icon if needed (blocking: not on the GUI thread)."""
+        icon_path = self.find_champion_icon(champ_id)
+        if icon_path:
+            return icon_path
+        # Only reached when prefetch_icons() hasn't completed for this patch
+        name = self.get_champion_name(champ_id)
+        patch = self.current_patch
+        if not name or not patch:
             return None
-        url = f"https://ddragon.leagueoflegends.com/cdn/{patch}/img/champion/{name}.png"
+        icon_path = os.path.join(self.base_path, f"{name}.png")
+        url = f"{self.ddragon_root}/cdn/{patch}/img/champion/{name}.png"
         try:
-            r = requests.get(url)
-            r.raise_for_status()
-            with open(icon_path, "wb") as f:
-                f.write(r.content)
+            self.download_icon(url, icon_path)
             return icon_path
         except:
             return None
 
     # ---------------- SUMMONER SPELLS ----------------
     def download_spell_json(self, patch):
-        url = f"https://ddragon.leagueoflegends.com/cdn/{patch}/data/en_US/summoner.json"
+        """Return the summoner.json text for `patch`, or None on failure."""
+        url = f"{self.ddragon_root}/cdn/{patch}/data/en_US/summoner.json"
         try:
-            r = requests.get(url)
+            r = self.transport.get(url, endpoint="ddragon summoner.json")
             r.raise_for_status()
-            data = r.json()
-            with open(self.spell_json_path, "w", encoding="utf-8") as f:
-                json.dump(data, f)
+            return r.text
         except Exception as e:
             print("Failed to download summoner.json:", e)
+            return None
 
     def load_spell_json(self):
         if not os.path.exists(self.spell_json_path):
@@ -120,38 +295,318 @@ class ChampionData:
 
         with open(self.spell_json_path, "r", encoding="utf-8") as f:
             data = json.load(f)
-
-        self.spell_id_to_filename = {}
-
-        for spell in data["data"].values():
-            id_name = spell["id"]               # e.g. "SummonerFlash"
-            key = spell["key"]                 # e.g. "4" or "SummonerFlash"
-
-            # Only use numeric keys
-            if key.isdigit():
-                filename = id_name + ".png"
-                self.spell_id_to_filename[key] = filename
+        self.spell_id_to_filename = spell_mapping(data)
 
 
-    def get_spell_icon(self, spell_id):
-        spell_id = str(spell_id)
-        if spell_id not in self.spell_id_to_filename:
+    def find_spell_icon(self, spell_id):
+        """Icon path if it is in the pack or on disk, else None. Never downloads."""
+        filename = self.spell_id_to_filename.get(str(spell_id))
+        if not filename:
             return None
-        filename = self.spell_id_to_filename[spell_id]
         icon_path = os.path.join(self.spell_base_path, filename)
+        if self.icon_pack is not None and f"spell/{filename}" in self.icon_pack:
+            return icon_path  # served from the pack, no filesystem lookup
         if os.path.exists(icon_path):
             return icon_path
+        return None
 
-        patch = self.get_cached_patch()
-        if not patch:
+    def get_spell_icon(self, spell_id):
+        """Icon path, downloading the icon if needed (blocking: not on the GUI thread)."""
+        icon_path = self.find_spell_icon(spell_id)
+        if icon_path:
+            return icon_path
+        filename = self.spell_id_to_filename.get(str(spell_id))
+        patch = self.current_patch
+        if not filename or not patch:
             return None
-        url = f"https://ddragon.leagueoflegends.com/cdn/{patch}/img/spell/{filename}"
+        icon_path = os.path.join(self.spell_base_path, filename)
+        url = f"{self.ddragon_root}/cdn/{patch}/img/spell/{filename}"
         try:
-            r = requests.get(url)
-            r.raise_for_status()
-            with open(icon_path, "wb") as f:
-                f.write(r.content)
+            self.download_icon(url, icon_path)
             return icon_path
         except Exception as e:
             print(f"Failed to download spell icon {filename}:", e)
             return None
+
+    # ---------------- SLIM INDEX ----------------
+    def load_index(self):
+        """Load the mappings from data_index.json. False if missing or for another patch."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not self.current_patch or index.get("patch") != self.current_patch:
+            return False
+
+        self.id_to_name = {int(key): name for key, name in index["champions"].items()}
+        self.spell_id_to_filename = index["spells"]
+        return True
+
+    def write_index(self):
+        if not self.current_patch or not self.id_to_name:
+            return
+        index = {
+            "patch": self.current_patch,
+            "champions": {str(key): name for key, name in self.id_to_name.items()},
+            "spells": self.spell_id_to_filename,
+        }
+        try:
+            write_atomic(self.index_path, json.dumps(index, separators=(",", ":")))
+        except OSError as e:
+            print("Failed to write data index:", e)
+
+    # ---------------- ICON PREFETCH ----------------
+    def download_icon(self, url, icon_path, etag=None):
+        """
+        Download an icon to icon_path and return its ETag. With the ETag of
+        the file already there, a 304 keeps the file and returns the ETag.
+        """
+        headers = {"If-None-Match": etag} if etag else {}
+        r = self.transport.get(url, headers=headers, endpoint="ddragon icon")
+        if r.status_code == 304 and etag:
+            return etag
+        r.raise_for_status()
+        write_atomic(icon_path, r.content)
+        return r.headers.get("ETag")
+
+    def icon_files(self):
+        """(key, local path) for every champion and spell icon of the current patch."""
+        return [
+            (f"champion/{name}.png", os.path.join(self.base_path, f"{name}.png"))
+            for name in self.id_to_name.values()
+        ] + [
+            (f"spell/{filename}", os.path.join(self.spell_base_path, filename))
+            for filename in self.spell_id_to_filename.values()
+        ]
+
+    def missing_icons(self):
+        """(key, path) for every icon of the current patch not on disk yet."""
+        return [(key, path) for key, path in self.icon_files() if not os.path.exists(path)]
+
+    def prefetch_icons(self, max_workers=8, progress=None):
+        """
+        Download every missing icon of the current patch concurrently.
+
+        Files are written atomically, so an interrupted run leaves only
+        complete icons behind and the next run picks up where it stopped.
+        progress(done, total) is called from worker threads. Returns the
+        number of icons that failed to download.
+        """
+        patch = self.current_patch
+        if not patch:
+            return 0
+
+        cdn = f"{self.ddragon_root}/cdn/{patch}/img"
+        total = len(self.id_to_name) + len(self.spell_id_to_filename)
+        missing = self.missing_icons()
+        done = total - len(missing)
+        failed = 0
+        fetched = []
+        if progress:
+            progress(done, total)
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    pool.submit(self.download_icon, f"{cdn}/{key}", path): key
+                    for key, path in missing
+                }
+                for future in as_completed(futures):
+                    try:
+                        fetched.append((futures[future], future.result()))
+                    except Exception as e:
+                        failed += 1
+                        print(f"Failed to prefetch {futures[future]}:", e)
+                    done += 1
+                    if progress:
+                        progress(done, total)
+
+        if fetched:
+            manifest = self.read_manifest()
+            for key, etag in fetched:
+                manifest.setdefault(key, {}).update(patch=patch, etag=etag)
+            self.write_manifest(manifest)
+        if not failed:
+            self.write_patch_cache(icons_patch=patch)
+        return failed
+
+    # ---------------- PATCH-VERSIONED ICONS ----------------
+    def read_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def write_manifest(self, manifest):
+        write_atomic(self.manifest_path, json.dumps(manifest, separators=(",", ":")))
+
+    def retire_changed_icons(self, max_workers=8):
+        """
+        Compare the current patch's data files with the manifest and delete
+        every icon that was renamed or is no longer in the game, so
+        prefetch_icons() re-downloads only those. Icons whose data entry is
+        unchanged are kept without a request. Those whose entry was edited
+        (or that have no checksum yet) are revalidated against this patch's
+        URL with their ETag: a 304 keeps the file, new art replaces it.
+        Icons without an ETag are downloaded again.
+        """
+        try:
+            with open(self.champion_json_path, "r", encoding="utf-8") as f:
+                champion_data = json.load(f)
+            with open(self.spell_json_path, "r", encoding="utf-8") as f:
+                spell_data = json.load(f)
+            images = icon_images(champion_data, spell_data)
+        except (OSError, ValueError, KeyError) as e:
+            print("Failed to read patch data for icon diff:", e)
+            return False
+
+        patch = self.current_patch
+        old_manifest = self.read_manifest()
+        manifest = {}
+        for key, (full, checksum) in images.items():
+            entry = old_manifest.get(key) or {}
+            if not (entry.get("patch") and entry.get("full") == full and entry.get("etag")):
+                manifest[key] = {"full": full, "checksum": checksum, "patch": None}  # new or renamed
+            elif entry.get("checksum") == checksum:
+                manifest[key] = dict(entry, patch=patch)         # untouched: still current
+            else:
+                manifest[key] = dict(entry, checksum=checksum)   # edited: revalidate below
+
+        # Delete stale and orphaned files before the manifest claims they're current
+        for kind, folder in (("champion", self.base_path), ("spell", self.spell_base_path)):
+            try:
+                filenames = os.listdir(folder)
+            except OSError:
+                continue
+            for filename in filenames:
+                key = f"{kind}/{filename}"
+                if key in manifest and manifest[key]["patch"] is not None:
+                    continue
+                if filename.endswith(".tmp"):
+                    continue  # another thread's write_atomic in progress
+                try:
+                    os.remove(os.path.join(folder, filename))
+                except OSError:
+                    pass
+
+        replaced = self.revalidate_icons(manifest, max_workers)
+        self.write_manifest(manifest)
+        if replaced or any(entry["patch"] is None for entry in manifest.values()):
+            # Icons to fetch again: the icon set (and its pack) is incomplete
+            self.write_patch_cache(assets_patch=patch, icons_patch=None)
+            self.remove_icon_pack(patch)
+        else:
+            self.write_patch_cache(assets_patch=patch)
+        return True
+
+    def revalidate_icons(self, manifest, max_workers=8):
+        """
+        Conditional GET of every kept icon still marked with an older patch.
+        Updates the manifest entries in place; an icon that can't be
+        checked is deleted, for prefetch_icons() to fetch. Returns the
+        number of icons whose art changed.
+        """
+        patch = self.current_patch
+        folders = {"champion": self.base_path, "spell": self.spell_base_path}
+        stale = [key for key, entry in manifest.items() if entry["patch"] not in (None, patch)]
+        if not stale:
+            return 0
+
+        def revalidate(key):
+            kind, filename = key.split("/", 1)
+            url = f"{self.ddragon_root}/cdn/{patch}/img/{key}"
+            return self.download_icon(url, os.path.join(folders[kind], filename), manifest[key]["etag"])
+
+        replaced = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(revalidate, key): key for key in stale}
+            for future in as_completed(futures):
+                key = futures[future]
+                entry = manifest[key]
+                try:
+                    etag = future.result()
+                except Exception as e:
+                    print(f"Failed to revalidate {key}:", e)
+                    kind, filename = key.split("/", 1)
+                    try:
+                        os.remove(os.path.join(folders[kind], filename))
+                    except OSError:
+                        pass
+                    entry.update(patch=None, etag=None)
+                    continue
+                if etag != entry["etag"]:
+                    replaced += 1
+                entry.update(patch=patch, etag=etag)
+        return replaced
+
+    # ---------------- ICON PACK ----------------
+    def icon_pack_path(self, patch):
+        return os.path.join("assets", f"icons_{patch}.pack")
+
+    def build_icon_pack(self):
+        """Pack every icon of the current patch into one memory-mappable file."""
+        patch = self.current_patch
+        if not patch:
+            return False
+        pack_path = self.icon_pack_path(patch)
+        try:
+            build_icon_pack(pack_path, self.icon_files())
+        except OSError as e:
+            print("Failed to build icon pack:", e)
+            return False
+
+        # Packs of older patches are no longer needed
+        for old_path in glob.glob(os.path.join("assets", "icons_*.pack")):
+            if os.path.normpath(old_path) != os.path.normpath(pack_path):
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+        return self.open_icon_pack()
+
+    def remove_icon_pack(self, patch):
+        pack_path = self.icon_pack_path(patch)
+        if self.icon_pack is not None and self.icon_pack.path == pack_path:
+            old_pack, self.icon_pack = self.icon_pack, None
+            old_pack.close()
+        try:
+            os.remove(pack_path)
+        except OSError:
+            pass
+
+    def open_icon_pack(self):
+        """Map the current patch's pack, if there is one. Returns True if opened."""
+        pack = None
+        pack_path = self.icon_pack_path(self.current_patch) if self.current_patch else None
+        if pack_path and os.path.exists(pack_path):
+            try:
+                pack = IconPack(pack_path)
+            except (OSError, ValueError) as e:
+                print("Failed to open icon pack:", e)
+
+        old_pack, self.icon_pack = self.icon_pack, pack
+        if old_pack is not None:
+            old_pack.close()
+        return pack is not None
+
+    def read_icon(self, icon_path):
+        """
+        Bytes of an icon returned by get_champion_icon/get_spell_icon, read
+        from the mapped pack. None if it isn't packed (read the file instead).
+        """
+        pack = self.icon_pack
+        if pack is None:
+            return None
+        folder, filename = os.path.split(os.path.normpath(icon_path))
+        if folder == os.path.normpath(self.base_path):
+            kind = "champion"
+        elif folder == os.path.normpath(self.spell_base_path):
+            kind = "spell"
+        else:
+            return None
+        try:
+            return pack.get(f"{kind}/{filename}")
+        except ValueError:
+            return None  # pack was closed by a concurrent swap
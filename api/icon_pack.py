@@ -0,0 +1,79 @@
+# api/icon_pack.py
+import json
+import mmap
+import os
+import struct
+
+# File layout:
+#   8 bytes   magic
+#   4 bytes   index length (little-endian uint32)
+#   N bytes   index: JSON {name: [offset, length]}, offsets relative to the data
+#   ...       concatenated image bytes
+MAGIC = b"LSTPACK1"
+HEADER = struct.Struct("<8sI")
+
+
+def build_icon_pack(path, entries):
+    """
+    Pack icon files into one file at `path`.
+
+    entries is an iterable of (name, file_path). Files that don't exist are
+    skipped. Written via a temp file + rename. Returns the number of icons packed.
+    """
+    index = {}
+    blobs = []
+    offset = 0
+    for name, file_path in entries:
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        index[name] = [offset, len(data)]
+        blobs.append(data)
+        offset += len(data)
+
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for data in blobs:
+            f.write(data)
+    os.replace(tmp_path, path)
+    return len(index)
+
+
+class IconPack:
+    """Read-only, memory-mapped view of a file written by build_icon_pack()."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, index_len = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not an icon pack: {path}")
+        start = HEADER.size
+        self._index = json.loads(self._mm[start:start + index_len])
+        self._data_start = start + index_len
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, name):
+        """Bytes of icon `name`, read straight from the mapping, or None."""
+        entry = self._index.get(name)
+        if entry is None:
+            return None
+        offset, length = entry
+        start = self._data_start + offset
+        return self._mm[start:start + length]
+
+    def close(self):
+        self._mm.close()
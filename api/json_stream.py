@@ -0,0 +1,132 @@
+# api/json_stream.py
+import codecs
+import json
+
+WHITESPACE = " \t\n\r"
+# What may follow an array item; a number or literal is only complete once one does
+ITEM_DELIMITERS = ",]" + WHITESPACE
+
+
+class _Chunks:
+    """Text buffer fed from an iterable of byte chunks, consumed from the front."""
+
+    def __init__(self, byte_chunks, encoding="utf-8"):
+        self._chunks = iter(byte_chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def more(self):
+        """Append the next chunk. Returns False at end of input."""
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                # Drop what has been consumed, so the buffer stays about one chunk long
+                self.buf = self.buf[self.pos:] + text
+                self.pos = 0
+                return True
+        self.buf = self.buf[self.pos:] + self._decoder.decode(b"", final=True)
+        self.pos = 0
+        self.eof = True
+        return False
+
+    def next_char(self):
+        """Next non-whitespace character without consuming it, or None at the end."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return None
+
+
+def _find_key(chunks, key):
+    """
+    Consume input up to and including `"key":`, skipping string contents,
+    so the key's name inside a string value doesn't match.
+    """
+    token = json.dumps(key)
+    in_string = escaped = False
+    start = 0
+    while True:
+        while chunks.pos < len(chunks.buf):
+            char = chunks.buf[chunks.pos]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+                    if chunks.buf[start:chunks.pos + 1] == token:
+                        chunks.pos += 1
+                        if chunks.next_char() == ":":
+                            chunks.pos += 1
+                            return True
+                        continue
+            elif char == '"':
+                in_string = True
+                start = chunks.pos
+            chunks.pos += 1
+
+        if in_string:
+            # Keep the open string: rescan it from its quote once more input arrives
+            chunks.pos = start
+            in_string = escaped = False
+        if not chunks.more():
+            return False
+
+
+def iter_array(byte_chunks, key, encoding="utf-8"):
+    """
+    Yield the items of the first array stored under `key` in a JSON
+    document, decoding them one at a time from `byte_chunks` (e.g. a
+    streamed response's iter_content()). Only the current item and the
+    unread part of the current chunk are held in memory.
+
+    Raises ValueError if the key isn't found or the document is cut off.
+    """
+    decoder = json.JSONDecoder()
+    chunks = _Chunks(byte_chunks, encoding)
+
+    while True:
+        if not _find_key(chunks, key):
+            raise ValueError(f"No array under {key!r} in JSON stream")
+        if chunks.next_char() == "[":
+            break
+    chunks.pos += 1
+
+    first = True
+    while True:
+        char = chunks.next_char()
+        if char is None:
+            raise ValueError("JSON stream ended inside an array")
+        if char == "]":
+            return
+        if not first:
+            if char != ",":
+                raise ValueError(f"Expected ',' in JSON array, got {char!r}")
+            chunks.pos += 1
+            if chunks.next_char() is None:
+                raise ValueError("JSON stream ended inside an array")
+        first = False
+
+        while True:
+            try:
+                item, end = decoder.raw_decode(chunks.buf, chunks.pos)
+                # "1" may be the start of "1.5e3" when the next chunk arrives
+                complete = isinstance(item, (dict, list, str)) or (
+                    end < len(chunks.buf) and chunks.buf[end] in ITEM_DELIMITERS
+                )
+                if complete or chunks.eof:
+                    break
+            except json.JSONDecodeError:
+                if chunks.eof:
+                    raise ValueError("Truncated item in JSON stream")
+            chunks.more()
+        chunks.pos = end
+        yield item
@@ -0,0 +1,133 @@
+# api/lcu_events.py
+import base64
+import json
+import ssl
+import threading
+
+try:
+    import websocket  # websocket-client
+except ImportError:
+    websocket = None
+
+
+CHAMP_SELECT_EVENT = "OnJsonApiEvent_lol-champ-select_v1_session"
+
+# WAMP 1.0 message types used by the LCU
+WAMP_SUBSCRIBE = 5
+WAMP_EVENT = 8
+
+
+class LCUEventStream:
+    """
+    Subscription to one LCU WAMP event over the client's WebSocket.
+
+    Runs in a daemon thread. Every event payload ({"data", "eventType",
+    "uri"}) is passed to on_event; on_state(True/False) reports when the
+    socket connects or drops, so callers can fall back to polling. After a
+    drop it rediscovers the client credentials and reconnects; while the
+    client stays unreachable, the delay between attempts doubles from
+    `retry_delay` up to `max_retry_delay`.
+    """
+
+    def __init__(self, client, event, on_event, on_state=None, retry_delay=2.0, max_retry_delay=30.0):
+        self.client = client
+        self.event = event
+        self.on_event = on_event
+        self.on_state = on_state
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._stop = threading.Event()
+        self._ws = None
+        self._thread = None
+
+    @staticmethod
+    def available():
+        return websocket is not None
+
+    def start(self):
+        if not self.available() or self.is_running():
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="lcu-events", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    # ----------------------------------------------------
+    # Worker thread
+    # ----------------------------------------------------
+    def _run(self):
+        delay = self.retry_delay
+        while not self._stop.is_set():
+            info = self.client.client_info()
+            if info is not None:
+                if self._listen(info):
+                    delay = self.retry_delay  # was connected: the client may just have restarted
+                # Dropped or refused: the client picks a new port when it restarts
+                self.client.forget_client_info(info)
+            if self._stop.is_set():
+                break
+            self._stop.wait(delay)
+            delay = min(delay * 2, self.max_retry_delay)
+
+    def _listen(self, info):
+        """
+        Listen until the socket drops, with the (protocol, port, token) of
+        LeagueClient.client_info(). Returns False if it couldn't connect.
+        """
+        protocol, port, token = info
+        scheme = "wss" if protocol == "https" else "ws"
+        url = f"{scheme}://{self.client.host}:{port}/"
+        auth = base64.b64encode(f"riot:{token}".encode()).decode()
+
+        try:
+            ws = websocket.create_connection(
+                url,
+                header=[f"Authorization: Basic {auth}"],
+                subprotocols=["wamp"],
+                sslopt={"cert_reqs": ssl.CERT_NONE, "check_hostname": False},
+                timeout=5,
+            )
+        except Exception:
+            return False
+
+        self._ws = ws
+        try:
+            ws.send(json.dumps([WAMP_SUBSCRIBE, self.event]))
+            ws.settimeout(None)
+            self._set_state(True)
+            while not self._stop.is_set():
+                message = ws.recv()
+                if not message:
+                    continue
+                try:
+                    msg = json.loads(message)
+                except ValueError:
+                    continue
+                if len(msg) >= 3 and msg[0] == WAMP_EVENT and msg[1] == self.event:
+                    self.on_event(msg[2])
+        except Exception:
+            pass
+        finally:
+            self._ws = None
+            try:
+                ws.close()
+            except Exception:
+                pass
+            self._set_state(False)
+        return True
+
+    def _set_state(self, connected):
+        if self.on_state:
+            self.on_state(connected)
@@ -1,27 +1,127 @@
 # api/league_client.py
+import os
 import subprocess
+import sys
 import json
 import base64
-import requests
 import re
+import threading
+import time
 import requests
 import urllib3
 from urllib3.exceptions import InsecureRequestWarning
+from api.transport import get_shared_transport
+from api.lcu_events import LCUEventStream, CHAMP_SELECT_EVENT
+from api.routing import platform_for_region
 
 # Disable warnings for insecure HTTPS requests
 urllib3.disable_warnings(InsecureRequestWarning)
 
 
+# Where the client writes its lockfile ("name:pid:port:password:protocol")
+DEFAULT_LOCKFILE_PATHS = [
+    r"C:\Riot Games\League of Legends\lockfile",
+    "/Applications/League of Legends.app/Contents/LoL/lockfile",
+    os.path.expanduser("~/Games/league-of-legends/drive_c/Riot Games/League of Legends/lockfile"),
+]
+
+
 class LeagueClient:
-    def __init__(self):
+    """
+    Long-lived connection to the local League client (LCU) API.
+
+    The port and token are discovered once, from the client's lockfile if
+    one is found, otherwise by scanning the LeagueClientUx process command
+    line. They are cached until a request fails to connect, then discovered
+    again (the client picks a new port every time it restarts).
+
+    While the client isn't running, only the lockfile is checked on every
+    call; the process scan is retried after `scan_backoff` seconds,
+    doubling up to `max_scan_backoff`.
+
+    Thread safe: the event stream and several UI workers share one
+    instance. Discovery runs under a lock, and client_info() hands out the
+    protocol, port and token as one consistent tuple.
+    """
+
+    def __init__(self, transport=None, lockfile_path=None, host="127.0.0.1",
+                 scan_backoff=5.0, max_scan_backoff=30.0, clock=time.monotonic):
         self.port = None
         self.token = None
+        self.platform = None  # server the client is logged in to, see get_platform()
+        self.protocol = "https"
+        self.host = host
+        self.transport = transport or get_shared_transport()
+        self.scan_backoff = scan_backoff
+        self.max_scan_backoff = max_scan_backoff
+        self._clock = clock
+        self._next_scan = None   # clock time before which a failed scan isn't repeated
+        self._scan_delay = scan_backoff
+        self._lock = threading.RLock()  # guards the fields above
+
+        # Explicit path first, then $LEAGUE_LOCKFILE, then the usual install locations
+        self.lockfile_paths = []
+        if lockfile_path:
+            self.lockfile_paths.append(lockfile_path)
+        if os.getenv("LEAGUE_LOCKFILE"):
+            self.lockfile_paths.append(os.getenv("LEAGUE_LOCKFILE"))
+        self.lockfile_paths += DEFAULT_LOCKFILE_PATHS
 
     def find_client_info(self):
+        """Find port and token, preferring the lockfile over a process scan."""
+        with self._lock:
+            if self.read_lockfile():
+                self._reset_scan_backoff()
+                return True
+
+            now = self._clock()
+            if self._next_scan is not None and now < self._next_scan:
+                return False  # client wasn't running a moment ago; don't spawn ps/wmic again yet
+            if self.scan_process():
+                self._reset_scan_backoff()
+                return True
+            self._next_scan = now + self._scan_delay
+            self._scan_delay = min(self._scan_delay * 2, self.max_scan_backoff)
+            return False
+
+    def client_info(self):
+        """(protocol, port, token), discovering them if needed; None if the client isn't found."""
+        with self._lock:
+            if not (self.port and self.token) and not self.find_client_info():
+                return None
+            return self.protocol, self.port, self.token
+
+    def _reset_scan_backoff(self):
+        self._next_scan = None
+        self._scan_delay = self.scan_backoff
+
+    def read_lockfile(self):
+        """Read port, token and protocol from the client's lockfile."""
+        for path in self.lockfile_paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    parts = f.read().strip().split(":")
+            except OSError:
+                continue
+
+            if len(parts) >= 5 and parts[2].isdigit():
+                with self._lock:
+                    self.port = parts[2]
+                    self.token = parts[3]
+                    self.protocol = parts[4] or "https"
+                return True
+        return False
+
+    def scan_process(self):
         """Extract port and token from LeagueClientUx process command line."""
+        if sys.platform == "win32":
+            cmd = ['wmic', 'process', 'where', "name='LeagueClientUx.exe'", 'get', 'CommandLine']
+        else:
+            cmd = ['ps', '-A', '-o', 'args']
+
         try:
             result = subprocess.check_output(
-                ['wmic', 'process', 'where', "name='LeagueClientUx.exe'", 'get', 'CommandLine'],
+                cmd,
                 stderr=subprocess.DEVNULL,
                 stdin=subprocess.DEVNULL
             ).decode(errors='ignore')
@@ -30,31 +130,107 @@ class LeagueClient:
             token_match = re.search(r'--remoting-auth-token=([A-Za-z0-9-_]+)', result)
 
             if port_match and token_match:
-                self.port = port_match.group(1)
-                self.token = token_match.group(1)
+                with self._lock:
+                    self.port = port_match.group(1)
+                    self.token = token_match.group(1)
+                    self.protocol = "https"
                 return True
             return False
 
         except Exception:
             return False
 
+    def forget_client_info(self, info=None):
+        """
+        Drop the cached port and token. With `info` (from client_info()),
+        only if they are still the ones that failed: another thread may
+        already have found the restarted client.
+        """
+        with self._lock:
+            if info is not None and info != (self.protocol, self.port, self.token):
+                return
+            self.port = None
+            self.token = None
+            self.platform = None
+
     def request(self, endpoint: str):
         """Perform an HTTPS request to the LCU API."""
-        if not self.port or not self.token:
-            if not self.find_client_info():
-                return None, "Unable to get League client port/token"
+        info = self.client_info()
+        if info is None:
+            return None, "Unable to get League client port/token"
 
-        url = f"https://127.0.0.1:{self.port}{endpoint}"
-        auth = ('riot', self.token)
+        try:
+            response = self._get(endpoint, info)
+        except requests.ConnectionError:
+            # Client restarted or closed: the cached port/token are stale
+            self.forget_client_info(info)
+            info = self.client_info()
+            if info is None:
+                return None, "Unable to get League client port/token"
+            try:
+                response = self._get(endpoint, info)
+            except Exception as e:
+                self.forget_client_info(info)
+                return None, str(e)
+        except Exception as e:
+            return None, str(e)
 
         try:
-            response = requests.get(url, auth=auth, verify=False)
             return response.status_code, response.json()
         except Exception as e:
             return None, str(e)
 
+    def _get(self, endpoint, info):
+        protocol, port, token = info
+        url = f"{protocol}://{self.host}:{port}{endpoint}"
+        auth = ('riot', token)
+        return self.transport.get(url, auth=auth, verify=False, endpoint=f"lcu {endpoint}")
+
+    # -----------------------
+    # Region
+    # -----------------------
+    def get_platform(self):
+        """
+        Platform ("euw1", "na1", ...) of the server the client is logged in
+        to, or None if the client can't tell. Cached until the client
+        restarts.
+        """
+        with self._lock:
+            if self.platform is not None:
+                return self.platform
+        status, data = self.request("/riotclient/region-locale")
+        if status != 200 or not isinstance(data, dict):
+            return None
+        platform = platform_for_region(data.get("region"))
+        with self._lock:
+            self.platform = platform
+        return platform
+
     # -----------------------
     # Champ Select Session
     # -----------------------
     def get_champ_select(self):
         return self.request("/lol-champ-select/v1/session")
+
+    def subscribe_champ_select(self, on_session, on_state=None):
+        """
+        Push champ select changes as they happen instead of polling.
+
+        on_session(session) gets the new session dict, or None when champ
+        select ends. Returns the started LCUEventStream (call stop() on it),
+        or None if websocket-client is not installed or the transport only
+        handles polling (record/replay).
+        """
+        if not getattr(self.transport, "push_events", True):
+            return None
+
+        def on_event(payload):
+            if payload.get("eventType") == "Delete":
+                on_session(None)
+            else:
+                on_session(payload.get("data"))
+
+        stream = LCUEventStream(self, CHAMP_SELECT_EVENT, on_event, on_state)
+        if not stream.start():
+            return None
+        return stream
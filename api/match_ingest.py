@@ -0,0 +1,97 @@
+# api/match_ingest.py
+from concurrent.futures import ThreadPoolExecutor
+
+from api.match_store import MatchStore
+
+PAGE_SIZE = 100  # match-v5 maximum per ids request
+
+
+class MatchIngester:
+    """
+    Incremental match-history sync for tracked players.
+
+    A player's first sync walks back up to `max_matches` games; after
+    that only games created since the newest synced one are listed, so a
+    refresh costs one ids request per player plus one request per new
+    match. Matches are fetched once even when several tracked players
+    were in them, concurrently, with the RiotAPI rate limiter pacing the
+    requests.
+    """
+
+    def __init__(self, api, store=None, max_workers=8, max_matches=100):
+        self.api = api
+        self.store = store or MatchStore()
+        self.max_workers = max_workers
+        self.max_matches = max_matches  # cap for a player's first sync
+
+    def ingest(self, puuid, platform=None):
+        return self.ingest_many([puuid], platform)[puuid]
+
+    def ingest_many(self, puuids, platform=None):
+        """
+        Sync the match history of every puuid, whose games are played on
+        `platform` (default: the API's). Returns {puuid: [new match IDs]}
+        or {puuid: None} when the player's match list couldn't be read.
+        """
+        puuids = list(dict.fromkeys(puuids))
+        if not puuids:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            listed = dict(zip(puuids, pool.map(lambda p: self.list_new_ids(p, platform), puuids)))
+
+            wanted = set()
+            for ids in listed.values():
+                wanted.update(ids or ())
+            to_fetch = wanted - self.store.stored(wanted)
+            failed = {
+                match_id
+                for match_id, ok in zip(to_fetch, pool.map(self.fetch_match, to_fetch))
+                if not ok
+            }
+
+        results = {}
+        for puuid, ids in listed.items():
+            if ids is None:
+                results[puuid] = None
+                continue
+            self.store.link(puuid, [match_id for match_id in ids if match_id not in failed])
+            if ids and not failed.intersection(ids):
+                # Only move the watermark once every game up to it is stored
+                newest = self.store.newest_game(ids)
+                if newest is not None:
+                    self.store.set_synced_until(puuid, max(newest, self.store.synced_until(puuid) or 0))
+            results[puuid] = [match_id for match_id in ids if match_id in to_fetch and match_id not in failed]
+        return results
+
+    def list_new_ids(self, puuid, platform=None):
+        """Match IDs newer than the player's last sync, newest first, or None on failure."""
+        since = self.store.synced_until(puuid)
+        limit = None if since is not None else self.max_matches
+        ids = []
+        while limit is None or len(ids) < limit:
+            count = PAGE_SIZE if limit is None else min(PAGE_SIZE, limit - len(ids))
+            try:
+                status, page = self.api.get_match_ids(puuid, start=len(ids), count=count,
+                                                      since=since, platform=platform)
+            except Exception as e:
+                status, page = None, str(e)
+            if status != 200:
+                print(f"Failed to list matches for {puuid}:", page)
+                return None
+            ids.extend(page)
+            if len(page) < count:
+                break
+        return ids
+
+    def fetch_match(self, match_id):
+        try:
+            status, payload = self.api.get_match(match_id, raw=True)
+            if status != 200:
+                print(f"Failed to fetch match {match_id}:", payload)
+                return False
+            self.store.save_match(match_id, payload)
+            return True
+        except Exception as e:
+            print(f"Failed to fetch match {match_id}:", e)
+            return False
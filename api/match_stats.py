@@ -0,0 +1,125 @@
+# api/match_stats.py
+import numpy as np
+
+# Numeric columns of MatchStore.participant_rows(), in order (champion_name is kept apart)
+NUMERIC_COLUMNS = ("game_creation", "duration", "champion_id", "win", "kills",
+                   "deaths", "assists", "cs", "damage", "team_damage")
+
+
+def rolling_sum(values, window):
+    """Sum of each value and the window - 1 before it (fewer at the start)."""
+    totals = np.concatenate(([0], np.cumsum(values, dtype=np.float64)))
+    ends = np.arange(1, len(values) + 1)
+    return totals[ends] - totals[np.maximum(ends - window, 0)]
+
+
+class PlayerStats:
+    """
+    One player's stored games as columnar NumPy arrays (one entry per game,
+    oldest first), with vectorized summaries: win rate, KDA, CS per minute
+    and share of the team's damage to champions, overall, per champion and
+    as rolling trends.
+    """
+
+    def __init__(self, columns, champion_names):
+        self.columns = columns  # name -> np.ndarray
+        self.champion_names = champion_names  # champion_id -> name
+
+        minutes = self.columns["duration"] / 60.0
+        self.minutes = np.where(minutes > 0, minutes, np.nan)
+        team_damage = self.columns["team_damage"]
+        self.damage_share = np.divide(
+            self.columns["damage"], team_damage,
+            out=np.zeros(len(team_damage)), where=team_damage > 0
+        )
+
+    @classmethod
+    def from_store(cls, store, puuid, queue_id=None):
+        rows = store.participant_rows(puuid, queue_id)
+        if not rows:
+            columns = {name: np.zeros(0, dtype=np.int64) for name in NUMERIC_COLUMNS}
+            return cls(columns, {})
+
+        values = list(zip(*rows))
+        names = values.pop(3)
+        columns = {
+            name: np.array(column, dtype=np.int64)
+            for name, column in zip(NUMERIC_COLUMNS, values)
+        }
+        champion_ids, first = np.unique(columns["champion_id"], return_index=True)
+        champion_names = {int(cid): names[i] for cid, i in zip(champion_ids, first)}
+        return cls(columns, champion_names)
+
+    def __len__(self):
+        return len(self.columns["win"])
+
+    @staticmethod
+    def _ratios(games, wins, kills, deaths, assists, cs, minutes, damage_share):
+        return {
+            "games": games,
+            "wins": wins,
+            "winrate": wins / games if games else None,
+            "kda": float((kills + assists) / max(deaths, 1)),
+            "cs_per_min": float(cs / minutes) if minutes else 0.0,
+            "damage_share": float(damage_share / games) if games else 0.0,
+        }
+
+    def overall(self):
+        c = self.columns
+        return self._ratios(
+            len(self), int(c["win"].sum()), c["kills"].sum(), c["deaths"].sum(),
+            c["assists"].sum(), c["cs"].sum(), np.nansum(self.minutes),
+            self.damage_share.sum()
+        )
+
+    def by_champion(self, min_games=1):
+        """Per-champion summaries, most played first."""
+        if not len(self):
+            return []
+        c = self.columns
+        champion_ids, index = np.unique(c["champion_id"], return_inverse=True)
+
+        def per_champion(values):
+            return np.bincount(index, weights=values, minlength=len(champion_ids))
+
+        games = np.bincount(index, minlength=len(champion_ids))
+        sums = {
+            "wins": per_champion(c["win"]),
+            "kills": per_champion(c["kills"]),
+            "deaths": per_champion(c["deaths"]),
+            "assists": per_champion(c["assists"]),
+            "cs": per_champion(c["cs"]),
+            "minutes": per_champion(np.nan_to_num(self.minutes)),
+            "damage_share": per_champion(self.damage_share),
+        }
+
+        result = []
+        for i in np.argsort(-games, kind="stable"):
+            if games[i] < min_games:
+                continue
+            summary = self._ratios(
+                int(games[i]), int(sums["wins"][i]), sums["kills"][i], sums["deaths"][i],
+                sums["assists"][i], sums["cs"][i], sums["minutes"][i], sums["damage_share"][i]
+            )
+            summary["champion_id"] = int(champion_ids[i])
+            summary["champion"] = self.champion_names.get(int(champion_ids[i]), str(champion_ids[i]))
+            result.append(summary)
+        return result
+
+    def trend(self, window=20):
+        """
+        Rolling statistics over the last `window` games, one entry per game:
+        ts (epoch seconds), winrate, kda, cs_per_min and damage_share arrays.
+        """
+        c = self.columns
+        games = rolling_sum(np.ones(len(self)), window)
+        minutes = rolling_sum(np.nan_to_num(self.minutes), window)
+        return {
+            "ts": c["game_creation"] // 1000,
+            "winrate": rolling_sum(c["win"], window) / games,
+            "kda": (rolling_sum(c["kills"], window) + rolling_sum(c["assists"], window))
+                   / np.maximum(rolling_sum(c["deaths"], window), 1),
+            "cs_per_min": np.divide(rolling_sum(c["cs"], window), minutes,
+                                    out=np.zeros(len(self)), where=minutes > 0),
+            "damage_share": rolling_sum(self.damage_share, window) / games,
+        }
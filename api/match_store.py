@@ -0,0 +1,244 @@
+# api/match_store.py
+import gzip
+import json
+import os
+import sqlite3
+import threading
+
+from utils.files import write_atomic
+
+
+class MatchStore:
+    """
+    Local store of match-v5 documents.
+
+    Each match is kept once, as gzip-compressed JSON in `matches_dir`, no
+    matter how many tracked players were in it. SQLite holds the index:
+    which matches are stored, which players took part in each, and per
+    player the creation time of the newest game a sync has fully covered
+    (`synced_until`), so the next sync only has to ask for newer games.
+    The per-player stats needed for analytics (see api.match_stats) are
+    also copied into a `participants` table, so queries never have to
+    open the documents.
+    """
+
+    def __init__(self, path=os.path.join("assets", "matches.db"),
+                 matches_dir=os.path.join("assets", "matches")):
+        self.path = path
+        self.matches_dir = matches_dir
+        self._lock = threading.Lock()
+
+        os.makedirs(matches_dir, exist_ok=True)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        new_participants_table = not self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'participants'"
+        ).fetchone()
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS matches ("
+                " match_id TEXT PRIMARY KEY,"
+                " game_creation INTEGER,"  # epoch milliseconds
+                " queue_id INTEGER)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS player_matches ("
+                " puuid TEXT NOT NULL,"
+                " match_id TEXT NOT NULL,"
+                " PRIMARY KEY (puuid, match_id)"
+                ") WITHOUT ROWID"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS players ("
+                " puuid TEXT PRIMARY KEY,"
+                " synced_until INTEGER)"  # epoch seconds
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS participants ("
+                " puuid TEXT NOT NULL,"
+                " match_id TEXT NOT NULL,"
+                " game_creation INTEGER,"
+                " queue_id INTEGER,"
+                " duration INTEGER,"  # seconds
+                " champion_id INTEGER,"
+                " champion_name TEXT,"
+                " win INTEGER,"
+                " kills INTEGER,"
+                " deaths INTEGER,"
+                " assists INTEGER,"
+                " cs INTEGER,"
+                " damage INTEGER,"  # to champions
+                " team_damage INTEGER,"
+                " PRIMARY KEY (puuid, match_id)"
+                ") WITHOUT ROWID"
+            )
+        if new_participants_table:
+            self.index_participants()  # matches stored before the table existed
+
+    # ----------------------------------------------------
+    # Match documents
+    # ----------------------------------------------------
+    def payload_path(self, match_id):
+        return os.path.join(self.matches_dir, f"{match_id}.json.gz")
+
+    def stored(self, match_ids):
+        """The subset of `match_ids` that is already stored."""
+        match_ids = list(match_ids)
+        found = set()
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(match_ids), 500):
+                chunk = match_ids[i:i + 500]
+                rows = self._db.execute(
+                    "SELECT match_id FROM matches WHERE match_id IN"
+                    f" ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def save_match(self, match_id, payload):
+        """
+        Store one match from its raw JSON body (bytes) and link every
+        participant to it. Returns the decoded document.
+        """
+        data = json.loads(payload)
+        info = data.get("info", {})
+        participants = data.get("metadata", {}).get("participants", [])
+
+        # File first, so an indexed match always has its payload
+        write_atomic(self.payload_path(match_id), gzip.compress(payload))
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO matches (match_id, game_creation, queue_id)"
+                " VALUES (?, ?, ?)",
+                (match_id, info.get("gameCreation"), info.get("queueId"))
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO player_matches (puuid, match_id) VALUES (?, ?)",
+                [(puuid, match_id) for puuid in participants]
+            )
+            self._insert_participants(match_id, data)
+        return data
+
+    def _insert_participants(self, match_id, data):
+        info = data.get("info", {})
+        players = info.get("participants", [])
+        team_damage = {}
+        for p in players:
+            team_damage[p.get("teamId")] = (team_damage.get(p.get("teamId"), 0)
+                                            + p.get("totalDamageDealtToChampions", 0))
+        duration = info.get("gameDuration", 0)
+        if duration > 10 * 3600:
+            duration //= 1000  # older documents report milliseconds
+        self._db.executemany(
+            "INSERT OR REPLACE INTO participants"
+            " (puuid, match_id, game_creation, queue_id, duration, champion_id, champion_name,"
+            "  win, kills, deaths, assists, cs, damage, team_damage)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(
+                p.get("puuid"), match_id, info.get("gameCreation"), info.get("queueId"),
+                duration, p.get("championId"), p.get("championName"),
+                int(bool(p.get("win"))), p.get("kills", 0), p.get("deaths", 0),
+                p.get("assists", 0),
+                p.get("totalMinionsKilled", 0) + p.get("neutralMinionsKilled", 0),
+                p.get("totalDamageDealtToChampions", 0), team_damage[p.get("teamId")],
+            ) for p in players if p.get("puuid")]
+        )
+
+    def index_participants(self):
+        """Fill the participants table from stored documents that aren't in it yet."""
+        with self._lock:
+            match_ids = [row[0] for row in self._db.execute(
+                "SELECT match_id FROM matches WHERE match_id NOT IN"
+                " (SELECT DISTINCT match_id FROM participants)"
+            ).fetchall()]
+        for match_id in match_ids:
+            data = self.load_match(match_id)
+            if data is not None:
+                with self._lock, self._db:
+                    self._insert_participants(match_id, data)
+        return len(match_ids)
+
+    def load_match(self, match_id):
+        """Decoded match document, or None if it isn't stored."""
+        try:
+            with gzip.open(self.payload_path(match_id), "rb") as f:
+                return json.loads(f.read())
+        except OSError:
+            return None
+
+    # ----------------------------------------------------
+    # Players
+    # ----------------------------------------------------
+    def match_ids(self, puuid, limit=None):
+        """Stored matches `puuid` played in, newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT m.match_id FROM player_matches pm"
+                " JOIN matches m ON m.match_id = pm.match_id"
+                " WHERE pm.puuid = ? ORDER BY m.game_creation DESC LIMIT ?",
+                (puuid, limit if limit is not None else -1)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def participant_rows(self, puuid, queue_id=None):
+        """
+        (game_creation, duration, champion_id, champion_name, win, kills,
+        deaths, assists, cs, damage, team_damage) for every stored game of
+        `puuid`, oldest first, optionally for one queue only.
+        """
+        query = (
+            "SELECT game_creation, duration, champion_id, champion_name, win, kills,"
+            " deaths, assists, cs, damage, team_damage FROM participants WHERE puuid = ?"
+        )
+        params = [puuid]
+        if queue_id is not None:
+            query += " AND queue_id = ?"
+            params.append(queue_id)
+        with self._lock:
+            return self._db.execute(query + " ORDER BY game_creation", params).fetchall()
+
+    def link(self, puuid, match_ids):
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO player_matches (puuid, match_id) VALUES (?, ?)",
+                [(puuid, match_id) for match_id in match_ids]
+            )
+
+    def synced_until(self, puuid):
+        """Creation time (epoch seconds) of the newest game synced for `puuid`, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT synced_until FROM players WHERE puuid = ?", (puuid,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def newest_game(self, match_ids):
+        """Creation time (epoch seconds) of the newest stored match among `match_ids`."""
+        match_ids = list(match_ids)
+        newest = None
+        with self._lock:
+            for i in range(0, len(match_ids), 500):
+                chunk = match_ids[i:i + 500]
+                row = self._db.execute(
+                    "SELECT MAX(game_creation) FROM matches WHERE match_id IN"
+                    f" ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchone()
+                if row[0] is not None:
+                    newest = max(newest or 0, row[0] // 1000)
+        return newest
+
+    def set_synced_until(self, puuid, ts):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO players (puuid, synced_until) VALUES (?, ?)",
+                (puuid, ts)
+            )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,241 @@
+# api/metrics.py
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds in seconds, from a cached lookup to a slow Riot API call
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Counts of observed values per bucket, plus their count and sum."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """(upper bound, observations <= it) per bucket, Prometheus style."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        """Estimate of the q-quantile, interpolated within its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower = 0.0
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.buckets[-1]  # in the +Inf bucket: the best we can say
+
+
+class Metrics:
+    """
+    In-process metrics registry: counters and latency histograms keyed by
+    name and labels, plus cache hit/miss counts read from the caches
+    themselves when exported. Thread safe; recording costs a lock and a
+    dict lookup, so it can sit on hot paths. Export with to_prometheus()
+    (text exposition format) or to_dict()/to_json().
+    """
+
+    def __init__(self, prefix="league_tracker_", clock=time.perf_counter):
+        self.prefix = prefix
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._counters = {}    # (name, labels) -> number
+        self._histograms = {}  # (name, labels) -> Histogram
+        self._caches = {}      # cache name -> stats() callable
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    # ----------------------------------------------------
+    # Recording
+    # ----------------------------------------------------
+    def inc(self, name, amount=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe how long the with-block takes."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.observe(name, self.clock() - start, **labels)
+
+    def watch_cache(self, name, stats):
+        """
+        Report a cache's hit ratio. `stats` returns a dict with "hits" and
+        "misses" (and optionally "stale") counters; it is called on export.
+        If it raises, cache_stats_errors_total{cache=name} is incremented.
+        Watching a name again replaces the previous cache.
+        """
+        with self._lock:
+            self._caches[name] = stats
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # ----------------------------------------------------
+    # Export
+    # ----------------------------------------------------
+    def _snapshot(self):
+        # Caches first (outside the lock: stats() may take the cache's own),
+        # so a failure is counted in this very export
+        with self._lock:
+            caches = dict(self._caches)
+        cache_stats = {}
+        for name, stats in sorted(caches.items()):
+            try:
+                cache_stats[name] = stats()
+            except Exception:
+                self.inc("cache_stats_errors_total", cache=name)
+
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {
+                key: (h.buckets, list(h.counts), h.count, h.sum)
+                for key, h in self._histograms.items()
+            }
+
+        copies = {}
+        for key, (buckets, counts, count, total) in histograms.items():
+            h = copies[key] = Histogram(buckets)
+            h.counts, h.count, h.sum = counts, count, total
+        return counters, copies, cache_stats
+
+    @staticmethod
+    def _hit_ratio(stats):
+        hits = stats.get("hits", 0) + stats.get("stale", 0)
+        total = hits + stats.get("misses", 0)
+        return hits / total if total else None
+
+    def to_dict(self):
+        counters, histograms, caches = self._snapshot()
+        result = {"counters": {}, "histograms": {}, "caches": {}}
+
+        for (name, labels), value in sorted(counters.items()):
+            result["counters"].setdefault(name, []).append({"labels": dict(labels), "value": value})
+
+        for (name, labels), h in sorted(histograms.items()):
+            result["histograms"].setdefault(name, []).append({
+                "labels": dict(labels),
+                "count": h.count,
+                "sum": h.sum,
+                "mean": h.sum / h.count if h.count else None,
+                "p50": h.quantile(0.5),
+                "p95": h.quantile(0.95),
+                "p99": h.quantile(0.99),
+                "buckets": [["+Inf" if b == float("inf") else b, n] for b, n in h.cumulative()],
+            })
+
+        for name, stats in caches.items():
+            result["caches"][name] = dict(stats, hit_ratio=self._hit_ratio(stats))
+        return result
+
+    def to_json(self, indent=None):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self):
+        counters, histograms, caches = self._snapshot()
+        lines = []
+
+        def family(name, kind):
+            lines.append(f"# TYPE {self.prefix}{name} {kind}")
+
+        last = None
+        for (name, labels), value in sorted(counters.items()):
+            if name != last:
+                family(name, "counter")
+                last = name
+            lines.append(f"{self.prefix}{name}{_format_labels(labels)} {_format_number(value)}")
+
+        last = None
+        for (name, labels), h in sorted(histograms.items()):
+            if name != last:
+                family(name, "histogram")
+                last = name
+            metric = self.prefix + name
+            for bound, count in h.cumulative():
+                le = ("le", _format_number(bound))
+                lines.append(f"{metric}_bucket{_format_labels(labels, le)} {count}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {_format_number(h.sum)}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {h.count}")
+
+        if caches:
+            family("cache_lookups_total", "counter")
+            for name, stats in caches.items():
+                for result in ("hits", "stale", "misses"):
+                    if result in stats:
+                        labels = (("cache", name), ("result", result))
+                        lines.append(f"{self.prefix}cache_lookups_total{_format_labels(labels)} {stats[result]}")
+            family("cache_hit_ratio", "gauge")
+            for name, stats in caches.items():
+                ratio = self._hit_ratio(stats)
+                if ratio is not None:
+                    labels = (("cache", name),)
+                    lines.append(f"{self.prefix}cache_hit_ratio{_format_labels(labels)} {_format_number(ratio)}")
+
+        return "\n".join(lines) + "\n"
+
+
+_shared_metrics = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_metrics():
+    """Process-wide registry, so the HTTP layer, the API clients and the UI report to one place."""
+    global _shared_metrics
+    with _shared_lock:
+        if _shared_metrics is None:
+            _shared_metrics = Metrics()
+        return _shared_metrics
@@ -0,0 +1,194 @@
+# api/ranked_history.py
+import os
+import sqlite3
+import threading
+import time
+
+TIERS = ["IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "EMERALD", "DIAMOND"]
+APEX_TIERS = ["MASTER", "GRANDMASTER", "CHALLENGER"]  # one shared LP ladder
+DIVISIONS = ["IV", "III", "II", "I"]
+
+
+def ladder_points(tier, rank, lp):
+    """
+    Position on one continuous ladder, so LP can be compared across
+    divisions: Iron IV 0 LP = 0, each division is 100, Master+ starts at 2800.
+    """
+    tier = (tier or "").upper()
+    if tier in APEX_TIERS:
+        return len(TIERS) * 400 + lp
+    if tier not in TIERS:
+        return None
+    division = DIVISIONS.index(rank) if rank in DIVISIONS else 0
+    return TIERS.index(tier) * 400 + division * 100 + lp
+
+
+class RankedHistory:
+    """
+    Local store of ranked snapshots for LP / win-rate history.
+
+    One row per (puuid, queue, ts), where queue is "solo" or "flex". The
+    primary key is also the clustered index (WITHOUT ROWID), so a player's
+    series for a period is one index range scan. A snapshot identical to
+    the player's newest stored one is not stored again, which keeps years
+    of periodic refreshes small. That check reads the database, so several
+    processes (the app, watch.py) can share one file.
+    """
+
+    def __init__(self, path=os.path.join("assets", "ranked_history.db"), clock=time.time):
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                " puuid TEXT NOT NULL,"
+                " queue TEXT NOT NULL,"
+                " ts INTEGER NOT NULL,"
+                " tier TEXT,"
+                " rank TEXT,"
+                " lp INTEGER,"
+                " wins INTEGER,"
+                " losses INTEGER,"
+                " PRIMARY KEY (puuid, queue, ts)"
+                ") WITHOUT ROWID"
+            )
+
+    # ----------------------------------------------------
+    # Writing
+    # ----------------------------------------------------
+    def record(self, puuid, ranked, ts=None):
+        """Store one get_ranked_data() result. Returns the number of rows written."""
+        return self.record_many([(puuid, ranked, ts)])
+
+    def record_many(self, snapshots):
+        """
+        Store many (puuid, ranked, ts) tuples in one transaction. ranked is
+        a get_ranked_data() dict; ts defaults to now. Unchanged snapshots
+        are skipped. Returns the number of rows written.
+        """
+        with self._lock, self._db:
+            # Write lock up front, so another process can't add a row between
+            # the comparison and the insert
+            self._db.execute("BEGIN IMMEDIATE")
+            rows = []
+            latest = {}  # (puuid, queue) -> state written earlier in this batch
+            for puuid, ranked, ts in snapshots:
+                ts = int(ts if ts is not None else self._clock())
+                for queue in ("solo", "flex"):
+                    entry = (ranked or {}).get(queue)
+                    if not entry:
+                        continue
+                    state = (entry.get("tier"), entry.get("rank"), entry.get("leaguePoints"),
+                             entry.get("wins"), entry.get("losses"))
+                    key = (puuid, queue)
+                    if key not in latest:
+                        latest[key] = self._last_state(puuid, queue)
+                    if latest[key] == state:
+                        continue
+                    latest[key] = state
+                    rows.append((puuid, queue, ts) + state)
+
+            if rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO snapshots"
+                    " (puuid, queue, ts, tier, rank, lp, wins, losses)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+            return len(rows)
+
+    def _last_state(self, puuid, queue):
+        """Newest stored (tier, rank, lp, wins, losses), or None."""
+        row = self._db.execute(
+            "SELECT tier, rank, lp, wins, losses FROM snapshots"
+            " WHERE puuid = ? AND queue = ? ORDER BY ts DESC LIMIT 1",
+            (puuid, queue)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    # ----------------------------------------------------
+    # Queries
+    # ----------------------------------------------------
+    def series(self, puuid, queue="solo", since=None, until=None):
+        """
+        Snapshots for one player and queue, oldest first, as dicts with
+        ts, tier, rank, lp, wins, losses, ladder (see ladder_points) and winrate.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT ts, tier, rank, lp, wins, losses FROM snapshots"
+                " WHERE puuid = ? AND queue = ? AND ts >= ? AND ts <= ?"
+                " ORDER BY ts",
+                (puuid, queue, since if since is not None else 0,
+                 until if until is not None else 2 ** 62)
+            ).fetchall()
+        return [self._point(row) for row in rows]
+
+    def latest_before(self, puuid, queue, ts):
+        """Most recent snapshot at or before ts, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT ts, tier, rank, lp, wins, losses FROM snapshots"
+                " WHERE puuid = ? AND queue = ? AND ts <= ?"
+                " ORDER BY ts DESC LIMIT 1",
+                (puuid, queue, ts)
+            ).fetchone()
+        return self._point(row) if row else None
+
+    def delta(self, puuid, queue="solo", since=None, until=None):
+        """
+        Change between the state at `since` and at `until` (default: now):
+        ladder LP, wins, losses, games and the win rate over that period.
+        The start is the last snapshot at or before `since`, or the first
+        one after it. None if there is no data.
+        """
+        until = until if until is not None else self._clock()
+        since = since if since is not None else 0
+        end = self.latest_before(puuid, queue, until)
+        if end is None:
+            return None
+        start = self.latest_before(puuid, queue, since)
+        if start is None:
+            first = self.series(puuid, queue, since, until)
+            start = first[0] if first else end
+
+        wins = end["wins"] - start["wins"]
+        losses = end["losses"] - start["losses"]
+        games = wins + losses
+        lp = None
+        if end["ladder"] is not None and start["ladder"] is not None:
+            lp = end["ladder"] - start["ladder"]
+        return {
+            "from": start,
+            "to": end,
+            "lp": lp,
+            "wins": wins,
+            "losses": losses,
+            "games": games,
+            "winrate": wins / games if games else None,
+        }
+
+    @staticmethod
+    def _point(row):
+        ts, tier, rank, lp, wins, losses = row
+        games = (wins or 0) + (losses or 0)
+        return {
+            "ts": ts,
+            "tier": tier,
+            "rank": rank,
+            "lp": lp,
+            "wins": wins,
+            "losses": losses,
+            "ladder": ladder_points(tier, rank, lp or 0),
+            "winrate": wins / games if games else None,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
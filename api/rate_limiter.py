@@ -0,0 +1,182 @@
+# api/rate_limiter.py
+import threading
+import time
+
+
+# Development key limits, used until Riot tells us the real ones
+DEFAULT_APP_LIMITS = "20:1,100:120"
+
+
+def parse_limits(value):
+    """Parse a Riot rate-limit header ("20:1,100:120") into {window_seconds: count}."""
+    limits = {}
+    if not value:
+        return limits
+    for part in value.split(","):
+        try:
+            count, window = part.strip().split(":")
+            limits[int(window)] = int(count)
+        except ValueError:
+            continue
+    return limits
+
+
+class _Bucket:
+    """Token bucket for one (limit, window) pair, refilled when the window resets."""
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.used = 0
+        self.reset_at = None
+
+    def _refill(self, now):
+        if self.reset_at is not None and now >= self.reset_at:
+            self.used = 0
+            self.reset_at = None
+
+    def wait_time(self, now):
+        self._refill(now)
+        if self.used < self.limit:
+            return 0.0
+        return max(self.reset_at - now, 0.0)
+
+    def take(self, now):
+        self._refill(now)
+        self.used += 1
+        if self.reset_at is None:
+            self.reset_at = now + self.window
+
+    def sync(self, limit, used, now):
+        """Adopt the limit and count reported by the server."""
+        self._refill(now)
+        self.limit = limit
+        self.used = max(self.used, used)
+        if self.reset_at is None and self.used:
+            self.reset_at = now + self.window
+
+
+class RateLimiter:
+    """
+    Client-side limiter for the Riot API.
+
+    Keeps token buckets per routing host (application limits) and per
+    (host, method) (method limits). Limits and counts are learned from the
+    X-App-Rate-Limit / X-Method-Rate-Limit headers and their -Count
+    variants; a 429 with Retry-After blocks the affected scope until it
+    expires. Thread safe, so one limiter can be shared by every caller.
+    """
+
+    def __init__(self, default_app_limits=DEFAULT_APP_LIMITS, clock=time.monotonic, sleep=time.sleep):
+        self.default_app_limits = parse_limits(default_app_limits)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets = {}        # scope key -> {window: _Bucket}
+        self._blocked_until = {}  # scope key -> clock time
+
+    @staticmethod
+    def _app_key(host):
+        return ("app", host)
+
+    @staticmethod
+    def _method_key(host, method):
+        return ("method", host, method)
+
+    def _buckets_for(self, key, defaults=None):
+        buckets = self._buckets.get(key)
+        if buckets is None:
+            buckets = {w: _Bucket(n, w) for w, n in (defaults or {}).items()}
+            self._buckets[key] = buckets
+        return buckets
+
+    # ----------------------------------------------------
+    # Before a request
+    # ----------------------------------------------------
+    def acquire(self, host, method):
+        """Block until a request to `method` on `host` is allowed. Returns seconds waited."""
+        waited = 0.0
+        app_key = self._app_key(host)
+        method_key = self._method_key(host, method)
+
+        while True:
+            with self._lock:
+                now = self._clock()
+                wait = 0.0
+                for key in (app_key, method_key):
+                    blocked = self._blocked_until.get(key)
+                    if blocked is not None:
+                        if now < blocked:
+                            wait = max(wait, blocked - now)
+                        else:
+                            del self._blocked_until[key]
+
+                buckets = (
+                    list(self._buckets_for(app_key, self.default_app_limits).values()) +
+                    list(self._buckets_for(method_key).values())
+                )
+                for bucket in buckets:
+                    wait = max(wait, bucket.wait_time(now))
+
+                if wait <= 0:
+                    for bucket in buckets:
+                        bucket.take(now)
+                    return waited
+
+            self._sleep(wait)
+            waited += wait
+
+    # ----------------------------------------------------
+    # After a response
+    # ----------------------------------------------------
+    def update(self, host, method, status, headers):
+        """Sync buckets with the rate-limit headers of a response."""
+        with self._lock:
+            now = self._clock()
+            self._sync(self._app_key(host), headers.get("X-App-Rate-Limit"),
+                       headers.get("X-App-Rate-Limit-Count"), now)
+            self._sync(self._method_key(host, method), headers.get("X-Method-Rate-Limit"),
+                       headers.get("X-Method-Rate-Limit-Count"), now)
+
+            if status == 429:
+                try:
+                    retry_after = float(headers.get("Retry-After", 1))
+                except (TypeError, ValueError):
+                    retry_after = 1.0
+                if headers.get("X-Rate-Limit-Type") == "application":
+                    key = self._app_key(host)
+                else:
+                    # method limit, or the underlying service pushing back
+                    key = self._method_key(host, method)
+                self._blocked_until[key] = max(self._blocked_until.get(key, 0), now + retry_after)
+
+    def _sync(self, key, limit_header, count_header, now):
+        limits = parse_limits(limit_header)
+        if not limits:
+            return
+        counts = parse_limits(count_header)
+        buckets = self._buckets_for(key)
+
+        # Drop windows the server no longer reports
+        for window in list(buckets):
+            if window not in limits:
+                del buckets[window]
+
+        for window, limit in limits.items():
+            bucket = buckets.get(window)
+            if bucket is None:
+                bucket = buckets[window] = _Bucket(limit, window)
+            bucket.sync(limit, counts.get(window, 0), now)
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_limiter():
+    """Process-wide limiter, so every RiotAPI instance draws from the same budget."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
@@ -0,0 +1,246 @@
+# api/replay.py
+"""
+Record/replay transports, for profiling and debugging without live
+endpoints. Both plug into the `transport=` argument of RiotAPI,
+LeagueClient and ChampionData (and MainWindow).
+
+    recorder = RecordingTransport("session.json")  # wraps the shared Transport
+    api = RiotAPI(transport=recorder)
+    ...
+    recorder.save()
+
+    api = RiotAPI(transport=ReplayTransport("session.json", latency=1.0))
+
+A fixture holds every exchange in the order it happened: method, URL,
+request headers (secrets redacted), status, response headers, body and
+timing. Bodies are stored as text when they are UTF-8, base64 otherwise;
+a path ending in ".gz" is gzip-compressed.
+
+Replay is deterministic: requests are matched on method and URL, and the
+n-th request for a URL gets the n-th response recorded for it (the last
+one once they run out), whatever the thread interleaving. The League
+client's port changes on every start, so loopback URLs match on path
+only. LCU WebSocket events don't go through a transport; both classes
+turn them off, so champ select is polled and every session is captured.
+"""
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from utils.files import write_atomic
+from api.metrics import get_shared_metrics
+from api.transport import get_shared_transport
+
+FIXTURE_VERSION = 1
+
+# Request headers never written to a fixture
+REDACTED_HEADERS = {"x-riot-token", "authorization", "cookie"}
+
+LOOPBACK_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+
+class ReplayMiss(requests.ConnectionError):
+    """No recorded exchange for a request (looks like an unreachable host to callers)."""
+
+
+def exchange_key(method, url):
+    """What a replayed request is matched on."""
+    parts = urlsplit(url)
+    if parts.hostname in LOOPBACK_HOSTS:
+        location = "loopback"
+    else:
+        location = f"{parts.scheme}://{parts.netloc}"
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{method.upper()} {location}{parts.path}{query}"
+
+
+def encode_body(content):
+    try:
+        return content.decode("utf-8"), "text"
+    except UnicodeDecodeError:
+        return base64.b64encode(content).decode("ascii"), "base64"
+
+
+def decode_body(body, encoding):
+    if encoding == "base64":
+        return base64.b64decode(body)
+    return body.encode("utf-8")
+
+
+def write_replay_lockfile(directory):
+    """
+    A League client lockfile for replaying: LeagueClient only talks to the
+    client once it knows a port and token, which replay doesn't check.
+    Returns its path.
+    """
+    path = os.path.join(directory, "lockfile")
+    write_atomic(path, "LeagueClient:0:0:replay:https")
+    return path
+
+
+def read_fixture(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        fixture = json.load(f)
+    if fixture.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"Unsupported fixture version: {fixture.get('version')!r}")
+    return fixture["exchanges"]
+
+
+def write_fixture(path, exchanges):
+    text = json.dumps({"version": FIXTURE_VERSION, "exchanges": exchanges}, indent=1)
+    write_atomic(path, gzip.compress(text.encode("utf-8")) if path.endswith(".gz") else text)
+
+
+class RecordingTransport:
+    """
+    Passes every request to `transport` (default: the shared one) and keeps
+    a copy of the exchange. Streamed responses are read in full so their
+    body can be saved; callers can still iterate over them. save() writes
+    the fixture; so does close(), which leaves the wrapped transport open
+    (it may be shared).
+    """
+
+    push_events = False
+
+    def __init__(self, path, transport=None):
+        self.path = path
+        self.transport = transport or get_shared_transport()
+        self.exchanges = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def request(self, method, url, endpoint=None, **kwargs):
+        headers = {
+            key: "<redacted>" if key.lower() in REDACTED_HEADERS else value
+            for key, value in (kwargs.get("headers") or {}).items()
+        }
+        exchange = {
+            "method": method.upper(),
+            "url": url,
+            "endpoint": endpoint,
+            "request_headers": headers,
+            "started": round(time.perf_counter() - self._started, 6),
+        }
+
+        start = time.perf_counter()
+        try:
+            resp = self.transport.request(method, url, endpoint=endpoint, **kwargs)
+            content = resp.content
+        except requests.RequestException as e:
+            exchange.update(error=type(e).__name__, message=str(e),
+                            elapsed=round(time.perf_counter() - start, 6))
+            self._add(exchange)
+            raise
+
+        body, body_encoding = encode_body(content)
+        exchange.update(
+            status=resp.status_code,
+            reason=resp.reason,
+            headers=dict(resp.headers),
+            body=body,
+            body_encoding=body_encoding,
+            elapsed=round(time.perf_counter() - start, 6),
+        )
+        self._add(exchange)
+        return resp
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def _add(self, exchange):
+        with self._lock:
+            self.exchanges.append(exchange)
+
+    def save(self, path=None):
+        with self._lock:
+            exchanges = list(self.exchanges)
+        write_fixture(path or self.path, exchanges)
+        return len(exchanges)
+
+    def close(self):
+        self.save()
+
+
+class ReplayTransport:
+    """
+    Serves the exchanges of a fixture instead of touching the network.
+    `latency` scales the recorded response times: 0 answers at once, 1.0
+    waits as long as the original request took. Unrecorded requests raise
+    ReplayMiss. Requests are timed into the metrics like Transport's.
+    """
+
+    push_events = False
+
+    def __init__(self, path, latency=0.0, metrics=None, sleep=time.sleep):
+        self.path = path
+        self.latency = latency
+        self.metrics = metrics or get_shared_metrics()
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.responses = {}  # exchange key -> [exchange, ...] in recorded order
+        for exchange in read_fixture(path):
+            self.responses.setdefault(exchange_key(exchange["method"], exchange["url"]), []).append(exchange)
+        self.served = {}  # exchange key -> requests answered so far
+
+    def rewind(self):
+        """Start over, as if no request had been made."""
+        with self._lock:
+            self.served.clear()
+
+    def next_exchange(self, method, url):
+        key = exchange_key(method, url)
+        with self._lock:
+            recorded = self.responses.get(key)
+            if not recorded:
+                return None
+            index = self.served.get(key, 0)
+            self.served[key] = index + 1
+        return recorded[min(index, len(recorded) - 1)]
+
+    def request(self, method, url, endpoint=None, **kwargs):
+        endpoint = endpoint or urlsplit(url).netloc
+        start = time.perf_counter()
+        status = "error"
+        try:
+            exchange = self.next_exchange(method, url)
+            if exchange is None:
+                raise ReplayMiss(f"No recorded response for {method.upper()} {url}")
+            if self.latency:
+                self._sleep(exchange["elapsed"] * self.latency)
+            if "error" in exchange:
+                error = getattr(requests.exceptions, exchange["error"], requests.RequestException)
+                raise error(exchange["message"])
+            status = str(exchange["status"])
+            return self.build_response(exchange, url)
+        finally:
+            self.metrics.observe("http_request_seconds", time.perf_counter() - start, endpoint=endpoint)
+            self.metrics.inc("http_responses_total", endpoint=endpoint, status=status)
+
+    @staticmethod
+    def build_response(exchange, url):
+        resp = requests.Response()
+        resp.status_code = exchange["status"]
+        resp.reason = exchange.get("reason")
+        resp.headers = CaseInsensitiveDict(exchange["headers"])
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = url
+        resp.elapsed = timedelta(seconds=exchange["elapsed"])
+        resp._content = decode_body(exchange["body"], exchange["body_encoding"])
+        resp._content_consumed = True  # iter_content() slices the stored body
+        return resp
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def close(self):
+        pass
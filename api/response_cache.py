@@ -0,0 +1,117 @@
+# api/response_cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache for Riot API lookups.
+
+    PUUIDs never change for an account, so they are kept forever. Ranked
+    entries are fresh for `ranked_ttl` seconds; after that they may still
+    be served for another `stale_ttl` seconds while the caller refreshes
+    them in the background (stale-while-revalidate). Hits, stale hits and
+    misses are counted and exposed through stats().
+    """
+
+    def __init__(self, path=os.path.join("assets", "riot_cache.db"), ranked_ttl=300, stale_ttl=3600,
+                 clock=time.time):
+        self.path = path
+        self.ranked_ttl = ranked_ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats = {
+            "puuid": {"hits": 0, "misses": 0},
+            "ranked": {"hits": 0, "stale": 0, "misses": 0},
+        }
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS puuids ("
+                " riot_id TEXT PRIMARY KEY,"
+                " puuid TEXT NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS ranked ("
+                " puuid TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def _riot_id(name, tag):
+        # Riot IDs are case-insensitive
+        return f"{name}#{tag}".casefold()
+
+    # ----------------------------------------------------
+    # PUUIDs (cached indefinitely)
+    # ----------------------------------------------------
+    def get_puuid(self, name, tag):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT puuid FROM puuids WHERE riot_id = ?", (self._riot_id(name, tag),)
+            ).fetchone()
+            self._stats["puuid"]["hits" if row else "misses"] += 1
+        return row[0] if row else None
+
+    def put_puuid(self, name, tag, puuid):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO puuids (riot_id, puuid) VALUES (?, ?)",
+                (self._riot_id(name, tag), puuid)
+            )
+
+    # ----------------------------------------------------
+    # Ranked entries (TTL + stale-while-revalidate)
+    # ----------------------------------------------------
+    def get_ranked(self, puuid):
+        """
+        Returns (ranked, state) where state is "fresh", "stale" or "miss".
+        ranked is None on a miss, including entries too old to serve at all.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data, fetched_at FROM ranked WHERE puuid = ?", (puuid,)
+            ).fetchone()
+            age = self._clock() - row[1] if row else None
+
+            if row and age < self.ranked_ttl:
+                self._stats["ranked"]["hits"] += 1
+                return json.loads(row[0]), "fresh"
+            if row and age < self.ranked_ttl + self.stale_ttl:
+                self._stats["ranked"]["stale"] += 1
+                return json.loads(row[0]), "stale"
+            self._stats["ranked"]["misses"] += 1
+            return None, "miss"
+
+    def put_ranked(self, puuid, ranked):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO ranked (puuid, data, fetched_at) VALUES (?, ?, ?)",
+                (puuid, json.dumps(ranked), self._clock())
+            )
+
+    # ----------------------------------------------------
+    # Introspection
+    # ----------------------------------------------------
+    def stats(self):
+        """Hit/miss counters since this cache was opened."""
+        with self._lock:
+            return {kind: dict(counts) for kind, counts in self._stats.items()}
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM puuids")
+            self._db.execute("DELETE FROM ranked")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
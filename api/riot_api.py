@@ -1,38 +1,115 @@
 # api/riot_api.py
 import os
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
+from api.json_stream import iter_array
+from api.metrics import get_shared_metrics
+from api.rate_limiter import get_shared_limiter
+from api.routing import (
+    DEFAULT_PLATFORM, normalize_platform, account_host, match_host,
+    platform_for_tag, platform_for_match
+)
+from api.transport import get_shared_transport
 
 load_dotenv()
 
 
 class RiotAPI:
-    def __init__(self):
+    def __init__(self, max_workers=8, limiter=None, max_retries=3,
+                 api_root="https://{host}.api.riotgames.com", transport=None, cache=None,
+                 platform=DEFAULT_PLATFORM, metrics=None, on_ranked_fetched=None):
         self.api_key = os.getenv("RIOT_API_KEY")
         self.headers = {
             "X-Riot-Token": self.api_key,
             "User-Agent": "league-summoner-tracker"
         }
+        self.max_workers = max_workers  # max requests in flight for bulk lookups
+        self.limiter = limiter or get_shared_limiter()
+        self.max_retries = max_retries  # retries after a 429, once Retry-After has passed
+        self.api_root = api_root        # e.g. "http://127.0.0.1:8000/{host}" for a local stub
+        self.transport = transport or get_shared_transport()
+        # Platform used when a call doesn't name one ("euw1", "na1", "kr", ...)
+        self.platform = normalize_platform(platform)
+
+        self.metrics = metrics or get_shared_metrics()
+        # Optional on_ranked_fetched(puuid, platform, ranked), called for every
+        # ranked result that came from Riot (not the cache), background refreshes included
+        self.on_ranked_fetched = on_ranked_fetched
+
+        # Optional ResponseCache: PUUIDs forever, ranked entries with a TTL
+        self.cache = cache
+        if cache:
+            self.metrics.watch_cache("riot_puuid", lambda: cache.stats()["puuid"])
+            self.metrics.watch_cache("riot_ranked", lambda: cache.stats()["ranked"])
+        self._revalidating = set()  # (platform, puuid) with a background refresh in flight
+        self._revalidate_lock = threading.Lock()
+        self._revalidate_pool = None
+
+    # ----------------------------------------------------
+    # Rate-limited GET against a routing host ("europe", "euw1", ...)
+    # ----------------------------------------------------
+    def _platform(self, platform):
+        return normalize_platform(platform) if platform else self.platform
+
+    def _get(self, host, path, method, stream=False):
+        url = self.api_root.format(host=host) + path
+        for attempt in range(self.max_retries + 1):
+            waited = self.limiter.acquire(host, method)
+            self.metrics.observe("ratelimit_wait_seconds", waited, host=host)
+            resp = self.transport.get(url, headers=self.headers, stream=stream, endpoint=method)
+            self.limiter.update(host, method, resp.status_code, resp.headers)
+            if resp.status_code != 429 or attempt == self.max_retries:
+                break
+            resp.close()  # retried; the last response is the caller's, still readable
+        return resp
 
     # ----------------------------------------------------
     # Get PUUID from Riot ID ("Name" + "Tag")
     # ----------------------------------------------------
-    def get_puuid(self, name, tag):
-        url = f"https://europe.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{name}/{tag}"
-        resp = requests.get(url, headers=self.headers)
+    def get_puuid(self, name, tag, platform=None):
+        if self.cache:
+            puuid = self.cache.get_puuid(name, tag)
+            if puuid:
+                return 200, puuid
+
+        resp = self._get(
+            account_host(self._platform(platform)),
+            f"/riot/account/v1/accounts/by-riot-id/{name}/{tag}",
+            "account-v1.by-riot-id"
+        )
 
         if resp.status_code != 200:
             return resp.status_code, resp.json()
 
         data = resp.json()
+        if self.cache:
+            self.cache.put_puuid(name, tag, data["puuid"])
         return 200, data["puuid"]
 
     # ----------------------------------------------------
     # Get league entries by PUUID (returns SOLO + FLEX)
     # ----------------------------------------------------
-    def get_ranked_data(self, puuid):
-        url = f"https://euw1.api.riotgames.com/lol/league/v4/entries/by-puuid/{puuid}"
-        resp = requests.get(url, headers=self.headers)
+    def get_ranked_data(self, puuid, fresh=False, platform=None):
+        """
+        Ranked entries for `puuid` on `platform`. With a cache, a fresh entry
+        is returned without a request; a stale one is returned immediately
+        and refreshed in the background. fresh=True always asks Riot.
+        """
+        platform = self._platform(platform)
+        cache_key = f"{platform}:{puuid}"  # ranked standing is per server
+        if self.cache and not fresh:
+            ranked, state = self.cache.get_ranked(cache_key)
+            if state == "stale":
+                self._revalidate_ranked(puuid, platform)
+            if ranked is not None:
+                return 200, ranked
+
+        resp = self._get(
+            platform,
+            f"/lol/league/v4/entries/by-puuid/{puuid}",
+            "league-v4.entries-by-puuid"
+        )
 
         if resp.status_code != 200:
             return resp.status_code, resp.json()
@@ -50,12 +127,194 @@ class RiotAPI:
             if entry["queueType"] == "RANKED_FLEX_SR":
                 ranked["flex"] = entry
 
+        if self.cache:
+            self.cache.put_ranked(cache_key, ranked)
+        if self.on_ranked_fetched:
+            try:
+                self.on_ranked_fetched(puuid, platform, ranked)
+            except Exception as e:
+                print(f"Failed to handle ranked data for {puuid}:", e)
         return 200, ranked
 
+    def _revalidate_ranked(self, puuid, platform):
+        """Refresh a stale cache entry in the background, once per puuid at a time."""
+        key = (platform, puuid)
+        with self._revalidate_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+            if self._revalidate_pool is None:
+                self._revalidate_pool = ThreadPoolExecutor(max_workers=2)
+
+        def refresh():
+            try:
+                self.get_ranked_data(puuid, fresh=True, platform=platform)
+            except Exception as e:
+                print(f"Failed to refresh ranked data for {puuid}:", e)
+            finally:
+                with self._revalidate_lock:
+                    self._revalidating.discard(key)
+
+        self._revalidate_pool.submit(refresh)
+
+    def cache_stats(self):
+        """Cache hit/miss counters, or None when caching is off."""
+        return self.cache.stats() if self.cache else None
+
     # ----------------------------------------------------
     # Summoner info (contains summonerLevel, profileIconId, etc.)
     # ----------------------------------------------------
-    def get_summoner_info(self, name):
-        url = f"https://euw1.api.riotgames.com/lol/summoner/v4/summoners/by-name/{name}"
-        resp = requests.get(url, headers=self.headers)
+    def get_summoner_info(self, name, platform=None):
+        resp = self._get(
+            self._platform(platform),
+            f"/lol/summoner/v4/summoners/by-name/{name}",
+            "summoner-v4.by-name"
+        )
+        return resp.status_code, resp.json()
+
+    # ----------------------------------------------------
+    # Match history (match-v5)
+    # ----------------------------------------------------
+    def get_match_ids(self, puuid, start=0, count=20, since=None, platform=None):
+        """
+        Match IDs for `puuid`, newest first. `since` (epoch seconds) limits
+        the list to games played after that time; count is at most 100.
+        """
+        query = f"start={start}&count={count}"
+        if since is not None:
+            query += f"&startTime={int(since)}"
+        resp = self._get(
+            match_host(self._platform(platform)),
+            f"/lol/match/v5/matches/by-puuid/{puuid}/ids?{query}",
+            "match-v5.ids-by-puuid"
+        )
+        return resp.status_code, resp.json()
+
+    def get_match(self, match_id, raw=False, platform=None):
+        """
+        Full match document. raw=True returns the undecoded response body.
+        The platform defaults to the one in the match ID ("EUW1_...").
+        """
+        resp = self._get(
+            match_host(platform or platform_for_match(match_id, self.platform)),
+            f"/lol/match/v5/matches/{match_id}",
+            "match-v5.match"
+        )
+        if resp.status_code == 200 and raw:
+            return 200, resp.content
         return resp.status_code, resp.json()
+
+    def get_match_timeline(self, match_id, chunk_size=64 * 1024, platform=None):
+        """
+        Stream a match timeline. Returns (200, records) where records is a
+        generator of ("frame", index, frame) and ("event", index, event)
+        tuples; each frame (its "events" removed) comes before its events.
+        The body is parsed as it downloads, one frame at a time, so the
+        whole document is never held in memory. Iterate or close() the
+        generator to release the connection.
+        """
+        resp = self._get(
+            match_host(platform or platform_for_match(match_id, self.platform)),
+            f"/lol/match/v5/matches/{match_id}/timeline",
+            "match-v5.timeline",
+            stream=True
+        )
+        if resp.status_code != 200:
+            try:
+                return resp.status_code, resp.json()
+            finally:
+                resp.close()
+        return 200, self._timeline_records(resp, chunk_size)
+
+    @staticmethod
+    def _timeline_records(resp, chunk_size):
+        try:
+            frames = iter_array(resp.iter_content(chunk_size), "frames", resp.encoding or "utf-8")
+            for index, frame in enumerate(frames):
+                events = frame.pop("events", [])
+                yield "frame", index, frame
+                for event in events:
+                    yield "event", index, event
+        finally:
+            resp.close()
+
+    # ----------------------------------------------------
+    # Bulk lookup: Riot ID -> PUUID -> ranked entries
+    # ----------------------------------------------------
+    def lookup(self, name, tag, fresh=False, platform=None):
+        """
+        Resolve one Riot ID to its ranked entries. Never raises. On success
+        the ranked dict also carries the account's "puuid" and "platform".
+        Without an explicit platform, a default tagline ("EUW", "NA1",
+        "KR1", ...) picks the server, otherwise self.platform is used.
+        """
+        try:
+            platform = self._platform(platform or platform_for_tag(tag))
+            status, puuid_or_error = self.get_puuid(name, tag, platform)
+            if status != 200:
+                return status, puuid_or_error
+            status, ranked = self.get_ranked_data(puuid_or_error, fresh=fresh, platform=platform)
+            if status != 200:
+                return status, ranked
+            return 200, dict(ranked, puuid=puuid_or_error, platform=platform)
+        except Exception as e:
+            return None, str(e)
+
+    def ranked_many(self, puuids, timeout=None, max_workers=None, platform=None):
+        """
+        Fetch ranked entries for many puuids concurrently (cached entries
+        come straight from the cache). Yields (puuid, status,
+        ranked_or_error) in completion order. With a timeout, stops after
+        that many seconds and drops lookups that haven't finished.
+        """
+        puuids = list(dict.fromkeys(p for p in puuids if p))
+        if not puuids:
+            return
+
+        def fetch(puuid):
+            try:
+                return self.get_ranked_data(puuid, platform=platform)
+            except Exception as e:
+                return None, str(e)
+
+        workers = max(1, min(max_workers or self.max_workers, len(puuids)))
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {pool.submit(fetch, puuid): puuid for puuid in puuids}
+            try:
+                for future in as_completed(futures, timeout=timeout):
+                    status, data = future.result()
+                    yield futures[future], status, data
+            except TimeoutError:
+                return  # deadline passed; whatever finished has been yielded
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def lookup_many(self, riot_ids, max_workers=None, fresh=False, platform=None):
+        """
+        Look up many (name, tag) pairs concurrently, each on `platform` or
+        the server its tagline implies (see lookup). Lookups on different
+        servers use different hosts, so they don't share a rate limit.
+
+        Yields ((name, tag), status, ranked_or_error) as each lookup
+        finishes, so results arrive in completion order, not input order.
+        A failed lookup is reported on its own item and does not stop
+        the rest of the batch.
+        """
+        riot_ids = list(dict.fromkeys(riot_ids))  # drop duplicates, keep order
+        if not riot_ids:
+            return
+
+        workers = max(1, min(max_workers or self.max_workers, len(riot_ids)))
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                pool.submit(self.lookup, name, tag, fresh, platform): (name, tag)
+                for name, tag in riot_ids
+            }
+            for future in as_completed(futures):
+                status, data = future.result()
+                yield futures[future], status, data
+        finally:
+            # Consumer stopped early: don't start lookups nobody will read
+            pool.shutdown(wait=False, cancel_futures=True)
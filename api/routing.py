@@ -0,0 +1,110 @@
+# api/routing.py
+"""
+Riot API routing: platform hosts (euw1, na1, ...) serve summoner and
+league data; regional hosts (europe, americas, ...) serve accounts and
+matches. Every host gets its own connection pool (Transport) and rate
+limit budget (RateLimiter), so lookups in different regions don't queue
+behind each other.
+"""
+
+DEFAULT_PLATFORM = "euw1"
+
+# Platform -> regional host for match-v5
+PLATFORM_REGIONS = {
+    "euw1": "europe",
+    "eun1": "europe",
+    "tr1": "europe",
+    "ru": "europe",
+    "me1": "europe",
+    "na1": "americas",
+    "br1": "americas",
+    "la1": "americas",
+    "la2": "americas",
+    "kr": "asia",
+    "jp1": "asia",
+    "oc1": "sea",
+    "sg2": "sea",
+    "tw2": "sea",
+    "vn2": "sea",
+}
+
+# account-v1 has no "sea" cluster
+ACCOUNT_REGIONS = {"europe": "europe", "americas": "americas", "asia": "asia", "sea": "asia"}
+
+# Default Riot ID taglines Riot hands out per server
+TAG_PLATFORMS = {
+    "EUW": "euw1",
+    "EUNE": "eun1",
+    "TR1": "tr1",
+    "RU1": "ru",
+    "ME1": "me1",
+    "NA1": "na1",
+    "BR1": "br1",
+    "LAN": "la1",
+    "LAS": "la2",
+    "KR1": "kr",
+    "JP1": "jp1",
+    "OCE": "oc1",
+    "SG2": "sg2",
+    "TW2": "tw2",
+    "VN2": "vn2",
+}
+
+# Regions the League client reports (/riotclient/region-locale) -> platform
+CLIENT_REGION_PLATFORMS = {
+    "EUW": "euw1",
+    "EUNE": "eun1",
+    "TR": "tr1",
+    "RU": "ru",
+    "ME1": "me1",
+    "NA": "na1",
+    "BR": "br1",
+    "LA1": "la1",
+    "LA2": "la2",
+    "LAN": "la1",
+    "LAS": "la2",
+    "KR": "kr",
+    "JP": "jp1",
+    "OC1": "oc1",
+    "OCE": "oc1",
+    "SG2": "sg2",
+    "TW2": "tw2",
+    "VN2": "vn2",
+}
+
+
+def normalize_platform(platform):
+    """Lower-cased platform id; raises ValueError for an unknown one."""
+    platform = (platform or "").lower()
+    if platform not in PLATFORM_REGIONS:
+        raise ValueError(f"Unknown platform: {platform!r}")
+    return platform
+
+
+def match_host(platform):
+    """Regional host for match-v5 calls about games on `platform`."""
+    return PLATFORM_REGIONS[normalize_platform(platform)]
+
+
+def account_host(platform):
+    """Regional host for account-v1 calls (any region can resolve any account)."""
+    return ACCOUNT_REGIONS[match_host(platform)]
+
+
+def platform_for_tag(tag, default=None):
+    """Platform implied by a default tagline such as "EUW" or "NA1", else `default`."""
+    return TAG_PLATFORMS.get((tag or "").upper(), default)
+
+
+def platform_for_match(match_id, default=None):
+    """Platform a match ID belongs to ("EUW1_123" -> "euw1"), else `default`."""
+    prefix = match_id.split("_", 1)[0].lower() if "_" in match_id else ""
+    return prefix if prefix in PLATFORM_REGIONS else default
+
+
+def platform_for_region(region, default=None):
+    """Platform of a League client region ("EUW" -> "euw1", "euw1" -> "euw1"), else `default`."""
+    region = (region or "").upper()
+    if region in CLIENT_REGION_PLATFORMS:
+        return CLIENT_REGION_PLATFORMS[region]
+    return region.lower() if region.lower() in PLATFORM_REGIONS else default
@@ -0,0 +1,88 @@
+# api/transport.py
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from api.metrics import get_shared_metrics
+
+
+# (connect, read) seconds, used when a caller doesn't pass its own timeout
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class Transport:
+    """
+    Shared HTTP layer for RiotAPI, LeagueClient and ChampionData.
+
+    Keeps one pooled keep-alive requests.Session per scheme+host, so
+    repeated calls to the same host reuse the TCP/TLS connection instead
+    of handshaking every time. Applies a default timeout and asks for
+    gzip-compressed responses.
+
+    Every request is timed into the http_request_seconds histogram and
+    counted by status code in http_responses_total, labelled with the
+    caller's `endpoint` name (default: the host).
+    """
+
+    # LCU WebSocket events bypass the transport; see api.replay
+    push_events = True
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, pool_maxsize=16, metrics=None):
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize  # keep-alive connections per host
+        self.metrics = metrics or get_shared_metrics()
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url):
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount(key, adapter)
+                session.headers["Accept-Encoding"] = "gzip"
+                self._sessions[key] = session
+            return session
+
+    def request(self, method, url, endpoint=None, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        endpoint = endpoint or urlsplit(url).netloc
+        status = "error"
+        start = time.perf_counter()
+        try:
+            resp = self.session_for(url).request(method, url, **kwargs)
+            status = str(resp.status_code)
+            return resp
+        finally:
+            # With stream=True this is the time to the response headers
+            self.metrics.observe("http_request_seconds", time.perf_counter() - start, endpoint=endpoint)
+            self.metrics.inc("http_responses_total", endpoint=endpoint, status=status)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_shared_transport = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_transport():
+    """Process-wide transport, so every client shares the same connection pools."""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = Transport()
+        return _shared_transport
@@ -0,0 +1,188 @@
+# benchmarks/replay.py
+"""
+Profile on_search and update_champ_select against recorded traffic.
+
+    TRACKER_RECORD=session.json python main.py     # use the app, then close it
+    python -m benchmarks.replay session.json       # replay it, print JSON
+    python -m benchmarks.replay session.json --latency 1 --repeat 10 -o replay.json
+
+Every Riot ID looked up in the recording is searched again, in order, and
+champ select is ticked once per recorded LCU session poll, all served by
+ReplayTransport (api/replay.py). Each repeat starts from a fresh working
+directory and a rewound fixture, so every run sees exactly the same
+responses. Timings are in milliseconds, as in benchmarks/run.py.
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from urllib.parse import unquote, urlsplit
+
+from benchmarks.run import Bench, REPO_ROOT, git_commit, summarize
+from api.champion_data import ChampionData
+from api.rate_limiter import RateLimiter
+from api.replay import ReplayTransport, exchange_key, read_fixture, write_replay_lockfile
+
+ACCOUNT_PATH = "/riot/account/v1/accounts/by-riot-id/"
+SESSION_KEY = exchange_key("GET", "https://127.0.0.1/lol-champ-select/v1/session")
+
+
+def recorded_searches(exchanges):
+    """(name, tag) of every Riot ID looked up in the recording, in order."""
+    riot_ids = []
+    for exchange in exchanges:
+        path = urlsplit(exchange["url"]).path
+        if ACCOUNT_PATH in path:
+            name, tag = path.split(ACCOUNT_PATH, 1)[1].split("/")[:2]
+            riot_ids.append((unquote(name), unquote(tag)))
+    return list(dict.fromkeys(riot_ids))
+
+
+def recorded_session_polls(exchanges):
+    return sum(1 for e in exchanges if exchange_key(e["method"], e["url"]) == SESSION_KEY)
+
+
+class ReplayBench:
+    def __init__(self, fixture, repeat, latency):
+        exchanges = read_fixture(fixture)
+        self.searches = recorded_searches(exchanges)
+        self.ticks = recorded_session_polls(exchanges)
+        self.transport = ReplayTransport(fixture, latency=latency)
+        self.repeat = repeat
+        self.samples = {"on_search": [], "update_champ_select_tick": [], "render_champ_select": []}
+        self.base = tempfile.mkdtemp(prefix="lst-replay-")
+        self.workdirs = [self.base]
+
+    def prepare_assets(self):
+        """Patch data and icons from the recording, copied into every run's workdir."""
+        os.chdir(self.base)
+        ChampionData(transport=self.transport)
+        self.transport.rewind()
+
+    def workdir(self):
+        path = tempfile.mkdtemp(prefix="lst-replay-")
+        self.workdirs.append(path)
+        shutil.copytree(os.path.join(self.base, "assets"), os.path.join(path, "assets"),
+                        ignore=shutil.ignore_patterns("*.db", "*.db-*"))
+        os.chdir(path)
+        return path
+
+    def main_window(self):
+        from PySide6.QtWidgets import QApplication
+        import ui.main_window as main_window
+        from api.riot_api import RiotAPI
+
+        app = QApplication.instance() or QApplication([])
+        os.environ["LEAGUE_LOCKFILE"] = write_replay_lockfile(os.getcwd())
+        # Replayed rate-limit headers describe the recording, not this run
+        main_window.RiotAPI = functools.partial(RiotAPI, limiter=RateLimiter("100000:1"))
+
+        window = main_window.MainWindow(transport=self.transport)
+        window.resize(900, 700)
+        window.show()
+        window.tasks.wait()
+        app.processEvents()
+        return app, window
+
+    def run_once(self):
+        self.workdir()
+        self.transport.rewind()
+        app, window = self.main_window()
+
+        results = []
+        on_result = window.on_search_result
+        on_error = window.on_search_error
+        window.on_search_result = lambda result: (results.append(result), on_result(result))
+        window.on_search_error = lambda error: (results.append(error), on_error(error))
+        for name, tag in self.searches:
+            window.name_input.setText(name)
+            window.tag_input.setText(tag)
+            count = len(results)
+            start = time.perf_counter()
+            window.on_search()
+            Bench.wait_for(app, lambda: len(results) > count)
+            self.samples["on_search"].append(time.perf_counter() - start)
+
+        if self.ticks:
+            window.on_show_champ()
+            window.champ_timer.stop()
+            window.tasks.wait()
+            app.processEvents()
+            self.transport.rewind()  # the ticks below replay every recorded poll
+
+            rendered = []
+            render_once = window.render_champ_select
+
+            def render(snapshot):
+                start = time.perf_counter()
+                render_once(snapshot)
+                rendered.append(None)
+                self.samples["render_champ_select"].append(time.perf_counter() - start)
+
+            window.render_champ_select = render
+            for _ in range(self.ticks):
+                count = len(rendered)
+                start = time.perf_counter()
+                window.update_champ_select()
+                Bench.wait_for(app, lambda: len(rendered) > count)
+                self.samples["update_champ_select_tick"].append(time.perf_counter() - start)
+            window.go_back()
+        window.close()
+
+    def run(self):
+        self.prepare_assets()
+        for _ in range(self.repeat):
+            self.run_once()
+        return {name: summarize(samples) for name, samples in self.samples.items() if samples}
+
+    def cleanup(self):
+        os.chdir(REPO_ROOT)
+        for path in self.workdirs:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the app against a recorded session.")
+    parser.add_argument("fixture", help="file recorded with TRACKER_RECORD (see api/replay.py)")
+    parser.add_argument("-o", "--output", help="also write the JSON results to this file")
+    parser.add_argument("--repeat", type=int, default=5, help="replays of the whole session (default 5)")
+    parser.add_argument("--latency", type=float, default=0,
+                        help="fraction of the recorded response times to wait (1 = as recorded)")
+    args = parser.parse_args()
+
+    fixture = os.path.abspath(args.fixture)
+    output = os.path.abspath(args.output) if args.output else None
+    bench = ReplayBench(fixture, args.repeat, args.latency)
+    if not bench.searches and not bench.ticks:
+        parser.error("the recording has no Riot ID lookups or champ select polls")
+    try:
+        results = bench.run()
+    finally:
+        bench.cleanup()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fixture": os.path.basename(fixture),
+        "repeat": args.repeat,
+        "latency": args.latency,
+        "searches": len(bench.searches),
+        "ticks": bench.ticks,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+# benchmarks/run.py
+"""
+Benchmarks for the tracker's hot paths. Runs offline: Qt uses the
+"offscreen" platform and Data Dragon, the Riot API and the League client
+are served by a local stub (benchmarks/stub_server.py).
+
+    python -m benchmarks.run                       # print JSON to stdout
+    python -m benchmarks.run -o bench.json         # and write it to a file
+    python -m benchmarks.run --only icons,search --latency 20
+
+Every benchmark runs in a fresh temporary working directory, because the
+app keeps its caches under ./assets. Timings are reported in milliseconds
+(min, median, mean, p95, max) together with the git commit, so runs of
+different commits can be compared. To profile against real, recorded
+traffic instead of the stub, see benchmarks/replay.py.
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.stub_server import StubServer  # noqa: E402
+from api.champion_data import ChampionData  # noqa: E402
+from api.rate_limiter import RateLimiter  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def summarize(samples):
+    """Timing statistics in milliseconds for a list of durations in seconds."""
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "n": len(ms),
+        "min_ms": round(ms[0], 4),
+        "median_ms": round(statistics.median(ms), 4),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 4),
+        "max_ms": round(ms[-1], 4),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Bench:
+    def __init__(self, stub, repeat):
+        self.stub = stub
+        self.repeat = repeat
+        self.results = {}
+        self.workdirs = []
+
+    # ----------------------------------------------------
+    # Helpers
+    # ----------------------------------------------------
+    def workdir(self):
+        """Fresh empty working directory (the app writes ./assets)."""
+        path = tempfile.mkdtemp(prefix="lst-bench-")
+        self.workdirs.append(path)
+        os.chdir(path)
+        return path
+
+    def champion_data(self, **kwargs):
+        return ChampionData(ddragon_root=self.stub.root, **kwargs)
+
+    def record(self, name, samples, **extra):
+        self.results[name] = dict(summarize(samples), **extra)
+
+    def main_window(self):
+        """A MainWindow whose Riot API, Data Dragon and LCU are the stub."""
+        from PySide6.QtWidgets import QApplication
+        import ui.main_window as main_window
+        from api.riot_api import RiotAPI
+        from api.league_client import LeagueClient
+
+        app = QApplication.instance() or QApplication([])
+
+        lockfile = os.path.join(os.getcwd(), "lockfile")
+        with open(lockfile, "w") as f:
+            f.write(f"LeagueClient:1:{self.stub.port}:token:http")
+
+        main_window.RiotAPI = functools.partial(
+            RiotAPI,
+            api_root=self.stub.root + "/{host}",
+            limiter=RateLimiter("100000:1"),  # measure the app, not Riot's limits
+        )
+        main_window.ChampionData = functools.partial(ChampionData, ddragon_root=self.stub.root)
+        main_window.LeagueClient = functools.partial(LeagueClient, lockfile_path=lockfile)
+
+        window = main_window.MainWindow()
+        window.resize(900, 700)
+        window.show()
+        window.tasks.wait()  # background patch refresh
+        app.processEvents()
+        return app, window
+
+    @staticmethod
+    def wait_for(app, done, timeout=10):
+        deadline = time.perf_counter() + timeout
+        while not done():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("benchmark step did not finish")
+            app.processEvents()
+
+    # ----------------------------------------------------
+    # ChampionData
+    # ----------------------------------------------------
+    def bench_champion_data(self):
+        cold = []
+        for _ in range(max(1, self.repeat // 10)):
+            self.workdir()
+            start = time.perf_counter()
+            data = self.champion_data()
+            cold.append(time.perf_counter() - start)
+        self.record("champion_data_init_cold", cold, icons=len(data.icon_files()))
+
+        warm = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            self.champion_data()
+            warm.append(time.perf_counter() - start)
+        self.record("champion_data_init_warm", warm)
+
+        cached = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            self.champion_data(refresh=False)
+            cached.append(time.perf_counter() - start)
+        self.record("champion_data_init_cached_only", cached)
+
+    def bench_icons(self):
+        self.workdir()
+        data = self.champion_data()
+        champ_ids = list(data.id_to_name)
+        spell_ids = [int(key) for key in data.spell_id_to_filename]
+
+        def per_call(fn, ids, rounds):
+            samples = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for i in ids:
+                    fn(i)
+                samples.append((time.perf_counter() - start) / len(ids))
+            return samples
+
+        self.record("champion_icon_hit", per_call(data.get_champion_icon, champ_ids, self.repeat))
+        self.record("spell_icon_hit", per_call(data.get_spell_icon, spell_ids, self.repeat))
+        self.record("champion_icon_unknown_id", per_call(data.get_champion_icon, [-1] * 100, self.repeat))
+
+        # Miss: no pack and no file on disk, so the icon is downloaded
+        data.icon_pack = None
+        misses = []
+        for champ_id in champ_ids[:max(10, self.repeat)]:
+            path = os.path.join(data.base_path, f"{data.id_to_name[champ_id]}.png")
+            if os.path.exists(path):
+                os.remove(path)
+            start = time.perf_counter()
+            data.get_champion_icon(champ_id)
+            misses.append(time.perf_counter() - start)
+        self.record("champion_icon_miss_download", misses)
+
+        misses = []
+        for spell_id in spell_ids:
+            path = os.path.join(data.spell_base_path, data.spell_id_to_filename[str(spell_id)])
+            if os.path.exists(path):
+                os.remove(path)
+            start = time.perf_counter()
+            data.get_spell_icon(spell_id)
+            misses.append(time.perf_counter() - start)
+        self.record("spell_icon_miss_download", misses)
+
+    # ----------------------------------------------------
+    # MainWindow
+    # ----------------------------------------------------
+    def bench_champ_select(self):
+        with open(os.path.join(FIXTURES, "champ_select_sessions.json"), "r", encoding="utf-8") as f:
+            sessions = json.load(f)
+
+        self.workdir()
+        self.champion_data()  # warm icons, as after the first launch
+        app, window = self.main_window()
+        window.on_show_champ()
+        window.stop_champ_stream()  # drive the polling path tick by tick
+        window.champ_timer.stop()
+        window.tasks.wait()
+        app.processEvents()
+
+        rendered = []
+        render_once = window.render_champ_select
+
+        def render(snapshot):
+            start = time.perf_counter()
+            render_once(snapshot)
+            rendered.append(time.perf_counter() - start)
+
+        window.render_champ_select = render
+
+        ticks = []
+        for _ in range(max(1, self.repeat // 10)):
+            window.clear_champ_select()
+            for session in sessions:
+                self.stub.session = session
+                count = len(rendered)
+                start = time.perf_counter()
+                window.update_champ_select()
+                self.wait_for(app, lambda: len(rendered) > count)
+                ticks.append(time.perf_counter() - start)
+        self.record("update_champ_select_tick", ticks, sessions=len(sessions))
+        self.record("render_champ_select", rendered)
+
+        # Same session again: the diff finds nothing to redraw
+        idle = []
+        for _ in range(self.repeat):
+            count = len(rendered)
+            start = time.perf_counter()
+            window.update_champ_select()
+            self.wait_for(app, lambda: len(rendered) > count)
+            idle.append(time.perf_counter() - start)
+        self.record("update_champ_select_tick_unchanged", idle)
+
+        # Resize storm on the champ select screen
+        passes = []
+        run_layout_pass = window.run_layout_pass
+
+        def counted_pass():
+            passes.append(None)
+            run_layout_pass()
+
+        window.run_layout_pass = counted_pass
+        interleaved = []
+        batched = []
+        direct = []
+        for _ in range(max(1, self.repeat // 10)):
+            # Event loop runs after every resize: one layout pass each
+            del passes[:]
+            start = time.perf_counter()
+            for step in range(100):
+                window.resize(700 + (step * 7) % 500, 500 + (step * 5) % 400)
+                app.processEvents()
+            self.wait_for(app, lambda: not window.layout_pending)
+            interleaved.append(time.perf_counter() - start)
+            interleaved_passes = len(passes)
+
+            # Resizes arrive faster than the event loop runs: passes coalesce
+            del passes[:]
+            start = time.perf_counter()
+            for step in range(100):
+                window.resize(700 + (step * 13) % 500, 500 + (step * 7) % 400)
+            self.wait_for(app, lambda: not window.layout_pending)
+            app.processEvents()
+            batched.append(time.perf_counter() - start)
+            batched_passes = len(passes)
+
+            for step in range(100):
+                window.resize(700 + (step * 11) % 500, 500 + (step * 3) % 400)
+                start = time.perf_counter()
+                window.update_box_sizes()
+                direct.append(time.perf_counter() - start)
+        self.record("resize_storm_100_interleaved", interleaved, layout_passes=interleaved_passes)
+        self.record("resize_storm_100_batched", batched, layout_passes=batched_passes)
+        self.record("update_box_sizes", direct)
+        window.go_back()
+        window.close()
+
+    def bench_search(self):
+        self.workdir()
+        self.champion_data()
+        app, window = self.main_window()
+
+        results = []
+        on_result = window.on_search_result
+
+        def record_result(result):
+            results.append(result)
+            on_result(result)
+
+        window.on_search_result = record_result
+
+        def search(name):
+            window.name_input.setText(name)
+            window.tag_input.setText("EUW")
+            count = len(results)
+            start = time.perf_counter()
+            window.on_search()
+            self.wait_for(app, lambda: len(results) > count)
+            return time.perf_counter() - start
+
+        # Every name new: PUUID and ranked lookups go to the stub
+        self.record("on_search_uncached", [search(f"player{i}") for i in range(self.repeat)],
+                    latency_ms=self.stub.latency * 1000)
+        # Same name again: both come from the local ResponseCache
+        self.record("on_search_cached", [search("player0") for _ in range(self.repeat)])
+        window.close()
+
+    def cleanup(self):
+        os.chdir(REPO_ROOT)
+        for path in self.workdirs:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+BENCHMARKS = {
+    "champion_data": Bench.bench_champion_data,
+    "icons": Bench.bench_icons,
+    "champ_select": Bench.bench_champ_select,
+    "search": Bench.bench_search,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tracker's hot paths offline.")
+    parser.add_argument("-o", "--output", help="also write the JSON results to this file")
+    parser.add_argument("--repeat", type=int, default=50, help="samples per benchmark (default 50)")
+    parser.add_argument("--latency", type=float, default=0,
+                        help="milliseconds the stub Riot API waits before answering")
+    parser.add_argument("--only", help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    output = os.path.abspath(args.output) if args.output else None
+    stub = StubServer(latency=args.latency / 1000).start()
+    bench = Bench(stub, args.repeat)
+    try:
+        for name in names:
+            print(f"Running {name}...", file=sys.stderr)
+            BENCHMARKS[name](bench)
+    finally:
+        bench.cleanup()
+        stub.stop()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": bench.results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/stub_server.py
+"""
+Local stand-in for Data Dragon, the Riot API and the League client, so the
+benchmarks run offline and don't depend on network conditions.
+
+    Data Dragon  /api/versions.json, /cdn/<patch>/data/en_US/*.json, /cdn/<patch>/img/...
+    Riot API     /<host>/riot/account/v1/..., /<host>/lol/league/v4/...  (api_root=".../{host}")
+    LCU          /lol-champ-select/v1/session  (serves StubServer.session)
+"""
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ASSETS = os.path.join(os.path.dirname(__file__), "..", "assets")
+
+
+def make_png(width=120, height=120, rgb=(40, 90, 160)):
+    """A solid-colour PNG, the size of a Data Dragon icon."""
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    row = b"\x00" + bytes(rgb) * width
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(row * height))
+        + chunk(b"IEND", b"")
+    )
+
+
+class StubServer:
+    def __init__(self, latency=0.0, patch=None):
+        self.latency = latency  # seconds added to every Riot API response
+        self.session = None     # champ select session served to the LCU endpoint
+        self.requests = 0
+
+        with open(os.path.join(REPO_ASSETS, "champion.json"), "rb") as f:
+            self.champion_json = f.read()
+        with open(os.path.join(REPO_ASSETS, "summoner.json"), "rb") as f:
+            self.summoner_json = f.read()
+        self.patch = patch or json.loads(self.champion_json)["version"]
+        self.png = make_png()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def root(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    @property
+    def port(self):
+        return self.server.server_port
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # ----------------------------------------------------
+    # Routing
+    # ----------------------------------------------------
+    def respond(self, path, headers):
+        """(status, content_type, body, extra_headers) for a GET of `path`."""
+        self.requests += 1
+        path = path.split("?", 1)[0]
+
+        if path == "/api/versions.json":
+            etag = f'"{self.patch}"'
+            if headers.get("If-None-Match") == etag:
+                return 304, None, b"", {"ETag": etag}
+            return 200, "application/json", json.dumps([self.patch]).encode(), {"ETag": etag}
+        if path.endswith("/data/en_US/champion.json"):
+            return 200, "application/json", self.champion_json, {}
+        if path.endswith("/data/en_US/summoner.json"):
+            return 200, "application/json", self.summoner_json, {}
+        if "/img/" in path:
+            return 200, "image/png", self.png, {}
+
+        if path == "/lol-champ-select/v1/session":
+            if self.session is None:
+                return 404, "application/json", b'{"message":"No active delegate"}', {}
+            return 200, "application/json", json.dumps(self.session).encode(), {}
+
+        if "/riot/account/v1/accounts/by-riot-id/" in path:
+            time.sleep(self.latency)
+            name = path.rstrip("/").split("/")[-2]
+            return 200, "application/json", json.dumps({"puuid": f"puuid-{name}"}).encode(), {}
+        if "/lol/league/v4/entries/by-puuid/" in path:
+            time.sleep(self.latency)
+            entries = [
+                {"queueType": "RANKED_SOLO_5x5", "tier": "GOLD", "rank": "II",
+                 "leaguePoints": 42, "wins": 51, "losses": 47},
+                {"queueType": "RANKED_FLEX_SR", "tier": "SILVER", "rank": "I",
+                 "leaguePoints": 10, "wins": 12, "losses": 9},
+            ]
+            return 200, "application/json", json.dumps(entries).encode(), {}
+
+        return 404, "application/json", b'{"status":{"status_code":404}}', {}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real hosts
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+            def do_GET(self):
+                status, content_type, body, extra = stub.respond(self.path, self.headers)
+                self.send_response(status)
+                if content_type:
+                    self.send_header("Content-Type", content_type)
+                for key, value in extra.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
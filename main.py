@@ -1,11 +1,32 @@
 # main.py
+#
+# TRACKER_RECORD=session.json   record Riot API, Data Dragon and LCU traffic
+# TRACKER_REPLAY=session.json   replay it instead of going online
+#                               (TRACKER_REPLAY_LATENCY=1 keeps the recorded timing)
 from PySide6.QtWidgets import QApplication
 from ui.main_window import MainWindow
+from api.replay import RecordingTransport, ReplayTransport, write_replay_lockfile
+import os
 import sys
+import tempfile
+
+transport = None
+if os.getenv("TRACKER_REPLAY"):
+    transport = ReplayTransport(
+        os.getenv("TRACKER_REPLAY"),
+        latency=float(os.getenv("TRACKER_REPLAY_LATENCY", "0"))
+    )
+    # The League client needn't run, but LeagueClient wants a port and token
+    os.environ.setdefault("LEAGUE_LOCKFILE", write_replay_lockfile(tempfile.mkdtemp()))
+elif os.getenv("TRACKER_RECORD"):
+    transport = RecordingTransport(os.getenv("TRACKER_RECORD"))
 
 app = QApplication(sys.argv)
 
-window = MainWindow()
+window = MainWindow(transport=transport)
 window.show()
 
-app.exec()
\ No newline at end of file
+app.exec()
+
+if transport:
+    transport.close()
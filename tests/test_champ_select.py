@@ -0,0 +1,68 @@
+from api.champ_select import ChampSelectSnapshot, EMPTY_SNAPSHOT, PickSlot, UNRENDERED
+
+
+def member(team, champion_id=0, spell1=0, spell2=0, puuid=""):
+    return {"team": team, "championId": champion_id, "spell1Id": spell1,
+            "spell2Id": spell2, "puuid": puuid}
+
+
+def ban(champion_id, ally, completed=True):
+    return {"type": "ban", "championId": champion_id, "isAllyAction": ally, "completed": completed}
+
+
+SESSION = {
+    "myTeam": [member(1, 266, 4, 14, "p1"), member(1, puuid="p2")],
+    "theirTeam": [member(2, 103, 4, 7, "p6")],
+    "actions": [[ban(1, True), ban(2, False), ban(3, True, completed=False)], [ban(4, False)]],
+}
+
+
+def test_from_session():
+    snapshot = ChampSelectSnapshot.from_session(SESSION)
+    assert snapshot.blue_picks[0] == PickSlot(266, 4, 14)
+    assert snapshot.blue_picks[1] == PickSlot()
+    assert snapshot.red_picks[0] == PickSlot(103, 4, 7)
+    assert snapshot.blue_players == ("p1", "p2", "", "", "")
+    assert snapshot.red_players == ("p6", "", "", "", "")
+    # Blue bans fill left to right, red bans right to left; incomplete ones are skipped
+    assert snapshot.blue_bans == (1, 0, 0, 0, 0)
+    assert snapshot.red_bans == (0, 0, 0, 4, 2)
+
+
+def test_no_changes_for_an_equal_snapshot():
+    snapshot = ChampSelectSnapshot.from_session(SESSION)
+    assert list(snapshot.changes(ChampSelectSnapshot.from_session(SESSION))) == []
+
+
+def test_changes_from_empty():
+    changes = set(ChampSelectSnapshot.from_session(SESSION).changes(EMPTY_SNAPSHOT))
+    assert changes == {
+        ("champ", "blue", 0, 266), ("spell1", "blue", 0, 4), ("spell2", "blue", 0, 14),
+        ("champ", "red", 0, 103), ("spell1", "red", 0, 4), ("spell2", "red", 0, 7),
+        ("ban", "blue", 0, 1), ("ban", "red", 4, 2), ("ban", "red", 3, 4),
+        ("player", "blue", 0, "p1"), ("player", "blue", 1, "p2"), ("player", "red", 0, "p6"),
+    }
+
+
+def test_changes_only_report_what_differs():
+    before = ChampSelectSnapshot.from_session(SESSION)
+    session = dict(SESSION, myTeam=[member(1, 266, 4, 12, "p1"), member(1, 99, puuid="p2")])
+    after = ChampSelectSnapshot.from_session(session)
+    assert list(after.changes(before)) == [("spell2", "blue", 0, 12), ("champ", "blue", 1, 99)]
+
+
+def test_changes_to_empty_report_zero():
+    before = ChampSelectSnapshot.from_session(SESSION)
+    assert ("champ", "red", 0, 0) in set(EMPTY_SNAPSHOT.changes(before))
+
+
+def test_unrendered_slots_are_reported_again():
+    snapshot = ChampSelectSnapshot.from_session(SESSION)
+    drawn = snapshot.with_unrendered([("champ", "blue", 0), ("spell2", "red", 0), ("ban", "red", 4)])
+    assert drawn.blue_picks[0] == PickSlot(UNRENDERED, 4, 14)
+    assert drawn.red_picks[0] == PickSlot(103, 4, UNRENDERED)
+    assert drawn.red_bans[4] == UNRENDERED
+    assert list(snapshot.changes(drawn)) == [
+        ("champ", "blue", 0, 266), ("spell2", "red", 0, 7), ("ban", "red", 4, 2)
+    ]
+    assert snapshot.with_unrendered([]) is snapshot
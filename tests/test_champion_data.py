@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+
+import pytest
+import requests
+
+from api.champion_data import ChampionData
+
+ROOT = "https://ddragon.test"
+
+
+def champion_json(patch, champions):
+    """champions: (name, key, sprite x[, title]) tuples."""
+    return json.dumps({"version": patch, "data": {
+        name: {"version": patch, "key": str(key), "id": name, "title": title[0] if title else "",
+               "image": {"full": f"{name}.png", "sprite": "champion0.png", "x": x, "y": 0, "w": 48, "h": 48}}
+        for name, key, x, *title in champions
+    }})
+
+
+def spell_json():
+    return json.dumps({"data": {"SummonerFlash": {
+        "key": "4", "id": "SummonerFlash",
+        "image": {"full": "SummonerFlash.png", "sprite": "spell0.png", "x": 0, "y": 0, "w": 48, "h": 48},
+    }}})
+
+
+def response(status, body=b"", headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body if isinstance(body, bytes) else body.encode()
+    resp.headers.update(headers or {})
+    resp.url = ROOT
+    return resp
+
+
+class FakeDataDragon:
+    """Serves versions.json (with ETag), per-patch data files and icons."""
+
+    def __init__(self, patch):
+        self.patch = patch
+        self.champions = {patch: [("Ahri", 103, 0), ("Annie", 1, 48)]}
+        self.broken = set()  # URL suffixes answering 500
+        self.icons = {}      # "champion/Ahri.png" -> bytes, for art that differs from the default
+        self.requests = []
+        self.downloads = []  # icon keys sent in full (not 304)
+
+    def get(self, url, headers=None, endpoint=None, **kwargs):
+        self.requests.append(url)
+        if any(url.endswith(suffix) for suffix in self.broken):
+            return response(500)
+        if url.endswith("/api/versions.json"):
+            etag = f'"{self.patch}"'
+            if (headers or {}).get("If-None-Match") == etag:
+                return response(304, headers={"ETag": etag})
+            return response(200, json.dumps([self.patch]), {"ETag": etag})
+        patch = url.split("/cdn/", 1)[1].split("/", 1)[0]
+        if url.endswith("/champion.json"):
+            return response(200, champion_json(patch, self.champions[patch]))
+        if url.endswith("/summoner.json"):
+            return response(200, spell_json())
+        if "/img/" in url:
+            key = url.split("/img/", 1)[1]
+            body = self.icons.get(key, key.encode())
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            if (headers or {}).get("If-None-Match") == etag:
+                return response(304, headers={"ETag": etag})
+            self.downloads.append(key)
+            return response(200, body, {"ETag": etag})
+        return response(404)
+
+
+@pytest.fixture
+def ddragon(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return FakeDataDragon("15.21.1")
+
+
+def make(ddragon, **kwargs):
+    return ChampionData(transport=ddragon, ddragon_root=ROOT, **kwargs)
+
+
+def test_first_refresh_installs_the_patch(ddragon):
+    data = make(ddragon)
+    assert data.current_patch == "15.21.1"
+    assert data.id_to_name == {103: "Ahri", 1: "Annie"}
+    assert data.find_champion_icon(103)
+    assert data.find_spell_icon(4)
+
+
+def test_failed_install_is_retried_after_a_304(ddragon):
+    data = make(ddragon)
+    ddragon.patch = "15.22.1"
+    ddragon.champions["15.22.1"] = ddragon.champions["15.21.1"]
+    ddragon.broken.add("/15.22.1/data/en_US/champion.json")
+    assert not data.refresh()
+    assert data.current_patch == "15.21.1"
+
+    # versions.json is unchanged (304), but the patch it listed isn't installed yet
+    ddragon.broken.clear()
+    assert data.refresh()
+    assert data.current_patch == "15.22.1"
+    assert data.read_patch_cache()["patch"] == "15.22.1"
+
+
+def test_unchanged_versions_are_not_downloaded_again(ddragon):
+    data = make(ddragon)
+    ddragon.requests.clear()
+    assert not data.refresh()
+    assert ddragon.requests == [f"{ROOT}/api/versions.json"]
+
+
+def test_find_icon_never_downloads(ddragon):
+    data = make(ddragon, refresh=False)
+    assert data.find_champion_icon(103) is None
+    assert ddragon.requests == []
+
+
+def new_patch(ddragon, patch, champions):
+    ddragon.patch = patch
+    ddragon.champions[patch] = champions
+
+
+def test_new_patch_keeps_unchanged_icons(ddragon):
+    data = make(ddragon)
+    ddragon.downloads.clear()
+    # A new champion shifts every sprite offset; the icon files stay the same
+    new_patch(ddragon, "15.22.1", [("Aatrox", 266, 0), ("Ahri", 103, 48), ("Annie", 1, 96)])
+    ddragon.requests.clear()
+    assert data.refresh()
+    assert ddragon.downloads == ["champion/Aatrox.png"]
+    # Only the new champion's icon is requested: the others' entries are unchanged
+    assert [url for url in ddragon.requests if "/img/" in url] == [f"{ROOT}/cdn/15.22.1/img/champion/Aatrox.png"]
+    assert data.read_manifest()["champion/Ahri.png"]["patch"] == "15.22.1"
+    assert data.icon_pack is not None and "champion/Aatrox.png" in data.icon_pack
+
+
+def test_new_art_under_the_same_name_is_downloaded(ddragon):
+    data = make(ddragon)
+    ddragon.downloads.clear()
+    ddragon.requests.clear()
+    # A visual update edits the champion's entry along with its art
+    new_patch(ddragon, "15.22.1", [("Ahri", 103, 0, "the Nine-Tailed Fox"), ("Annie", 1, 48)])
+    ddragon.icons["champion/Ahri.png"] = b"new ahri art"
+    assert data.refresh()
+    assert ddragon.downloads == ["champion/Ahri.png"]
+    assert [url for url in ddragon.requests if "/img/" in url] == [f"{ROOT}/cdn/15.22.1/img/champion/Ahri.png"]
+    assert data.read_icon(data.find_champion_icon(103)) == b"new ahri art"
+
+
+def test_edited_entry_with_the_same_art_is_kept(ddragon):
+    data = make(ddragon)
+    ddragon.downloads.clear()
+    new_patch(ddragon, "15.22.1", [("Ahri", 103, 0, "balance changes"), ("Annie", 1, 48)])
+    assert data.refresh()
+    assert ddragon.downloads == []  # revalidated: 304
+    assert data.read_manifest()["champion/Ahri.png"]["patch"] == "15.22.1"
+    assert data.icon_pack is not None
+
+
+def test_manifest_without_checksums_is_revalidated(ddragon):
+    data = make(ddragon)
+    manifest = data.read_manifest()
+    for entry in manifest.values():
+        del entry["checksum"]
+    data.write_manifest(manifest)
+    ddragon.requests.clear()
+    new_patch(ddragon, "15.22.1", ddragon.champions["15.21.1"])
+    assert data.refresh()
+    assert len([url for url in ddragon.requests if "/img/" in url]) == len(manifest)
+    assert all("checksum" in entry for entry in data.read_manifest().values())
+
+
+def test_renamed_or_removed_icons_are_deleted(ddragon):
+    data = make(ddragon)
+    new_patch(ddragon, "15.22.1", [("Ahri", 103, 0)])
+    assert data.refresh()
+    assert not os.path.exists(os.path.join(data.base_path, "Annie.png"))
+    assert "champion/Annie.png" not in data.read_manifest()
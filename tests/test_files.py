@@ -0,0 +1,50 @@
+import os
+import threading
+
+import pytest
+
+from utils.files import write_atomic
+
+
+def test_write_text_and_bytes(tmp_path):
+    path = str(tmp_path / "data.json")
+    write_atomic(path, '{"a": "é"}')
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == '{"a": "é"}'
+    write_atomic(path, b"\x89PNG")
+    with open(path, "rb") as f:
+        assert f.read() == b"\x89PNG"
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_concurrent_writers_of_one_path(tmp_path):
+    path = str(tmp_path / "icon.png")
+    contents = [bytes([i]) * 200_000 for i in range(8)]
+    errors = []
+    start = threading.Barrier(len(contents))
+
+    def write(content):
+        start.wait()
+        try:
+            for _ in range(20):
+                write_atomic(path, content)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(content,)) for content in contents]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with open(path, "rb") as f:
+        assert f.read() in contents  # one writer's file, whole
+    assert os.listdir(tmp_path) == ["icon.png"]
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path):
+    path = str(tmp_path / "data.json")
+    with pytest.raises(TypeError):
+        write_atomic(path, 42)
+    assert os.listdir(tmp_path) == []
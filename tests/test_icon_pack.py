@@ -0,0 +1,48 @@
+import pytest
+
+from api.icon_pack import HEADER, MAGIC, IconPack, build_icon_pack
+
+
+def test_round_trip(tmp_path):
+    icons = {"champion/Ahri.png": b"\x89PNG ahri", "spell/SummonerFlash.png": b"\x89PNG flash", "empty.png": b""}
+    entries = []
+    for name, data in icons.items():
+        file_path = tmp_path / name.replace("/", "_")
+        file_path.write_bytes(data)
+        entries.append((name, str(file_path)))
+    entries.append(("champion/Missing.png", str(tmp_path / "missing.png")))  # skipped
+
+    path = str(tmp_path / "icons.pack")
+    assert build_icon_pack(path, entries) == 3
+    assert not (tmp_path / "icons.pack.tmp").exists()
+
+    with open(path, "rb") as f:
+        assert f.read(len(MAGIC)) == MAGIC
+
+    pack = IconPack(path)
+    try:
+        assert len(pack) == 3
+        for name, data in icons.items():
+            assert name in pack
+            assert pack.get(name) == data
+        assert "champion/Missing.png" not in pack
+        assert pack.get("champion/Missing.png") is None
+    finally:
+        pack.close()
+
+
+def test_empty_pack(tmp_path):
+    path = str(tmp_path / "icons.pack")
+    assert build_icon_pack(path, []) == 0
+    pack = IconPack(path)
+    try:
+        assert len(pack) == 0
+    finally:
+        pack.close()
+
+
+def test_wrong_magic_is_rejected(tmp_path):
+    path = tmp_path / "icons.pack"
+    path.write_bytes(HEADER.pack(b"NOTAPACK", 2) + b"{}")
+    with pytest.raises(ValueError):
+        IconPack(str(path))
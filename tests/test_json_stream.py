@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from api.json_stream import iter_array
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def items_at_every_chunk_size(data, key):
+    """Items decoded with every chunk size from 1 byte to the whole document."""
+    return {size: list(iter_array(chunked(data, size), key)) for size in range(1, len(data) + 1)}
+
+
+def assert_items(data, key, expected):
+    for size, items in items_at_every_chunk_size(data, key).items():
+        assert items == expected, f"chunk size {size}"
+
+
+def test_numbers_split_across_chunks():
+    assert_items(b'{"frames":[1.5e3]}', "frames", [1500.0])
+    assert_items(b'{"frames":[12, -0.25,3E-2 ,7]}', "frames", [12, -0.25, 0.03, 7])
+
+
+def test_literals_split_across_chunks():
+    assert_items(b'{"frames":[true,false ,null]}', "frames", [True, False, None])
+
+
+def test_objects():
+    doc = {"info": {"frames": [
+        {"timestamp": 0, "events": []},
+        {"timestamp": 60000, "events": [{"type": "CHAMPION_KILL"}]},
+    ]}}
+    assert_items(json.dumps(doc).encode(), "frames", doc["info"]["frames"])
+
+
+def test_multibyte_characters_split_across_chunks():
+    assert_items('{"frames":["é", "ü"]}'.encode(), "frames", ["é", "ü"])
+
+
+def test_key_inside_a_string_is_skipped():
+    assert_items(b'{"a":["frames"],"note":"\\"frames\\":[1]","frames":[2]}', "frames", [2])
+
+
+def test_empty_array():
+    assert_items(b'{"frames": [ ]}', "frames", [])
+
+
+def test_missing_key():
+    with pytest.raises(ValueError):
+        list(iter_array([b'{"other":[1]}'], "frames"))
+
+
+@pytest.mark.parametrize("data", [b'{"frames":[1,', b'{"frames":[{"a":1}', b'{"frames":[1.5e'])
+def test_truncated_stream(data):
+    with pytest.raises(ValueError):
+        list(iter_array(chunked(data, 3), "frames"))
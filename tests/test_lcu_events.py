@@ -0,0 +1,73 @@
+from api.lcu_events import LCUEventStream
+
+
+class FakeStop:
+    """Stands in for the stream's stop Event: records waits, stops after `limit`."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.waits = []
+
+    def is_set(self):
+        return len(self.waits) >= self.limit
+
+    def wait(self, seconds):
+        self.waits.append(seconds)
+
+
+class AbsentClient:
+    host = "127.0.0.1"
+    protocol = "https"
+    port = None
+    token = None
+
+    def __init__(self):
+        self.finds = 0
+        self.forgets = 0
+
+    def client_info(self):
+        if self.port and self.token:
+            return self.protocol, self.port, self.token
+        self.finds += 1
+        return None
+
+    def forget_client_info(self, info=None):
+        self.forgets += 1
+
+
+def test_reconnect_delay_doubles_while_client_is_absent():
+    client = AbsentClient()
+    stream = LCUEventStream(client, "event", lambda payload: None, retry_delay=2.0, max_retry_delay=30.0)
+    stream._stop = FakeStop(6)
+    stream._run()
+    assert stream._stop.waits == [2.0, 4.0, 8.0, 16.0, 30.0, 30.0]
+    assert client.forgets == 0  # nothing cached to forget
+
+
+def test_refused_connection_forgets_credentials_and_backs_off():
+    client = AbsentClient()
+    client.port, client.token = "1", "tok"
+    stream = LCUEventStream(client, "event", lambda payload: None, retry_delay=1.0)
+    stream._stop = FakeStop(3)
+    attempts = []
+
+    def listen(info):
+        attempts.append(info[1])
+        client.port = None  # forget_client_info() below is a fake
+        return False
+
+    stream._listen = listen
+    stream._run()
+    assert attempts == ["1"]
+    assert client.forgets == 1
+    assert stream._stop.waits == [1.0, 2.0, 4.0]
+
+
+def test_delay_resets_after_a_connection():
+    client = AbsentClient()
+    client.port, client.token = "1", "tok"
+    stream = LCUEventStream(client, "event", lambda payload: None, retry_delay=1.0)
+    stream._stop = FakeStop(3)
+    stream._listen = lambda info: True  # connected, then dropped
+    stream._run()
+    assert stream._stop.waits == [1.0, 1.0, 1.0]
@@ -0,0 +1,152 @@
+import pytest
+import requests
+
+from api.league_client import LeagueClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.delenv("LEAGUE_LOCKFILE", raising=False)
+    clock = FakeClock()
+    client = LeagueClient(lockfile_path=str(tmp_path / "lockfile"), clock=clock)
+    client.lockfile_paths = client.lockfile_paths[:1]  # ignore real installs on this machine
+    client.clock = clock
+    client.scans = 0
+
+    def scan_process():
+        client.scans += 1
+        return False
+
+    client.scan_process = scan_process
+    return client
+
+
+def test_read_lockfile(tmp_path, client):
+    (tmp_path / "lockfile").write_text("LeagueClient:1234:54321:s3cret:https")
+    assert client.find_client_info()
+    assert (client.port, client.token, client.protocol) == ("54321", "s3cret", "https")
+    assert client.scans == 0
+
+
+def test_malformed_lockfile_is_ignored(tmp_path, client):
+    (tmp_path / "lockfile").write_text("LeagueClient:1234:notaport:s3cret:https")
+    assert not client.read_lockfile()
+    assert client.port is None
+
+
+def test_env_lockfile_is_used(tmp_path, monkeypatch):
+    path = tmp_path / "env_lockfile"
+    path.write_text("LeagueClient:1:4000:tok:http")
+    monkeypatch.setenv("LEAGUE_LOCKFILE", str(path))
+    client = LeagueClient(lockfile_path=str(tmp_path / "missing"))
+    assert client.read_lockfile()
+    assert (client.port, client.protocol) == ("4000", "http")
+
+
+def test_failed_scan_backs_off(client):
+    assert not client.find_client_info()
+    assert not client.find_client_info()
+    assert client.scans == 1
+
+    client.clock.now = 5.0
+    assert not client.find_client_info()
+    assert client.scans == 2
+
+    client.clock.now = 14.0  # backoff doubled to 10 s
+    assert not client.find_client_info()
+    assert client.scans == 2
+    client.clock.now = 15.0
+    client.find_client_info()
+    assert client.scans == 3
+
+
+def test_backoff_is_capped(client):
+    for _ in range(10):
+        client.find_client_info()
+        client.clock.now += 1000
+    assert client._scan_delay == client.max_scan_backoff
+
+
+def test_lockfile_is_checked_during_backoff(tmp_path, client):
+    assert not client.find_client_info()
+    (tmp_path / "lockfile").write_text("LeagueClient:1:5000:tok:https")
+    assert client.find_client_info()
+    assert client.port == "5000"
+    assert client._next_scan is None
+
+
+class RegionLocale:
+    status_code = 200
+
+    def __init__(self, region):
+        self.region = region
+
+    def json(self):
+        return {"locale": "en_US", "region": self.region}
+
+
+def test_platform_from_the_client_region(tmp_path, client):
+    (tmp_path / "lockfile").write_text("LeagueClient:1:5000:tok:https")
+    requested = []
+
+    def get(endpoint, info):
+        requested.append(endpoint)
+        return RegionLocale("EUNE")
+
+    client._get = get
+    assert client.get_platform() == "eun1"
+    assert client.get_platform() == "eun1"
+    assert requested == ["/riotclient/region-locale"]
+
+    client.forget_client_info()  # client restarted, maybe on another account
+    client._get = lambda endpoint, info: RegionLocale("NA")
+    assert client.get_platform() == "na1"
+
+
+def test_no_platform_without_a_client(client):
+    assert client.get_platform() is None
+
+
+def test_client_info_is_one_consistent_tuple(tmp_path, client):
+    assert client.client_info() is None
+    (tmp_path / "lockfile").write_text("LeagueClient:1:5000:tok:https")
+    assert client.client_info() == ("https", "5000", "tok")
+
+
+def test_forgetting_stale_info_keeps_newer_credentials(tmp_path, client):
+    (tmp_path / "lockfile").write_text("LeagueClient:1:5000:old:https")
+    stale = client.client_info()
+    # Another thread already found the restarted client
+    (tmp_path / "lockfile").write_text("LeagueClient:2:6000:new:https")
+    client.forget_client_info()
+    assert client.client_info() == ("https", "6000", "new")
+
+    client.forget_client_info(stale)
+    assert client.client_info() == ("https", "6000", "new")
+    client.forget_client_info(("https", "6000", "new"))
+    assert client.port is None
+
+
+def test_request_retries_with_rediscovered_credentials(tmp_path, client):
+    (tmp_path / "lockfile").write_text("LeagueClient:1:5000:old:https")
+    client.client_info()
+    (tmp_path / "lockfile").write_text("LeagueClient:2:6000:new:https")
+    used = []
+
+    def get(endpoint, info):
+        used.append(info)
+        if info[1] == "5000":
+            raise requests.ConnectionError("client restarted")
+        return RegionLocale("KR")
+
+    client._get = get
+    assert client.request("/riotclient/region-locale") == (200, {"locale": "en_US", "region": "KR"})
+    assert used == [("https", "5000", "old"), ("https", "6000", "new")]
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+from api.match_ingest import MatchIngester
+from api.match_store import MatchStore
+
+
+class FakeRiotAPI:
+    """match-v5 over an in-memory set of games: match ID -> (created ms, puuids)."""
+
+    def __init__(self):
+        self.games = {}
+        self.broken = set()       # match IDs answering 500
+        self.broken_lists = set()  # puuids whose ids request fails
+        self.fetched = []
+        self.listed = []
+
+    def add(self, match_id, created, *puuids):
+        self.games[match_id] = (created * 1000, puuids)
+
+    def get_match_ids(self, puuid, start=0, count=20, since=None, platform=None):
+        self.listed.append((puuid, start, count, since))
+        if puuid in self.broken_lists:
+            return 500, {"status": {"message": "Internal error"}}
+        ids = sorted(
+            (match_id for match_id, (created, puuids) in self.games.items()
+             if puuid in puuids and (since is None or created >= since * 1000)),
+            key=lambda match_id: self.games[match_id][0], reverse=True
+        )
+        return 200, ids[start:start + count]
+
+    def get_match(self, match_id, raw=False, platform=None):
+        self.fetched.append(match_id)
+        if match_id in self.broken:
+            return 500, {"status": {"message": "Internal error"}}
+        created, puuids = self.games[match_id]
+        body = {
+            "metadata": {"matchId": match_id, "participants": list(puuids)},
+            "info": {"gameCreation": created, "gameDuration": 1800, "queueId": 420, "participants": [
+                {"puuid": puuid, "teamId": 100, "championId": 103, "championName": "Ahri", "win": True}
+                for puuid in puuids
+            ]},
+        }
+        return 200, json.dumps(body).encode()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MatchStore(str(tmp_path / "matches.db"), str(tmp_path / "matches"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def api():
+    api = FakeRiotAPI()
+    api.add("EUW1_1", 1000, "a", "b")
+    api.add("EUW1_2", 2000, "a")
+    api.add("EUW1_3", 3000, "a", "b")
+    api.add("EUW1_4", 4000, "b")
+    return api
+
+
+def test_shared_matches_are_fetched_once(api, store):
+    results = MatchIngester(api, store).ingest_many(["a", "b", "a"])
+    assert sorted(api.fetched) == ["EUW1_1", "EUW1_2", "EUW1_3", "EUW1_4"]
+    assert sorted(results["a"]) == ["EUW1_1", "EUW1_2", "EUW1_3"]
+    assert sorted(results["b"]) == ["EUW1_1", "EUW1_3", "EUW1_4"]
+    assert store.match_ids("a") == ["EUW1_3", "EUW1_2", "EUW1_1"]
+    assert (store.synced_until("a"), store.synced_until("b")) == (3000, 4000)
+
+
+def test_next_sync_lists_and_fetches_only_newer_games(api, store):
+    ingester = MatchIngester(api, store)
+    ingester.ingest_many(["a", "b"])
+    api.fetched.clear()
+    api.listed.clear()
+    api.add("EUW1_5", 5000, "a", "b")
+
+    results = ingester.ingest_many(["a", "b"])
+    assert api.fetched == ["EUW1_5"]
+    assert {puuid: since for puuid, _, _, since in api.listed} == {"a": 3000, "b": 4000}
+    assert results == {"a": ["EUW1_5"], "b": ["EUW1_5"]}
+    assert (store.synced_until("a"), store.synced_until("b")) == (5000, 5000)
+
+
+def test_watermark_waits_for_every_fetch_to_succeed(api, store):
+    ingester = MatchIngester(api, store)
+    api.broken.add("EUW1_2")  # only "a" played it
+    results = ingester.ingest_many(["a", "b"])
+
+    assert store.synced_until("a") is None
+    assert store.synced_until("b") == 4000
+    assert sorted(results["a"]) == ["EUW1_1", "EUW1_3"]
+    assert "EUW1_2" not in store.match_ids("a")
+
+    # Next time the failed game is listed again (no watermark) and fetched; the rest is stored
+    api.broken.clear()
+    api.fetched.clear()
+    assert ingester.ingest("a") == ["EUW1_2"]
+    assert api.fetched == ["EUW1_2"]
+    assert store.synced_until("a") == 3000
+
+
+def test_failed_list_reports_none_and_keeps_the_watermark(api, store):
+    ingester = MatchIngester(api, store)
+    ingester.ingest_many(["a"])
+    api.broken_lists.add("a")
+    assert ingester.ingest_many(["a", "b"])["a"] is None
+    assert store.synced_until("a") == 3000
+
+
+def test_first_sync_is_capped_and_paged(store):
+    api = FakeRiotAPI()
+    for n in range(1, 251):
+        api.add(f"EUW1_{n}", n, "a")
+    results = MatchIngester(api, store, max_matches=150).ingest("a")
+    assert len(results) == 150
+    assert [(start, count) for _, start, count, _ in api.listed] == [(0, 100), (100, 50)]
+    assert store.synced_until("a") == 250
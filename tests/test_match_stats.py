@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from api.match_stats import NUMERIC_COLUMNS, PlayerStats, rolling_sum
+
+
+class FakeStore:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def participant_rows(self, puuid, queue_id=None):
+        return self.rows
+
+
+def row(ts, champion_id, name, win, kills=0, deaths=0, assists=0, cs=0, damage=0,
+        team_damage=0, duration=1800):
+    """One MatchStore.participant_rows() tuple; ts in epoch seconds."""
+    return (ts * 1000, duration, champion_id, name, int(win), kills, deaths, assists,
+            cs, damage, team_damage)
+
+
+def test_rolling_sum():
+    assert rolling_sum(np.array([1, 2, 3, 4]), 2).tolist() == [1, 3, 5, 7]
+    assert rolling_sum(np.array([1, 2, 3]), 10).tolist() == [1, 3, 6]
+    assert rolling_sum(np.array([]), 3).tolist() == []
+
+
+def test_empty_history():
+    stats = PlayerStats.from_store(FakeStore([]), "p")
+    assert len(stats) == 0
+    assert set(stats.columns) == set(NUMERIC_COLUMNS)
+    assert stats.overall() == {"games": 0, "wins": 0, "winrate": None, "kda": 0.0,
+                               "cs_per_min": 0.0, "damage_share": 0.0}
+    assert stats.by_champion() == []
+    trend = stats.trend()
+    assert all(len(values) == 0 for values in trend.values())
+
+
+def test_single_champion():
+    stats = PlayerStats.from_store(FakeStore([
+        row(100, 103, "Ahri", True, kills=6, deaths=2, assists=4, cs=180, damage=20_000,
+            team_damage=80_000),
+        row(200, 103, "Ahri", False, kills=2, deaths=0, assists=2, cs=120, damage=10_000,
+            team_damage=50_000, duration=1200),
+    ]), "p")
+    overall = stats.overall()
+    assert (overall["games"], overall["wins"], overall["winrate"]) == (2, 1, 0.5)
+    assert overall["kda"] == pytest.approx((8 + 6) / 2)
+    assert overall["cs_per_min"] == pytest.approx(300 / 50)
+    assert overall["damage_share"] == pytest.approx((0.25 + 0.2) / 2)
+
+    (ahri,) = stats.by_champion()
+    assert (ahri["champion"], ahri["champion_id"], ahri["games"]) == ("Ahri", 103, 2)
+    assert {key: ahri[key] for key in overall} == overall
+
+
+def test_by_champion_sorts_by_games_and_filters():
+    stats = PlayerStats.from_store(FakeStore([
+        row(1, 1, "Annie", True, kills=1, deaths=1),
+        row(2, 103, "Ahri", True),
+        row(3, 103, "Ahri", False, deaths=3),
+        row(4, 103, "Ahri", True),
+        row(5, 1, "Annie", False, deaths=0),
+        row(6, 266, "Aatrox", False),
+    ]), "p")
+    champions = stats.by_champion()
+    assert [(c["champion"], c["games"], c["wins"]) for c in champions] == [
+        ("Ahri", 3, 2), ("Annie", 2, 1), ("Aatrox", 1, 0)]
+    assert champions[0]["kda"] == 0.0 and champions[1]["kda"] == 1.0
+    assert [c["champion"] for c in stats.by_champion(min_games=2)] == ["Ahri", "Annie"]
+
+
+def test_zero_duration_and_team_damage_are_not_divided_by():
+    stats = PlayerStats.from_store(FakeStore([row(1, 1, "Annie", True, cs=10, duration=0)]), "p")
+    assert stats.overall()["cs_per_min"] == 0.0
+    assert stats.overall()["damage_share"] == 0.0
+    assert stats.trend()["cs_per_min"].tolist() == [0.0]
+
+
+def test_trend_is_rolling():
+    stats = PlayerStats.from_store(FakeStore([
+        row(100, 1, "Annie", True, kills=3, deaths=1),
+        row(200, 1, "Annie", False, kills=0, deaths=2),
+        row(300, 1, "Annie", False, kills=1, deaths=0),
+        row(400, 1, "Annie", True, kills=2, deaths=1),
+    ]), "p")
+    trend = stats.trend(window=2)
+    assert trend["ts"].tolist() == [100, 200, 300, 400]
+    assert trend["winrate"].tolist() == [1.0, 0.5, 0.0, 0.5]
+    assert trend["kda"].tolist() == [3.0, 1.0, 0.5, 3.0]
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from api.metrics import Histogram, Metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0, 3.0):
+        h.observe(value)
+    assert h.cumulative() == [(0.1, 2), (1.0, 3), (float("inf"), 5)]
+    assert (h.count, h.sum) == (5, pytest.approx(5.65))
+
+
+def test_histogram_quantile_interpolates_within_a_bucket():
+    h = Histogram(buckets=(1.0, 2.0, 4.0))
+    assert h.quantile(0.5) is None
+    for value in (0.5, 1.5, 1.5, 3.0):
+        h.observe(value)
+    assert h.quantile(0.25) == pytest.approx(1.0)   # 1 of 1 in [0, 1]
+    assert h.quantile(0.5) == pytest.approx(1.5)    # 1 of 2 in (1, 2]
+    assert h.quantile(1.0) == pytest.approx(4.0)
+    h.observe(100.0)
+    assert h.quantile(0.99) == 4.0  # +Inf bucket: the largest finite bound
+
+
+def test_timer_observes_the_block():
+    clock = FakeClock()
+    metrics = Metrics(clock=clock)
+    with metrics.timer("render_seconds", view="stats"):
+        clock.now += 0.02
+    histogram = metrics.to_dict()["histograms"]["render_seconds"][0]
+    assert histogram["labels"] == {"view": "stats"}
+    assert (histogram["count"], histogram["sum"]) == (1, pytest.approx(0.02))
+
+
+def test_prometheus_exposition():
+    metrics = Metrics(prefix="t_")
+    metrics.inc("http_responses_total", endpoint="match-v5", status="200")
+    metrics.inc("http_responses_total", 2, endpoint="match-v5", status="429")
+    metrics.observe("http_request_seconds", 0.003, endpoint="match-v5")
+    metrics.observe("http_request_seconds", 7.0, endpoint="match-v5")
+
+    lines = metrics.to_prometheus().splitlines()
+    assert lines[:3] == [
+        "# TYPE t_http_responses_total counter",
+        't_http_responses_total{endpoint="match-v5",status="200"} 1',
+        't_http_responses_total{endpoint="match-v5",status="429"} 2',
+    ]
+    assert "# TYPE t_http_request_seconds histogram" in lines
+    buckets = [line for line in lines if line.startswith("t_http_request_seconds_bucket")]
+    assert buckets[0] == 't_http_request_seconds_bucket{endpoint="match-v5",le="0.001"} 0'
+    assert 't_http_request_seconds_bucket{endpoint="match-v5",le="0.005"} 1' in buckets
+    assert 't_http_request_seconds_bucket{endpoint="match-v5",le="10.0"} 2' in buckets
+    assert buckets[-1] == 't_http_request_seconds_bucket{endpoint="match-v5",le="+Inf"} 2'
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)  # cumulative
+    assert 't_http_request_seconds_sum{endpoint="match-v5"} 7.003' in lines
+    assert 't_http_request_seconds_count{endpoint="match-v5"} 2' in lines
+
+
+def test_prometheus_label_values_are_escaped():
+    metrics = Metrics(prefix="")
+    metrics.inc("requests_total", endpoint='lcu "quoted"\\path\nline')
+    assert metrics.to_prometheus().splitlines()[1] == \
+        'requests_total{endpoint="lcu \\"quoted\\"\\\\path\\nline"} 1'
+
+
+def test_cache_hit_ratio():
+    metrics = Metrics(prefix="")
+    metrics.watch_cache("ranked", lambda: {"hits": 6, "stale": 2, "misses": 2})
+    metrics.watch_cache("empty", lambda: {"hits": 0, "misses": 0})
+    text = metrics.to_prometheus()
+    assert 'cache_lookups_total{cache="ranked",result="stale"} 2' in text
+    assert 'cache_hit_ratio{cache="ranked"} 0.8' in text
+    assert 'cache_hit_ratio{cache="empty"}' not in text
+    assert metrics.to_dict()["caches"]["empty"]["hit_ratio"] is None
+
+
+def test_failing_cache_stats_are_counted():
+    metrics = Metrics(prefix="")
+
+    def broken():
+        raise RuntimeError("closed")
+
+    metrics.watch_cache("pixmaps", broken)
+    assert 'cache_stats_errors_total{cache="pixmaps"} 1' in metrics.to_prometheus()
+    data = json.loads(metrics.to_json())
+    assert data["counters"]["cache_stats_errors_total"] == [{"labels": {"cache": "pixmaps"}, "value": 2}]
+    assert "pixmaps" not in data["caches"]
+
+
+def test_reset_keeps_watched_caches():
+    metrics = Metrics()
+    metrics.inc("a")
+    metrics.observe("b", 1.0)
+    metrics.watch_cache("c", lambda: {"hits": 1, "misses": 0})
+    metrics.reset()
+    assert metrics.to_dict() == {"counters": {}, "histograms": {},
+                                 "caches": {"c": {"hits": 1, "misses": 0, "hit_ratio": 1.0}}}
@@ -0,0 +1,91 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PySide6.QtGui import QPixmap
+from PySide6.QtWidgets import QApplication
+
+from ui.pixmap_cache import PixmapCache
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def png(size):
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.red)
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    pixmap.save(buffer, "PNG")
+    return bytes(data)
+
+
+class Assets:
+    """read_bytes() over in-memory PNGs, counting decodes."""
+
+    def __init__(self, size=10):
+        self.data = png(size)
+        self.reads = []
+
+    def __call__(self, asset):
+        self.reads.append(asset)
+        return self.data
+
+
+def cost(cache):
+    pixmap = cache.blank(10, 10)
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+def test_hit_skips_decoding(app):
+    assets = Assets()
+    cache = PixmapCache(read_bytes=assets)
+    first = cache.get("a.png")
+    assert cache.get("a.png").cacheKey() == first.cacheKey()
+    assert assets.reads == ["a.png"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    scaled = cache.scaled("a.png", 5, 5)
+    assert (scaled.width(), scaled.height()) == (5, 5)
+    cache.scaled("a.png", 5, 5)
+    assert assets.reads == ["a.png"]
+
+
+def test_least_recently_used_is_evicted_first(app):
+    assets = Assets()
+    size = cost(PixmapCache())
+    cache = PixmapCache(max_bytes=3 * size, read_bytes=assets)
+    for asset in ("a", "b", "c"):
+        cache.get(asset)
+    cache.get("a")  # now b is the oldest
+    cache.get("d")
+    assert cache.stats()["entries"] == 3 and cache.stats()["bytes"] == 3 * size
+
+    assets.reads.clear()
+    cache.get("a")
+    cache.get("c")
+    cache.get("d")
+    assert assets.reads == []
+    cache.get("b")
+    assert assets.reads == ["b"]  # evicted, decoded again
+
+
+def test_oversized_pixmaps_are_not_kept(app):
+    assets = Assets(size=100)
+    cache = PixmapCache(max_bytes=1000, read_bytes=assets)
+    cache.get("big")
+    cache.get("big")
+    assert assets.reads == ["big", "big"]
+    assert cache.stats()["entries"] == 0
+
+
+def test_clear(app):
+    cache = PixmapCache(read_bytes=Assets())
+    cache.get("a")
+    cache.clear()
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
@@ -0,0 +1,103 @@
+import pytest
+
+from api.ranked_history import RankedHistory, ladder_points
+
+
+def entry(tier="GOLD", rank="II", lp=50, wins=10, losses=10):
+    return {"tier": tier, "rank": rank, "leaguePoints": lp, "wins": wins, "losses": losses}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "ranked_history.db")
+
+
+@pytest.fixture
+def history(db_path):
+    history = RankedHistory(db_path, clock=lambda: 10_000)
+    yield history
+    history.close()
+
+
+def test_unchanged_snapshots_are_skipped_across_processes(db_path):
+    app = RankedHistory(db_path)
+    watcher = RankedHistory(db_path)  # e.g. watch.py on the same file
+    try:
+        assert app.record("p", {"solo": entry(lp=50)}, ts=100) == 1
+        assert watcher.record("p", {"solo": entry(lp=70, wins=11)}, ts=200) == 1
+        # The app's newest row is now the watcher's, not the one it wrote
+        assert app.record("p", {"solo": entry(lp=50)}, ts=300) == 1
+        assert app.record("p", {"solo": entry(lp=50)}, ts=400) == 0
+        assert [point["lp"] for point in watcher.series("p")] == [50, 70, 50]
+    finally:
+        app.close()
+        watcher.close()
+
+
+def test_ladder_points():
+    assert ladder_points("IRON", "IV", 0) == 0
+    assert ladder_points("IRON", "I", 99) == 399
+    assert ladder_points("gold", "II", 50) == 3 * 400 + 200 + 50
+    assert ladder_points("DIAMOND", "I", 100) == 2800
+    assert ladder_points("MASTER", "I", 0) == 2800
+    assert ladder_points("CHALLENGER", "I", 1200) == 4000
+    assert ladder_points("UNRANKED", "", 0) is None
+    assert ladder_points(None, None, 0) is None
+
+
+def test_record_many_skips_unchanged_snapshots(history):
+    written = history.record_many([
+        ("p", {"solo": entry(lp=50), "flex": entry(tier="SILVER")}, 100),
+        ("p", {"solo": entry(lp=50), "flex": entry(tier="SILVER")}, 200),  # same as the row above
+        ("p", {"solo": entry(lp=70, wins=11), "flex": None}, 300),
+        ("q", {"solo": None, "flex": None}, 300),                          # unranked: nothing stored
+    ])
+    assert written == 3
+    assert [point["ts"] for point in history.series("p", "solo")] == [100, 300]
+    assert [point["ts"] for point in history.series("p", "flex")] == [100]
+    assert history.series("q") == []
+    assert history.record("p", {"solo": entry(lp=70, wins=11)}, ts=400) == 0
+
+
+def test_record_defaults_to_now(history):
+    history.record("p", {"solo": entry()})
+    assert [point["ts"] for point in history.series("p")] == [10_000]
+
+
+def test_series_window_and_points(history):
+    for ts, lp, wins in ((100, 10, 1), (200, 30, 2), (300, 90, 3)):
+        history.record("p", {"solo": entry(tier="PLATINUM", rank="IV", lp=lp, wins=wins, losses=1)}, ts=ts)
+
+    points = history.series("p", since=150, until=300)
+    assert [point["ts"] for point in points] == [200, 300]
+    assert points[0] == {
+        "ts": 200, "tier": "PLATINUM", "rank": "IV", "lp": 30, "wins": 2, "losses": 1,
+        "ladder": 4 * 400 + 30, "winrate": 2 / 3,
+    }
+    assert history.series("p", "flex") == []
+
+
+def test_delta_across_a_promotion(history):
+    history.record("p", {"solo": entry(tier="GOLD", rank="I", lp=80, wins=10, losses=10)}, ts=100)
+    history.record("p", {"solo": entry(tier="GOLD", rank="I", lp=95, wins=11, losses=10)}, ts=200)
+    history.record("p", {"solo": entry(tier="PLATINUM", rank="IV", lp=10, wins=13, losses=11)}, ts=300)
+
+    delta = history.delta("p", since=150, until=300)
+    assert delta["from"]["ts"] == 100  # the state at `since` is the last snapshot before it
+    assert delta["to"]["ts"] == 300
+    assert (delta["lp"], delta["wins"], delta["losses"], delta["games"]) == (30, 3, 1, 4)
+    assert delta["winrate"] == 0.75
+
+
+def test_delta_starts_at_the_first_snapshot_after_since(history):
+    history.record("p", {"solo": entry(lp=20, wins=5)}, ts=500)
+    history.record("p", {"solo": entry(lp=40, wins=6)}, ts=600)
+    delta = history.delta("p", since=0)  # until defaults to now
+    assert (delta["from"]["ts"], delta["to"]["ts"], delta["lp"], delta["games"]) == (500, 600, 20, 1)
+
+
+def test_delta_without_games(history):
+    history.record("p", {"solo": entry()}, ts=100)
+    delta = history.delta("p")
+    assert (delta["lp"], delta["games"], delta["winrate"]) == (0, 0, None)
+    assert history.delta("nobody") is None
@@ -0,0 +1,75 @@
+from api.rate_limiter import RateLimiter, parse_limits
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(app_limits="20:1,100:120"):
+    clock = FakeClock()
+    return RateLimiter(app_limits, clock=clock, sleep=clock.sleep), clock
+
+
+def test_parse_limits():
+    assert parse_limits("20:1,100:120") == {1: 20, 120: 100}
+    assert parse_limits(" 500:10 , 30000:600") == {10: 500, 600: 30000}
+
+
+def test_parse_limits_skips_malformed_parts():
+    assert parse_limits("") == {}
+    assert parse_limits(None) == {}
+    assert parse_limits("20:1,oops,5:x,7") == {1: 20}
+
+
+def test_acquire_waits_for_the_window_to_reset():
+    limiter, clock = make_limiter("2:1")
+    assert limiter.acquire("euw1", "m") == 0
+    assert limiter.acquire("euw1", "m") == 0
+    assert limiter.acquire("euw1", "m") == 1.0
+    assert clock.slept == [1.0]
+
+
+def test_hosts_have_separate_budgets():
+    limiter, clock = make_limiter("1:1")
+    limiter.acquire("euw1", "m")
+    assert limiter.acquire("na1", "m") == 0
+    assert clock.slept == []
+
+
+def test_update_adopts_limits_and_counts_from_headers():
+    limiter, clock = make_limiter("100:1")
+    limiter.acquire("euw1", "m")
+    limiter.update("euw1", "m", 200, {
+        "X-App-Rate-Limit": "100:1",
+        "X-App-Rate-Limit-Count": "1:1",
+        "X-Method-Rate-Limit": "2:10",
+        "X-Method-Rate-Limit-Count": "2:10",
+    })
+    # The method budget is used up for the rest of its 10 s window
+    assert limiter.acquire("euw1", "m") == 10
+    assert limiter.acquire("euw1", "other") == 0
+
+
+def test_429_blocks_the_reported_scope_for_retry_after():
+    limiter, clock = make_limiter()
+    limiter.update("euw1", "m", 429, {"Retry-After": "3", "X-Rate-Limit-Type": "method"})
+    assert limiter.acquire("euw1", "other") == 0
+    assert limiter.acquire("euw1", "m") == 3
+
+    limiter.update("euw1", "m", 429, {"Retry-After": "5", "X-Rate-Limit-Type": "application"})
+    assert limiter.acquire("euw1", "other") == 5
+
+
+def test_429_with_bad_retry_after_waits_one_second():
+    limiter, clock = make_limiter()
+    limiter.update("euw1", "m", 429, {"Retry-After": "soon"})
+    assert limiter.acquire("euw1", "m") == 1.0
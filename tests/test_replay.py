@@ -0,0 +1,140 @@
+import json
+
+import pytest
+import requests
+
+from api.metrics import Metrics
+from api.replay import (
+    RecordingTransport, ReplayMiss, ReplayTransport, exchange_key, read_fixture, write_fixture
+)
+
+
+def response(status, body, headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.reason = "OK" if status == 200 else "Error"
+    resp._content = body
+    resp.headers.update(headers or {})
+    return resp
+
+
+class FakeTransport:
+    """Answers every URL from a list of responses (or exceptions), in order."""
+
+    def __init__(self, answers):
+        self.answers = {url: list(items) for url, items in answers.items()}
+        self.headers = []
+
+    def request(self, method, url, endpoint=None, **kwargs):
+        self.headers.append(kwargs.get("headers"))
+        answer = self.answers[url].pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+def record(path, answers, requests_made):
+    recorder = RecordingTransport(path, FakeTransport(answers))
+    for method, url, kwargs in requests_made:
+        try:
+            recorder.request(method, url, **kwargs)
+        except requests.RequestException:
+            pass
+    recorder.close()
+    return recorder
+
+
+def test_secret_headers_are_redacted(tmp_path):
+    path = str(tmp_path / "session.json")
+    url = "https://euw1.api.riotgames.com/lol/status"
+    headers = {"X-Riot-Token": "RGAPI-secret", "Authorization": "Basic abc", "Cookie": "id=1",
+               "User-Agent": "league-summoner-tracker"}
+    recorder = record(path, {url: [response(200, b"{}")]}, [("GET", url, {"headers": headers})])
+
+    assert recorder.transport.headers == [headers]  # the real request still had them
+    (exchange,) = read_fixture(path)
+    assert exchange["request_headers"] == {
+        "X-Riot-Token": "<redacted>", "Authorization": "<redacted>", "Cookie": "<redacted>",
+        "User-Agent": "league-summoner-tracker",
+    }
+    assert "RGAPI-secret" not in (tmp_path / "session.json").read_text()
+
+
+def test_text_and_binary_bodies_round_trip(tmp_path):
+    path = str(tmp_path / "session.json.gz")
+    text_url = "https://ddragon.leagueoflegends.com/api/versions.json"
+    icon_url = "https://ddragon.leagueoflegends.com/cdn/15.21.1/img/champion/Ahri.png"
+    icon = b"\x89PNG\r\n\x1a\n\x00\xff"
+    record(path, {
+        text_url: [response(200, '["15.21.1"]'.encode(), {"Content-Type": "application/json; charset=utf-8",
+                                                          "ETag": '"v1"'})],
+        icon_url: [response(200, icon, {"Content-Type": "image/png"})],
+    }, [("GET", text_url, {}), ("GET", icon_url, {})])
+
+    assert [e["body_encoding"] for e in read_fixture(path)] == ["text", "base64"]
+    replay = ReplayTransport(path, metrics=Metrics())
+    versions = replay.get(text_url)
+    assert versions.json() == ["15.21.1"]
+    assert versions.headers["etag"] == '"v1"'  # case-insensitive, like requests
+    assert versions.text == '["15.21.1"]'
+    streamed = replay.get(icon_url, stream=True)
+    assert b"".join(streamed.iter_content(3)) == icon
+
+
+def test_loopback_urls_match_on_path(tmp_path):
+    path = str(tmp_path / "session.json")
+    recorded = "https://127.0.0.1:53000/lol-champ-select/v1/session"
+    record(path, {recorded: [response(200, b'{"timer": 1}')]}, [("GET", recorded, {})])
+
+    replay = ReplayTransport(path, metrics=Metrics())
+    # The client picks a new port every start
+    assert replay.get("https://127.0.0.1:61000/lol-champ-select/v1/session").json() == {"timer": 1}
+    assert exchange_key("get", "https://localhost:1/a?b=1") == "GET loopback/a?b=1"
+    with pytest.raises(ReplayMiss):
+        replay.get("https://127.0.0.1:61000/lol-gameflow/v1/session")
+    with pytest.raises(ReplayMiss):  # other hosts match on host too
+        replay.get("https://na1.api.riotgames.com/lol-champ-select/v1/session")
+
+
+def test_nth_request_gets_the_nth_response(tmp_path):
+    path = str(tmp_path / "session.json")
+    url = "https://127.0.0.1:1/lol-champ-select/v1/session"
+    record(path, {url: [response(200, b'{"n": 1}'), response(404, b'{"n": 2}'), response(200, b'{"n": 3}')]},
+           [("GET", url, {})] * 3)
+
+    replay = ReplayTransport(path, metrics=Metrics())
+    answers = [replay.get(url) for _ in range(5)]
+    assert [(r.status_code, r.json()["n"]) for r in answers] == [(200, 1), (404, 2), (200, 3), (200, 3), (200, 3)]
+    replay.rewind()
+    assert replay.get(url).json() == {"n": 1}
+
+
+def test_errors_are_replayed(tmp_path):
+    path = str(tmp_path / "session.json")
+    url = "https://europe.api.riotgames.com/riot/account/v1/accounts/by-riot-id/a/b"
+    record(path, {url: [requests.ConnectTimeout("timed out")]}, [("GET", url, {})])
+
+    metrics = Metrics()
+    replay = ReplayTransport(path, metrics=metrics)
+    with pytest.raises(requests.ConnectTimeout):
+        replay.get(url, endpoint="account-v1")
+    counters = metrics.to_dict()["counters"]["http_responses_total"]
+    assert counters == [{"labels": {"endpoint": "account-v1", "status": "error"}, "value": 1}]
+
+
+def test_latency_scales_the_recorded_time(tmp_path):
+    path = str(tmp_path / "session.json")
+    url = "https://euw1.api.riotgames.com/a"
+    write_fixture(path, [{"method": "GET", "url": url, "status": 200, "reason": "OK", "headers": {},
+                          "body": "{}", "body_encoding": "text", "elapsed": 0.4}])
+    slept = []
+    replay = ReplayTransport(path, latency=0.5, metrics=Metrics(), sleep=slept.append)
+    replay.get(url)
+    assert slept == [0.2]
+
+
+def test_unknown_fixture_version_is_rejected(tmp_path):
+    path = tmp_path / "session.json"
+    path.write_text(json.dumps({"version": 99, "exchanges": []}))
+    with pytest.raises(ValueError):
+        read_fixture(str(path))
@@ -0,0 +1,99 @@
+import pytest
+
+from api.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "riot_cache.db"), ranked_ttl=300, stale_ttl=3600, clock=clock)
+    yield cache
+    cache.close()
+
+
+RANKED = {"solo": {"tier": "GOLD", "rank": "II", "leaguePoints": 50}, "flex": None}
+
+
+def test_ranked_is_fresh_then_stale_then_expired(cache, clock):
+    assert cache.get_ranked("euw1:p") == (None, "miss")
+    cache.put_ranked("euw1:p", RANKED)
+
+    clock.now += 299
+    assert cache.get_ranked("euw1:p") == (RANKED, "fresh")
+    clock.now += 1
+    assert cache.get_ranked("euw1:p") == (RANKED, "stale")
+    clock.now += 3599
+    assert cache.get_ranked("euw1:p") == (RANKED, "stale")
+    clock.now += 1
+    assert cache.get_ranked("euw1:p") == (None, "miss")
+
+
+def test_put_ranked_restarts_the_ttl(cache, clock):
+    cache.put_ranked("euw1:p", RANKED)
+    clock.now += 1000
+    cache.put_ranked("euw1:p", dict(RANKED, flex=None, solo=None))
+    assert cache.get_ranked("euw1:p") == ({"solo": None, "flex": None}, "fresh")
+
+
+def test_puuids_are_kept_forever(cache, clock):
+    assert cache.get_puuid("Faker", "KR1") is None
+    cache.put_puuid("Faker", "KR1", "puuid-1")
+    clock.now += 10 * 365 * 24 * 3600
+    assert cache.get_puuid("Faker", "KR1") == "puuid-1"
+    assert cache.get_puuid("faker", "kr1") == "puuid-1"  # Riot IDs are case-insensitive
+
+
+def test_stats_count_every_lookup(cache, clock):
+    cache.get_puuid("a", "b")
+    cache.put_puuid("a", "b", "p")
+    cache.get_puuid("a", "b")
+    cache.get_puuid("A", "B")
+
+    cache.get_ranked("k")
+    cache.put_ranked("k", RANKED)
+    cache.get_ranked("k")
+    clock.now += 301
+    cache.get_ranked("k")
+    clock.now += 3600
+    cache.get_ranked("k")
+
+    assert cache.stats() == {
+        "puuid": {"hits": 2, "misses": 1},
+        "ranked": {"hits": 1, "stale": 1, "misses": 2},
+    }
+
+
+def test_entries_survive_reopening(tmp_path, clock):
+    path = str(tmp_path / "riot_cache.db")
+    cache = ResponseCache(path, clock=clock)
+    cache.put_puuid("a", "b", "p")
+    cache.put_ranked("k", RANKED)
+    cache.close()
+
+    cache = ResponseCache(path, clock=clock)
+    try:
+        assert cache.get_puuid("a", "b") == "p"
+        assert cache.get_ranked("k") == (RANKED, "fresh")
+        assert cache.stats()["puuid"] == {"hits": 1, "misses": 0}  # counters are per session
+    finally:
+        cache.close()
+
+
+def test_clear(cache):
+    cache.put_puuid("a", "b", "p")
+    cache.put_ranked("k", RANKED)
+    cache.clear()
+    assert cache.get_puuid("a", "b") is None
+    assert cache.get_ranked("k") == (None, "miss")
@@ -0,0 +1,92 @@
+from api.metrics import Metrics
+from api.rate_limiter import RateLimiter
+from api.riot_api import RiotAPI
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {"Retry-After": "0"} if status_code == 429 else {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeTransport:
+    def __init__(self, statuses):
+        self.responses = [FakeResponse(status) for status in statuses]
+        self.served = []
+
+    def get(self, url, **kwargs):
+        resp = self.responses[len(self.served)]
+        self.served.append(resp)
+        return resp
+
+
+def make_api(transport, max_retries=2):
+    limiter = RateLimiter("100000:1", clock=lambda: 0.0, sleep=lambda seconds: None)
+    return RiotAPI(limiter=limiter, max_retries=max_retries, transport=transport, metrics=Metrics())
+
+
+def test_429s_are_retried_and_closed():
+    transport = FakeTransport([429, 429, 200])
+    resp = make_api(transport)._get("europe", "/path", "method")
+    assert resp is transport.served[-1] and resp.status_code == 200
+    assert [r.closed for r in transport.served] == [True, True, False]
+
+
+def test_the_last_429_is_left_open_for_the_caller():
+    transport = FakeTransport([429, 429, 429])
+    resp = make_api(transport)._get("europe", "/path", "method", stream=True)
+    assert resp.status_code == 429 and not resp.closed
+    assert [r.closed for r in transport.served] == [True, True, False]
+
+
+class CacheStub:
+    def __init__(self, ranked, state):
+        self.ranked, self.state = ranked, state
+        self.stored = None
+
+    def stats(self):
+        return {"puuid": {}, "ranked": {}}
+
+    def get_ranked(self, key):
+        return self.ranked, self.state
+
+    def put_ranked(self, key, ranked):
+        self.stored = ranked
+
+
+class RankedResponse(FakeResponse):
+    def json(self):
+        return [dict(queueType="RANKED_SOLO_5x5", tier="GOLD")]
+
+
+def test_only_ranked_data_fetched_from_riot_is_reported():
+    fetched = []
+    transport = FakeTransport([])
+    transport.responses = [RankedResponse(200)]
+    api = make_api(transport)
+    api.on_ranked_fetched = lambda puuid, platform, ranked: fetched.append((puuid, platform, ranked))
+
+    api.cache = CacheStub({"solo": "cached"}, "fresh")
+    assert api.get_ranked_data("p", platform="euw1") == (200, {"solo": "cached"})
+    assert fetched == []
+
+    api.cache = CacheStub(None, "miss")
+    status, ranked = api.get_ranked_data("p", platform="euw1")
+    assert fetched == [("p", "euw1", ranked)] and ranked["solo"]["tier"] == "GOLD"
+
+
+def test_background_refresh_of_a_stale_entry_is_reported():
+    fetched = []
+    transport = FakeTransport([])
+    transport.responses = [RankedResponse(200)]
+    api = make_api(transport)
+    api.on_ranked_fetched = lambda puuid, platform, ranked: fetched.append(ranked)
+    api.cache = CacheStub({"solo": "cached"}, "stale")
+
+    assert api.get_ranked_data("p", platform="euw1") == (200, {"solo": "cached"})
+    api._revalidate_pool.shutdown(wait=True)
+    assert len(fetched) == 1 and fetched[0] == api.cache.stored
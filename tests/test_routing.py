@@ -0,0 +1,67 @@
+import pytest
+
+from api.routing import (
+    PLATFORM_REGIONS, TAG_PLATFORMS, CLIENT_REGION_PLATFORMS, ACCOUNT_REGIONS,
+    normalize_platform, match_host, account_host, platform_for_tag,
+    platform_for_match, platform_for_region
+)
+
+
+def test_normalize_platform():
+    assert normalize_platform("EUW1") == "euw1"
+    assert normalize_platform("kr") == "kr"
+
+
+@pytest.mark.parametrize("platform", ["", None, "euw", "na", "pbe1"])
+def test_unknown_platforms_are_rejected(platform):
+    with pytest.raises(ValueError):
+        normalize_platform(platform)
+
+
+def test_match_host():
+    assert match_host("euw1") == "europe"
+    assert match_host("NA1") == "americas"
+    assert match_host("kr") == "asia"
+    assert match_host("oc1") == "sea"
+
+
+def test_account_host_has_no_sea_cluster():
+    assert account_host("euw1") == "europe"
+    assert account_host("oc1") == "asia"
+    assert account_host("vn2") == "asia"
+
+
+def test_every_platform_has_an_account_host():
+    for platform in PLATFORM_REGIONS:
+        assert account_host(platform) in ACCOUNT_REGIONS.values()
+
+
+def test_platform_for_tag():
+    assert platform_for_tag("EUW") == "euw1"
+    assert platform_for_tag("na1") == "na1"
+    assert platform_for_tag("LAS") == "la2"
+    assert platform_for_tag("1234") is None
+    assert platform_for_tag("1234", "kr") == "kr"
+    assert platform_for_tag(None, "kr") == "kr"
+
+
+def test_platform_for_match():
+    assert platform_for_match("EUW1_7123456789") == "euw1"
+    assert platform_for_match("KR_123") == "kr"
+    assert platform_for_match("PBE1_123", "na1") == "na1"
+    assert platform_for_match("7123456789", "na1") == "na1"
+
+
+def test_platform_for_region():
+    assert platform_for_region("EUW") == "euw1"
+    assert platform_for_region("na") == "na1"
+    assert platform_for_region("OC1") == "oc1"
+    assert platform_for_region("euw1") == "euw1"
+    assert platform_for_region("PBE") is None
+    assert platform_for_region(None, "euw1") == "euw1"
+
+
+def test_tables_only_name_known_platforms():
+    for table in (TAG_PLATFORMS, CLIENT_REGION_PLATFORMS):
+        for platform in table.values():
+            assert platform in PLATFORM_REGIONS
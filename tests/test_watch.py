@@ -0,0 +1,119 @@
+import json
+
+import pytest
+
+from api.ranked_history import RankedHistory
+from watch import WATCHLIST_RETRY, Watcher, read_watchlist
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeAPI:
+    """lookup_many() answering from a dict of "Name#TAG" -> (status, data)."""
+
+    cache = None
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.looked_up = []
+
+    def lookup_many(self, riot_ids, max_workers=None, fresh=False):
+        for name, tag in riot_ids:
+            self.looked_up.append(f"{name}#{tag}")
+            yield (name, tag), *self.answers[f"{name}#{tag}"]
+
+
+def ranked(puuid, lp=50):
+    entry = {"tier": "GOLD", "rank": "II", "leaguePoints": lp, "wins": 1, "losses": 1}
+    return {"puuid": puuid, "platform": "euw1", "solo": entry, "flex": None}
+
+
+ANSWERS = {
+    "Alpha#EUW": (200, ranked("pa")),
+    "Beta#EUW": (200, ranked("pb")),
+    "Gone#EUW": (404, {"status": {"message": "Data not found"}}),
+}
+
+
+@pytest.fixture
+def env(tmp_path):
+    watchlist = tmp_path / "watchlist.txt"
+    watchlist.write_text("# club\nAlpha#EUW\n\nBeta#EUW\nGone#EUW\nno tag\nAlpha#EUW\n")
+    clock = FakeClock()
+    history = RankedHistory(str(tmp_path / "history.db"))
+    yield tmp_path, watchlist, clock, history
+    history.close()
+
+
+def make(env, api=None, **kwargs):
+    tmp_path, watchlist, clock, history = env
+    return Watcher(str(watchlist), interval=600, output_path=str(tmp_path / "out.jsonl"),
+                   state_path=str(tmp_path / "state.json"), api=api or FakeAPI(ANSWERS),
+                   history=history, clock=clock, **kwargs)
+
+
+def test_read_watchlist(env):
+    _, watchlist, _, _ = env
+    assert read_watchlist(str(watchlist)) == [("Alpha", "EUW"), ("Beta", "EUW"), ("Gone", "EUW")]
+
+
+def test_due(env):
+    watcher = make(env)
+    now = env[2].now
+    watcher.state = {"Alpha#EUW": now - 599, "Beta#EUW": now - 600}
+    watcher.attempted = {"Gone#EUW": now - 10}  # failed lookups wait an interval too
+    riot_ids = [("Alpha", "EUW"), ("Beta", "EUW"), ("Gone", "EUW"), ("New", "EUW")]
+    assert watcher.due(riot_ids, now) == [("Beta", "EUW"), ("New", "EUW")]
+
+
+def test_cycle_writes_jsonl_state_and_history(env):
+    tmp_path, _, clock, history = env
+    watcher = make(env)
+    assert watcher.run_cycle() == (2, 1)
+
+    records = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+    assert [(r["riot_id"], r["status"]) for r in records] == [
+        ("Alpha#EUW", 200), ("Beta#EUW", 200), ("Gone#EUW", 404)]
+    assert records[0] == {"ts": int(clock.now), "riot_id": "Alpha#EUW", "status": 200, "puuid": "pa",
+                          "platform": "euw1", "solo": ranked("pa")["solo"], "flex": None}
+    assert records[2]["error"] == ANSWERS["Gone#EUW"][1]
+
+    state = json.loads((tmp_path / "state.json").read_text())
+    assert state == {"Alpha#EUW": int(clock.now), "Beta#EUW": int(clock.now)}
+    assert len(history.series("pa")) == 1
+
+    # Nothing is due again until an interval has passed
+    assert watcher.run_cycle() == (0, 0)
+    assert watcher.next_wakeup() == int(clock.now) + 600
+
+
+def test_restart_resumes_from_the_state_file(env):
+    _, _, clock, _ = env
+    make(env).run_cycle()
+
+    clock.now += 300
+    api = FakeAPI(ANSWERS)
+    restarted = make(env, api=api)
+    assert restarted.run_cycle() == (0, 1)
+    assert api.looked_up == ["Gone#EUW"]  # the failed one isn't in the state file
+
+    clock.now += 300
+    assert restarted.run_cycle() == (2, 0)
+    assert api.looked_up == ["Gone#EUW", "Alpha#EUW", "Beta#EUW"]
+
+
+def test_missing_watchlist_skips_the_cycle(env):
+    _, watchlist, clock, _ = env
+    watcher = make(env)
+    watchlist.unlink()
+    assert watcher.run_cycle() == (0, 0)
+    assert watcher.next_wakeup() == clock.now + WATCHLIST_RETRY
+
+    watchlist.write_text("Alpha#EUW\n")
+    assert watcher.run_cycle() == (1, 0)
@@ -0,0 +1,74 @@
+# ui/debug_panel.py
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QFontDatabase, QGuiApplication
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QComboBox, QPlainTextEdit
+)
+
+
+class DebugPanel(QWidget):
+    """
+    Live view of a Metrics registry (request latencies, status codes, cache
+    hit ratios, rate-limit waits, render times) as JSON or Prometheus text.
+    Refreshes every `interval_ms` while shown.
+    """
+
+    def __init__(self, metrics, interval_ms=1000, parent=None):
+        super().__init__(parent)
+        self.setWindowFlag(Qt.Window)  # its own window, closed along with the parent
+        self.metrics = metrics
+        self.setWindowTitle("League Summoner Tracker - Metrics")
+        self.resize(640, 520)
+
+        self.format_input = QComboBox()
+        self.format_input.addItem("JSON", "json")
+        self.format_input.addItem("Prometheus", "prometheus")
+        self.format_input.currentIndexChanged.connect(self.refresh)
+        self.copy_btn = QPushButton("Copy")
+        self.copy_btn.clicked.connect(self.copy)
+        self.reset_btn = QPushButton("Reset")
+        self.reset_btn.clicked.connect(self.reset)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.format_input)
+        controls.addStretch()
+        controls.addWidget(self.copy_btn)
+        controls.addWidget(self.reset_btn)
+        layout = QVBoxLayout(self)
+        layout.addLayout(controls)
+        layout.addWidget(self.text)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.refresh)
+
+    def export(self):
+        if self.format_input.currentData() == "prometheus":
+            return self.metrics.to_prometheus()
+        return self.metrics.to_json(indent=2)
+
+    def refresh(self):
+        scroll = self.text.verticalScrollBar().value()
+        self.text.setPlainText(self.export())
+        self.text.verticalScrollBar().setValue(scroll)
+
+    def copy(self):
+        QGuiApplication.clipboard().setText(self.export())
+
+    def reset(self):
+        self.metrics.reset()
+        self.refresh()
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
@@ -0,0 +1,61 @@
+# ui/lp_chart.py
+from datetime import datetime
+
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QPainter, QPen, QColor, QPolygonF
+from PySide6.QtWidgets import QWidget
+
+
+class LPChart(QWidget):
+    """
+    Minimal line chart of ladder LP over time (see
+    api.ranked_history.ladder_points), or of any other value over time.
+    `empty_text` is shown while there are fewer than two points.
+    """
+
+    def __init__(self, parent=None, empty_text="Not enough history yet"):
+        super().__init__(parent)
+        self.points = []  # (ts, ladder)
+        self.empty_text = empty_text
+        self.setMinimumHeight(150)
+
+    def set_points(self, points):
+        self.points = [(ts, ladder) for ts, ladder in points if ladder is not None]
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self.rect().adjusted(40, 10, -10, -25)
+
+        if len(self.points) < 2 or rect.width() <= 0 or rect.height() <= 0:
+            painter.drawText(self.rect(), Qt.AlignCenter, self.empty_text)
+            return
+
+        t0 = self.points[0][0]
+        t1 = self.points[-1][0]
+        low = min(ladder for _, ladder in self.points)
+        high = max(ladder for _, ladder in self.points)
+        t_span = max(t1 - t0, 1)
+        lp_span = max(high - low, 1)
+
+        def to_pixel(ts, ladder):
+            x = rect.left() + (ts - t0) / t_span * rect.width()
+            y = rect.bottom() - (ladder - low) / lp_span * rect.height()
+            return QPointF(x, y)
+
+        # Axes
+        painter.setPen(QPen(QColor("gray"), 1))
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+        painter.drawLine(rect.bottomLeft(), rect.topLeft())
+        painter.drawText(2, rect.top() + 10, str(high))
+        painter.drawText(2, rect.bottom(), str(low))
+        painter.drawText(rect.left(), self.height() - 5,
+                         datetime.fromtimestamp(t0).strftime("%Y-%m-%d"))
+        end_label = datetime.fromtimestamp(t1).strftime("%Y-%m-%d")
+        painter.drawText(rect.right() - painter.fontMetrics().horizontalAdvance(end_label),
+                         self.height() - 5, end_label)
+
+        # LP line
+        painter.setPen(QPen(QColor("#0000ff"), 2))
+        painter.drawPolyline(QPolygonF([to_pixel(ts, ladder) for ts, ladder in self.points]))
@@ -1,27 +1,84 @@
 # ui/main_window.py
+import time
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
     QPushButton, QLabel, QFormLayout, QSizePolicy,
-    QStackedLayout
+    QStackedLayout, QTableWidget, QTableWidgetItem, QHeaderView, QComboBox
 )
-from PySide6.QtCore import Qt, QEvent, QTimer, QRect, QSize
-from PySide6.QtGui import QPixmap, QFont
+from PySide6.QtCore import Qt, QEvent, QTimer, QRect, QSize, Signal
+from PySide6.QtGui import QPixmap, QFont, QKeySequence, QShortcut
 from api.riot_api import RiotAPI
+from api.response_cache import ResponseCache
+from api.ranked_history import RankedHistory
+from api.match_store import MatchStore
+from api.match_ingest import MatchIngester
+from api.match_stats import PlayerStats
+from api.routing import PLATFORM_REGIONS, platform_for_tag
+from api.metrics import get_shared_metrics
 from utils.assets import get_emblem_path
 from api.league_client import LeagueClient
 from api.champion_data import ChampionData
+from api.champ_select import ChampSelectSnapshot, EMPTY_SNAPSHOT
+from ui.workers import TaskRunner
+from ui.pixmap_cache import PixmapCache
+from ui.lp_chart import LPChart
+from ui.debug_panel import DebugPanel
+
+
+# Pick/ban box styles by (side, has champion)
+BOX_STYLES = {
+    ("blue", False): "border:2px solid gray; background-color: #ddeeff;",
+    ("blue", True): "border:2px solid #0000ff; background-color: #ddeeff;",
+    ("red", False): "border:2px solid gray; background-color: #ffdddd;",
+    ("red", True): "border:2px solid #ff0000; background-color: #ffdddd;",
+}
+
+# Seconds the champ select scouting fan-out may take; slower lookups are dropped
+SCOUT_DEADLINE = 2.0
+
+# Seconds before an icon that failed to download is tried again
+ICON_RETRY_DELAY = 5.0
 
 
 
 class MainWindow(QWidget):
-    def __init__(self):
+    # Emitted from the LCU event thread, delivered on the GUI thread
+    champ_session_pushed = Signal(object)
+    champ_stream_state = Signal(bool)
+    # Emitted from the patch refresh worker while icons download
+    patch_progress = Signal(int, int)
+
+    def __init__(self, transport=None):
         super().__init__()
 
-        # API
-        self.api = RiotAPI()
+        # API (transport: e.g. a RecordingTransport or ReplayTransport, see api.replay)
+        self.metrics = get_shared_metrics()  # HTTP, cache and render timings
+        # Every ranked result fetched from Riot is kept for LP history; cached
+        # ones were recorded when they were fetched
+        self.history = RankedHistory()
+        self.api = RiotAPI(
+            cache=ResponseCache(),
+            transport=transport,
+            on_ranked_fetched=lambda puuid, platform, ranked: self.history.record(puuid, ranked)
+        )
+        self.matches = MatchStore()
+        self.match_ingester = MatchIngester(self.api, self.matches)
+        self.synced_puuids = set()  # match history already synced this session
+        self.current_puuid = None
+        self.current_platform = None  # server the current puuid was looked up on
+        self.search_started = None
+        self.tasks = TaskRunner(self)  # network I/O runs off the GUI thread
         self.rank_data = None
         self.flex_visible = False
-        self.champ_data = ChampionData()  # builds id->name mapping, caches patch
+        # Cached patch data only; the Data Dragon check runs in the background
+        self.champ_data = ChampionData(refresh=False, transport=transport)
+        self.patch_progress.connect(self.on_patch_progress)
+        self.tasks.submit(
+            "patch",
+            lambda: self.champ_data.refresh(progress=self.patch_progress.emit),
+            self.on_patch_refreshed
+        )
+        self.league_client = LeagueClient(transport=transport)  # long-lived: caches LCU port/token
 
         # Window settings
         self.setWindowTitle("League Summoner Tracker")
@@ -53,6 +110,12 @@ class MainWindow(QWidget):
         form_layout = QFormLayout()
         form_layout.addRow("Name:", self.name_input)
         form_layout.addRow("Tag Line #:", self.tag_input)
+        # Server: taken from the tag line ("EUW", "NA1", ...) unless chosen here
+        self.platform_input = QComboBox()
+        self.platform_input.addItem("Auto (from tag)", None)
+        for platform in PLATFORM_REGIONS:
+            self.platform_input.addItem(platform.upper(), platform)
+        form_layout.addRow("Server:", self.platform_input)
         main_layout.addLayout(form_layout)
 
         # Horizontal content
@@ -69,6 +132,14 @@ class MainWindow(QWidget):
         self.champ_btn = QPushButton("Show Champ-Select")
         self.champ_btn.setFixedHeight(40)
         self.champ_btn.clicked.connect(self.on_show_champ)
+        self.history_btn = QPushButton("Show LP History")
+        self.history_btn.setFixedHeight(40)
+        self.history_btn.clicked.connect(self.on_show_history)
+        self.history_btn.hide()
+        self.stats_btn = QPushButton("Show Match Stats")
+        self.stats_btn.setFixedHeight(40)
+        self.stats_btn.clicked.connect(self.on_show_stats)
+        self.stats_btn.hide()
         self.summoner_label = QLabel("")
         self.summoner_label.setAlignment(Qt.AlignCenter)
         self.summoner_label.setWordWrap(True)
@@ -76,6 +147,8 @@ class MainWindow(QWidget):
         self.left_column.addWidget(self.search_btn)
         self.left_column.addWidget(self.toggle_btn)
         self.left_column.addWidget(self.champ_btn)
+        self.left_column.addWidget(self.history_btn)
+        self.left_column.addWidget(self.stats_btn)
         self.left_column.addStretch()
         self.left_column.addWidget(self.summoner_label)
         content_layout.addLayout(self.left_column, 1)
@@ -123,14 +196,25 @@ class MainWindow(QWidget):
         content_layout.addLayout(self.rank_layout, 4)
         main_layout.addLayout(content_layout)
 
+        # Shared decoded/scaled icon cache (emblems + champ select)
+        self.pixmaps = PixmapCache(read_bytes=self.champ_data.read_icon)
+        self.metrics.watch_cache("pixmaps", self.pixmaps.stats)
+
+        # Coalesced layout pass state: what the last pass rendered
+        self.layout_pending = False
+        self.box_sizes = None     # pick/ban/spell sizes + spacing
+        self.emblem_sizes = {}    # key = emblem QLabel, value = (path, w, h)
+        self.font_size = None
+
         # Font scaling
         self.base_font = QFont()
         self.base_font.setPointSize(12)
         for widget in [self.solo_text, self.flex_text, self.solo_label_title, self.flex_label_title, self.summoner_label]:
             widget.setFont(self.base_font)
 
-        self.solo_original_pixmap = None
-        self.flex_original_pixmap = None
+        # Emblem icon paths; scaled pixmaps come from self.pixmaps
+        self.solo_emblem_path = None
+        self.flex_emblem_path = None
 
         self.stack.addWidget(self.main_screen)
 
@@ -198,6 +282,7 @@ class MainWindow(QWidget):
         self.my_team_champ_labels = []
         self.my_team_spell1_labels = []
         self.my_team_spell2_labels = []
+        self.my_team_rank_labels = []
 
         self.blue_team_layout = QVBoxLayout()
 
@@ -232,8 +317,14 @@ class MainWindow(QWidget):
             spell_col.addWidget(spell1)
             spell_col.addWidget(spell2)
 
+            # Scouted rank / recent form
+            rank_lbl = QLabel("")
+            rank_lbl.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+            self.my_team_rank_labels.append(rank_lbl)
+
             row.addWidget(champ_lbl)
             row.addLayout(spell_col)   # spells on the RIGHT side of pick
+            row.addWidget(rank_lbl)
             
             self.blue_team_layout.addLayout(row)
 
@@ -246,6 +337,7 @@ class MainWindow(QWidget):
         self.enemy_team_champ_labels = []
         self.enemy_team_spell1_labels = []
         self.enemy_team_spell2_labels = []
+        self.enemy_team_rank_labels = []
 
         self.red_team_layout = QVBoxLayout()
 
@@ -280,6 +372,11 @@ class MainWindow(QWidget):
             champ_lbl.setStyleSheet("border:2px solid gray; background-color: #ffdddd;")
             self.enemy_team_champ_labels.append(champ_lbl)
 
+            rank_lbl = QLabel("")
+            rank_lbl.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            self.enemy_team_rank_labels.append(rank_lbl)
+
+            row.addWidget(rank_lbl)
             row.addLayout(spell_col)
             row.addWidget(champ_lbl)
 
@@ -288,9 +385,8 @@ class MainWindow(QWidget):
 
         self.picks_layout.addLayout(self.red_team_layout)
 
-        # Store original QPixmaps for champion picks and bans
-        self.pick_original_pixmaps = {}  # key = QLabel, value = QPixmap
-        self.ban_original_pixmaps = {}   # key = QLabel, value = QPixmap
+        # Icon shown by each pick/ban/spell label; pixmaps come from the cache
+        self.label_icon_paths = {}  # key = QLabel, value = icon path
 
         # Add spacing between picks
         self.blue_team_layout.setSpacing(5)
@@ -301,14 +397,86 @@ class MainWindow(QWidget):
         self.champ_layout.addWidget(self.picks_container, alignment=Qt.AlignTop)
         self.picks_container.hide()
 
-        # Timer for champ select updates
+        # What the champ select labels show; slots whose icon couldn't be
+        # drawn are UNRENDERED, so the next snapshot redraws them
+        self.champ_snapshot = EMPTY_SNAPSHOT
+        self.champ_select_active = None  # None until the first render after showing the screen
+        self.champ_select_latest = None  # last snapshot received, redrawn once missing icons arrive
+        self.icon_fetching = set()       # ("champ" | "spell", id) being downloaded
+        self.icon_retry_at = {}          # same keys -> monotonic time a failed download may retry
+
+        # Champ select updates: pushed by the LCU WebSocket, polled as a fallback
+        self.champ_stream = None
+        self.champ_session_pushed.connect(self.on_champ_session_pushed)
+        self.champ_stream_state.connect(self.on_champ_stream_state)
+
         self.champ_timer = QTimer(self)
         self.champ_timer.setInterval(1000)
         self.champ_timer.timeout.connect(self.update_champ_select)
 
+        # Rank + recent form of the players in champ select, filled in as lookups finish
+        self.scout_results = {}  # puuid -> text
+        self.scouting = set()    # puuids with a lookup in flight
+
         # ADD TO STACKED LAYOUT (fixes the screen not showing)
         self.stack.addWidget(self.champ_screen)
 
+        # --------------------------------------------------
+        # LP HISTORY SCREEN
+        # --------------------------------------------------
+        self.history_screen = QWidget()
+        history_layout = QVBoxLayout(self.history_screen)
+
+        self.history_back_btn = QPushButton("← Back")
+        self.history_back_btn.clicked.connect(self.close_history)
+        self.history_title = QLabel("")
+        self.history_title.setAlignment(Qt.AlignCenter)
+        self.history_chart = LPChart()
+        self.history_summary = QLabel("")
+        self.history_summary.setAlignment(Qt.AlignCenter)
+        self.history_summary.setWordWrap(True)
+
+        history_layout.addWidget(self.history_back_btn)
+        history_layout.addWidget(self.history_title)
+        history_layout.addWidget(self.history_chart, 1)
+        history_layout.addWidget(self.history_summary)
+
+        self.stack.addWidget(self.history_screen)
+
+        # --------------------------------------------------
+        # MATCH STATS SCREEN
+        # --------------------------------------------------
+        self.stats_screen = QWidget()
+        stats_layout = QVBoxLayout(self.stats_screen)
+
+        self.stats_back_btn = QPushButton("← Back")
+        self.stats_back_btn.clicked.connect(self.close_stats)
+        self.stats_title = QLabel("")
+        self.stats_title.setAlignment(Qt.AlignCenter)
+        self.stats_summary = QLabel("")
+        self.stats_summary.setAlignment(Qt.AlignCenter)
+        self.stats_summary.setWordWrap(True)
+        self.stats_table = QTableWidget(0, 6)
+        self.stats_table.setHorizontalHeaderLabels(
+            ["Champion", "Games", "Win %", "KDA", "CS/min", "Dmg %"]
+        )
+        self.stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.stats_table.verticalHeader().hide()
+        self.stats_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.stats_chart = LPChart(empty_text="Not enough games yet")  # rolling win rate, in percent
+
+        stats_layout.addWidget(self.stats_back_btn)
+        stats_layout.addWidget(self.stats_title)
+        stats_layout.addWidget(self.stats_summary)
+        stats_layout.addWidget(self.stats_table, 2)
+        stats_layout.addWidget(self.stats_chart, 1)
+
+        self.stack.addWidget(self.stats_screen)
+
+        # Hidden metrics panel (Ctrl+Shift+D)
+        self.debug_panel = None
+        self.debug_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.debug_shortcut.activated.connect(self.toggle_debug_panel)
 
 
     # --------------------------------------------------
@@ -321,32 +489,78 @@ class MainWindow(QWidget):
         self.solo_container.hide()
         self.flex_container.hide()
         self.toggle_btn.hide()
+        self.history_btn.hide()
+        self.stats_btn.hide()
+        self.current_puuid = None
 
         if not name or not tag:
+            self.tasks.cancel("search")
+            self.set_search_loading(False)
             self.solo_container.show()
             self.solo_text.setText("Please enter both Name and Tag line")
             self.summoner_label.setText("")
             self.solo_emblem.clear()
             self.flex_emblem.clear()
-            self.solo_original_pixmap = None
-            self.flex_original_pixmap = None
+            self.solo_emblem_path = None
+            self.flex_emblem_path = None
             return
 
         self.summoner_label.setText(f"{name}\n#{tag}")
+        platform = self.platform_input.currentData() or platform_for_tag(tag, self.api.platform)
+
+        # Fetch in the background; a newer search supersedes this one
+        self.set_search_loading(True)
+        self.search_started = time.perf_counter()
+        self.tasks.submit(
+            "search",
+            lambda: self.fetch_ranked(name, tag, platform),
+            self.on_search_result,
+            self.on_search_error
+        )
 
-        status, puuid_or_error = self.api.get_puuid(name, tag)
+    def fetch_ranked(self, name, tag, platform):
+        """Runs on a worker thread. Returns (error_text, puuid, platform, ranked)."""
+        status, puuid_or_error = self.api.get_puuid(name, tag, platform)
         if status != 200:
-            self.solo_container.show()
-            self.solo_text.setText(f"Error getting PUUID:\n{puuid_or_error}")
-            return
+            return f"Error getting PUUID:\n{puuid_or_error}", None, platform, None
         puuid = puuid_or_error
 
-        status, ranked = self.api.get_ranked_data(puuid)
+        status, ranked = self.api.get_ranked_data(puuid, platform=platform)
         if status != 200:
+            return f"Error getting ranked data:\n{ranked}", puuid, platform, None
+        return None, puuid, platform, ranked
+
+    def set_search_loading(self, loading):
+        self.search_btn.setText("Searching..." if loading else "Search")
+        if loading:
+            self.solo_emblem.clear()
+            self.solo_emblem_path = None
             self.solo_container.show()
-            self.solo_text.setText(f"Error getting ranked data:\n{ranked}")
+            self.solo_text.setText("Loading...")
+
+    def on_search_error(self, error):
+        self.set_search_loading(False)
+        self.observe_search()
+        self.solo_container.show()
+        self.solo_text.setText(f"Error getting ranked data:\n{error}")
+
+    def observe_search(self):
+        """Time from clicking Search to the result being on screen."""
+        self.metrics.observe("ui_search_seconds", time.perf_counter() - self.search_started)
+
+    def on_search_result(self, result):
+        self.set_search_loading(False)
+        self.observe_search()
+        error, puuid, platform, ranked = result
+        if error:
+            self.solo_container.show()
+            self.solo_text.setText(error)
             return
         self.rank_data = ranked
+        self.current_puuid = puuid
+        self.current_platform = platform
+        self.history_btn.show()
+        self.stats_btn.show()
 
         # Solo rank
         solo = ranked.get("solo")
@@ -354,9 +568,9 @@ class MainWindow(QWidget):
             self.solo_container.show()
             tier = solo["tier"]
             emblem_path = get_emblem_path(tier)
-            self.solo_original_pixmap = QPixmap(emblem_path)
+            self.solo_emblem_path = emblem_path
             self.solo_emblem.clear()
-            QTimer.singleShot(0, self.scale_emblems)
+            self.schedule_layout()
             self.solo_text.setText(
                 f"{tier.title()} {solo['rank']} - {solo['leaguePoints']} LP\n"
                 f"Wins: {solo['wins']}  Losses: {solo['losses']}"
@@ -364,7 +578,7 @@ class MainWindow(QWidget):
         else:
             self.solo_container.show()
             self.solo_emblem.clear()
-            self.solo_original_pixmap = None
+            self.solo_emblem_path = None
             self.solo_text.setText("Solo/Duo\nUnranked")
 
         # Flex rank
@@ -373,9 +587,9 @@ class MainWindow(QWidget):
             self.flex_container.show()
             tier = flex["tier"]
             emblem_path = get_emblem_path(tier)
-            self.flex_original_pixmap = QPixmap(emblem_path)
+            self.flex_emblem_path = emblem_path
             self.flex_emblem.clear()
-            QTimer.singleShot(0, self.scale_emblems)
+            self.schedule_layout()
             self.flex_text.setText(
                 f"{tier.title()} {flex['rank']} - {flex['leaguePoints']} LP\n"
                 f"Wins: {flex['wins']}  Losses: {flex['losses']}"
@@ -385,10 +599,29 @@ class MainWindow(QWidget):
         else:
             self.flex_container.hide()
             self.flex_emblem.clear()
-            self.flex_original_pixmap = None
+            self.flex_emblem_path = None
             self.flex_text.setText("Flex\nUnranked")
             self.toggle_btn.hide()
 
+    # --------------------------------------------------
+    # Patch icon download progress
+    # --------------------------------------------------
+    def on_patch_progress(self, done, total):
+        if done < total:
+            self.setWindowTitle(f"League Summoner Tracker (downloading icons {done}/{total})")
+        else:
+            self.setWindowTitle("League Summoner Tracker")
+
+    def on_patch_refreshed(self, changed):
+        """A new patch can bring new art under the same icon paths: drop what's cached."""
+        if not changed:
+            return
+        self.pixmaps.clear()
+        self.icon_retry_at.clear()
+        if self.champ_select_latest is not None:
+            self.champ_snapshot = EMPTY_SNAPSHOT  # redraw every slot
+            self.render_champ_select(self.champ_select_latest)
+
     # --------------------------------------------------
     # Toggle flex
     # --------------------------------------------------
@@ -401,28 +634,405 @@ class MainWindow(QWidget):
             self.flex_container.show()
             self.toggle_btn.setText("Hide Flex Ranking")
             self.flex_visible = True
-            QTimer.singleShot(0, self.scale_emblems)
+            self.schedule_layout()
+
+    # --------------------------------------------------
+    # LP History Screen
+    # --------------------------------------------------
+    def on_show_history(self):
+        if not self.current_puuid:
+            return
+        self.history_title.setText(self.summoner_label.text().replace("\n", " "))
+
+        series = self.history.series(self.current_puuid, "solo")
+        queue = "solo"
+        if len(series) < 2:
+            flex_series = self.history.series(self.current_puuid, "flex")
+            if len(flex_series) > len(series):
+                series, queue = flex_series, "flex"
+        self.history_chart.set_points([(p["ts"], p["ladder"]) for p in series])
+
+        lines = []
+        now = time.time()
+        for label, queue_name in (("Solo/Duo", "solo"), ("Flex", "flex")):
+            parts = []
+            for period, seconds in (("7 days", 7 * 86400), ("30 days", 30 * 86400)):
+                change = self.history.delta(self.current_puuid, queue_name, since=now - seconds)
+                if change is None:
+                    break
+                lp = f"{change['lp']:+d} LP" if change["lp"] is not None else "? LP"
+                winrate = f", {change['winrate']:.0%} WR" if change["winrate"] is not None else ""
+                parts.append(f"{period}: {lp}, {change['wins']}W {change['losses']}L{winrate}")
+            if parts:
+                lines.append(f"{label}  " + "  |  ".join(parts))
+        chart_name = "Solo/Duo" if queue == "solo" else "Flex"
+        self.history_summary.setText(
+            f"{chart_name} LP over time\n" + ("\n".join(lines) if lines else "No history yet")
+        )
+        self.stack.setCurrentIndex(2)
+
+    def close_history(self):
+        self.stack.setCurrentIndex(0)
+
+    # --------------------------------------------------
+    # Match Stats Screen
+    # --------------------------------------------------
+    def on_show_stats(self):
+        if not self.current_puuid:
+            return
+        puuid = self.current_puuid
+        platform = self.current_platform
+        self.stats_title.setText(self.summoner_label.text().replace("\n", " "))
+        self.stats_summary.setText("Loading...")
+        self.stats_table.setRowCount(0)
+        self.stats_chart.set_points([])
+        self.stack.setCurrentIndex(3)
+
+        # Show what is stored right away, then fetch games played since the last sync
+        self.tasks.submit(
+            "stats",
+            lambda: self.compute_match_stats(puuid),
+            self.on_stats_result,
+            self.on_stats_error
+        )
+        if puuid not in self.synced_puuids:
+            self.tasks.submit(
+                "match_sync",
+                lambda: self.sync_match_stats(puuid, platform),
+                self.on_match_sync_result,
+                self.on_stats_error
+            )
+
+    def compute_match_stats(self, puuid):
+        """Runs on a worker thread. Returns (puuid, overall, champions, trend, syncing)."""
+        stats = PlayerStats.from_store(self.matches, puuid)
+        trend = stats.trend(window=20)
+        return (puuid, stats.overall(), stats.by_champion(),
+                list(zip(trend["ts"].tolist(), (trend["winrate"] * 100).round().astype(int).tolist())),
+                puuid not in self.synced_puuids)
+
+    def sync_match_stats(self, puuid, platform):
+        """Runs on a worker thread: store new games, then recompute."""
+        if self.match_ingester.ingest(puuid, platform) is not None:
+            self.synced_puuids.add(puuid)
+        return self.compute_match_stats(puuid)[:-1] + (False,)
+
+    def on_stats_result(self, result):
+        puuid, overall, champions, trend, syncing = result
+        if puuid != self.current_puuid:
+            return
+
+        if overall["games"]:
+            self.stats_summary.setText(
+                f"{overall['games']} games  |  {overall['winrate']:.0%} WR  |  "
+                f"{overall['kda']:.2f} KDA  |  {overall['cs_per_min']:.1f} CS/min  |  "
+                f"{overall['damage_share']:.0%} of team damage"
+                + ("\nSyncing recent games..." if syncing else "")
+            )
+        else:
+            self.stats_summary.setText("Syncing recent games..." if syncing else "No games stored yet")
+
+        self.stats_table.setRowCount(len(champions))
+        for row, champ in enumerate(champions):
+            cells = [
+                champ["champion"],
+                str(champ["games"]),
+                f"{champ['winrate']:.0%}",
+                f"{champ['kda']:.2f}",
+                f"{champ['cs_per_min']:.1f}",
+                f"{champ['damage_share']:.0%}",
+            ]
+            for col, text in enumerate(cells):
+                self.stats_table.setItem(row, col, QTableWidgetItem(text))
+        self.stats_chart.set_points(trend)
+
+    def on_match_sync_result(self, result):
+        if result[0] == self.current_puuid:
+            # The stored-only stats are older; don't let them land after these
+            self.tasks.cancel("stats")
+        self.on_stats_result(result)
+
+    def on_stats_error(self, error):
+        self.stats_summary.setText(f"Error loading match stats:\n{error}")
+
+    def close_stats(self):
+        self.tasks.cancel("stats")
+        self.stack.setCurrentIndex(0)
+
+    # --------------------------------------------------
+    # Debug panel (metrics)
+    # --------------------------------------------------
+    def toggle_debug_panel(self):
+        if self.debug_panel is None:
+            self.debug_panel = DebugPanel(self.metrics, parent=self)
+        self.debug_panel.setVisible(not self.debug_panel.isVisible())
 
     # --------------------------------------------------
     # Champ Select Screen
     # --------------------------------------------------
     def on_show_champ(self):
         self.stack.setCurrentIndex(1)
-        self.champ_timer.start()
+        self.start_champ_stream()
+        self.champ_timer.start()  # until the event stream is connected
         self.update_champ_select()
-        QTimer.singleShot(0, self.update_box_sizes)
+        self.schedule_layout()
 
 
     def go_back(self):
+        self.stop_champ_stream()
         self.champ_timer.stop()
-        self.reset_champ_select_styles()
+        self.tasks.cancel("champ_select")
+        self.tasks.cancel("scout")
+        self.tasks.cancel("icons")
+        self.clear_champ_select()
+        self.champ_select_active = None
         self.stack.setCurrentIndex(0)
 
+    def start_champ_stream(self):
+        if self.champ_stream is None:
+            self.champ_stream = self.league_client.subscribe_champ_select(
+                self.champ_session_pushed.emit,
+                self.champ_stream_state.emit
+            )
+
+    def stop_champ_stream(self):
+        if self.champ_stream is not None:
+            self.champ_stream.stop()
+            self.champ_stream = None
+
+    def on_champ_stream_state(self, connected):
+        if self.stack.currentIndex() != 1:
+            return
+        if connected:
+            # Events only carry changes: resync once, then stop polling
+            self.champ_timer.stop()
+            self.update_champ_select()
+        elif not self.champ_timer.isActive():
+            self.champ_timer.start()
+
+    def on_champ_session_pushed(self, data):
+        if self.stack.currentIndex() != 1:
+            return
+        self.tasks.submit(
+            "champ_select",
+            lambda: self.prepare_champ_select(200 if data else None, data),
+            self.render_champ_select
+        )
+
     def update_champ_select(self):
-        client = LeagueClient()
-        status, data = client.get_champ_select()
+        # Skip this tick if the previous poll is still waiting on the client
+        if self.tasks.is_busy("champ_select"):
+            return
+        self.tasks.submit(
+            "champ_select",
+            self.fetch_champ_select,
+            self.render_champ_select
+        )
+
+    def fetch_champ_select(self):
+        """Runs on a worker thread."""
+        status, data = self.league_client.get_champ_select()
+        return self.prepare_champ_select(status, data)
+
+    def prepare_champ_select(self, status, data):
+        """
+        Runs on a worker thread. Parses the session and makes sure every
+        icon it needs is on disk, so rendering never waits on the network.
+        Returns the snapshot, or None when not in champ select.
+        """
+        if status != 200 or not data:
+            return None
+        snapshot = ChampSelectSnapshot.from_session(data)
+        for slot in snapshot.blue_picks + snapshot.red_picks:
+            if slot.champion_id:
+                self.champ_data.get_champion_icon(slot.champion_id)
+            for spell_id in (slot.spell1_id, slot.spell2_id):
+                if spell_id:
+                    self.champ_data.get_spell_icon(spell_id)
+        for champ_id in snapshot.blue_bans + snapshot.red_bans:
+            if champ_id:
+                self.champ_data.get_champion_icon(champ_id)
+        return snapshot
+
+    def render_champ_select(self, snapshot):
+        with self.metrics.timer("ui_render_seconds", view="champ_select"):
+            self.apply_champ_select(snapshot)
+
+    def apply_champ_select(self, snapshot):
+        if self.stack.currentIndex() != 1:
+            return
+
+        if snapshot is None:
+            # No champ select: reset once, then nothing to do until it starts
+            if self.champ_select_active is not False:
+                self.champ_select_label.setText("Not in champ select.")
+                self.champ_select_label.show()
+                self.bans_container.hide()
+                self.picks_container.hide()
+                self.clear_champ_select()
+                self.champ_select_active = False
+            return
+
+        if not self.champ_select_active:
+            # Champ select started
+            self.champ_select_label.hide()
+            self.bans_container.show()
+            self.picks_container.show()
+            self.champ_select_active = True
+            self.schedule_layout()
+
+        # Only touch the labels whose pick, spell, ban or player changed
+        self.champ_select_latest = snapshot
+        new_players = []
+        unrendered = []
+        missing_icons = []
+        for kind, side, index, value in snapshot.changes(self.champ_snapshot):
+            drawn = True
+            if kind == "player":
+                labels = self.my_team_rank_labels if side == "blue" else self.enemy_team_rank_labels
+                labels[index].setText(self.scout_results.get(value, ""))
+                if value and value not in self.scout_results:
+                    new_players.append(value)
+            elif kind == "champ":
+                labels = self.my_team_champ_labels if side == "blue" else self.enemy_team_champ_labels
+                drawn = self.update_champ_label(labels[index], value, side)
+            elif kind == "ban":
+                labels = self.my_ban_labels if side == "blue" else self.enemy_ban_labels
+                drawn = self.update_champ_label(labels[index], value, side)
+            elif kind == "spell1":
+                labels = self.my_team_spell1_labels if side == "blue" else self.enemy_team_spell1_labels
+                drawn = self.update_spell_label(labels[index], value)
+            else:
+                labels = self.my_team_spell2_labels if side == "blue" else self.enemy_team_spell2_labels
+                drawn = self.update_spell_label(labels[index], value)
+            if not drawn:
+                unrendered.append((kind, side, index))
+                missing_icons.append(("spell" if kind.startswith("spell") else "champ", value))
+        # Remember only what is on screen: missing icons are retried next time
+        self.champ_snapshot = snapshot.with_unrendered(unrendered)
+        if missing_icons:
+            self.download_missing_icons(missing_icons)
+        if new_players:
+            self.start_scouting(new_players)
+
+    def download_missing_icons(self, keys):
+        """Fetch icons the labels couldn't show on a worker; redraw once they land."""
+        now = time.monotonic()
+        keys = {
+            key for key in keys
+            if key not in self.icon_fetching and self.icon_retry_at.get(key, 0) <= now
+        }
+        if not keys:
+            return
+        self.icon_fetching.update(keys)
+        # A job this supersedes may not have started; include its icons too
+        batch = list(self.icon_fetching)
+        self.tasks.submit("icons", lambda: self.download_icons(batch), self.on_icons_downloaded)
+
+    def download_icons(self, keys):
+        """Runs on a worker thread. Returns (keys, the keys whose icon is now on disk)."""
+        fetched = set()
+        for kind, icon_id in keys:
+            if kind == "champ":
+                icon_path = self.champ_data.get_champion_icon(icon_id)
+            else:
+                icon_path = self.champ_data.get_spell_icon(icon_id)
+            if icon_path:
+                fetched.add((kind, icon_id))
+        return keys, fetched
+
+    def on_icons_downloaded(self, result):
+        keys, fetched = result
+        self.icon_fetching.difference_update(keys)
+        retry_at = time.monotonic() + ICON_RETRY_DELAY
+        for key in keys:
+            if key not in fetched:
+                self.icon_retry_at[key] = retry_at
+        if fetched and self.champ_select_latest is not None:
+            self.render_champ_select(self.champ_select_latest)
 
-        # Reset all boxes first
+    # --------------------------------------------------
+    # Champ select scouting
+    # --------------------------------------------------
+    def start_scouting(self, puuids):
+        """Look up every newly visible player at once; results arrive in on_scout_result."""
+        if self.scouting.issuperset(puuids):
+            return
+        self.scouting.update(puuids)
+        # A job this supersedes may not have started; include its players too
+        batch = list(self.scouting)
+        # Everyone in the lobby plays on one server: the selected one, else the client's
+        platform = self.platform_input.currentData()
+        self.tasks.submit(
+            "scout",
+            lambda report: self.scout_players(batch, platform, report),
+            on_progress=self.on_scout_result
+        )
+
+    def scout_players(self, puuids, platform, report):
+        """
+        Runs on a worker thread. Reports (puuid, text) for every player,
+        text None if the lookup failed or was too slow.
+        """
+        platform = platform or self.league_client.get_platform()
+        pending = set(puuids)
+        for puuid, status, ranked in self.api.ranked_many(puuids, timeout=SCOUT_DEADLINE,
+                                                          platform=platform):
+            pending.discard(puuid)
+            report((puuid, self.scout_text(puuid, ranked) if status == 200 else None))
+        for puuid in pending:
+            report((puuid, None))
+
+    def scout_text(self, puuid, ranked):
+        solo = ranked.get("solo")
+        if solo:
+            games = solo["wins"] + solo["losses"]
+            lines = [
+                f"{solo['tier'].title()} {solo['rank']} {solo['leaguePoints']} LP",
+                f"{solo['wins'] / games:.0%} WR ({games})" if games else "",
+            ]
+        else:
+            lines = ["Unranked", ""]
+
+        # Recent form, when this player's games are in the local match store
+        wins = PlayerStats.from_store(self.matches, puuid).columns["win"][-10:]
+        if len(wins):
+            lines[1] = f"Last {len(wins)}: {int(wins.sum())}W {len(wins) - int(wins.sum())}L"
+        return "\n".join(line for line in lines if line)
+
+    def on_scout_result(self, result):
+        puuid, text = result
+        self.scouting.discard(puuid)
+        if text is None:
+            return  # failed or past the deadline: leave the slot blank
+        self.scout_results[puuid] = text
+        for players, labels in (
+            (self.champ_snapshot.blue_players, self.my_team_rank_labels),
+            (self.champ_snapshot.red_players, self.enemy_team_rank_labels),
+        ):
+            for index, player in enumerate(players):
+                if player == puuid:
+                    labels[index].setText(text)
+
+    def update_champ_label(self, lbl, champ_id, side):
+        """
+        Show a pick/ban champion icon, or reset the box when the slot is
+        empty. Returns False if the champion's icon isn't available.
+        """
+        icon_path = self.champ_data.find_champion_icon(champ_id) if champ_id else None
+        if icon_path:
+            self.label_icon_paths[lbl] = icon_path
+            self.scale_pixmap_to_label(lbl)
+            lbl.setStyleSheet(BOX_STYLES[side, True])
+            return True
+        self.label_icon_paths.pop(lbl, None)
+        lbl.clear()
+        lbl.setStyleSheet(BOX_STYLES[side, False])
+        return not champ_id
+
+    def clear_champ_select(self):
+        """Empty every pick/ban/spell box and forget the last rendered snapshot."""
+        self.reset_champ_select_styles()
         for lbl in (
             self.my_team_champ_labels +
             self.enemy_team_champ_labels +
@@ -434,158 +1044,30 @@ class MainWindow(QWidget):
             self.enemy_team_spell2_labels
         ):
             lbl.clear()
-
-
-        if status != 200 or not data:
-            # No champ select
-            self.champ_select_label.setText("Not in champ select.")
-            self.champ_select_label.show()
-            self.bans_container.hide()
-            self.picks_container.hide()
-
-            # NEW: fully reset pick/ban icons + styles
-            self.reset_champ_select_styles()
-
-            for lbl in (
-                self.my_team_champ_labels +
-                self.enemy_team_champ_labels +
-                self.my_ban_labels +
-                self.enemy_ban_labels +
-                self.my_team_spell1_labels +
-                self.my_team_spell2_labels +
-                self.enemy_team_spell1_labels +
-                self.enemy_team_spell2_labels
-            ):
-                lbl.clear()
-
-
-            return
-
-
-        # Champ select active
-        self.champ_select_label.hide()
-        self.bans_container.show()
-        self.picks_container.show()
-        QTimer.singleShot(0, self.update_box_sizes)
-
-
-        # Determine blue/red side
-        blue_team = []
-        red_team = []
-        for champ in data.get("myTeam", []) + data.get("theirTeam", []):
-            if champ.get("team") == 1:
-                blue_team.append(champ)
-            else:
-                red_team.append(champ)
-
-        # Blue team picks
-        for i, champ in enumerate(blue_team):
-            if i >= 5:
-                continue
-            icon_path = self.champ_data.get_champion_icon(champ.get("championId"))
-            if icon_path:
-                pix = QPixmap(icon_path)
-                lbl = self.my_team_champ_labels[i]   # FIXED
-                self.pick_original_pixmaps[lbl] = pix
-                self.scale_pixmap_to_label(lbl)
-                lbl.setStyleSheet("border:2px solid #0000ff; background-color: #ddeeff;")
-
-
-        
-        # BLUE TEAM SPELLS
-        for i, champ in enumerate(blue_team):
-            if i >= 5:
-                continue
-
-            spell1 = champ.get("spell1Id")
-            spell2 = champ.get("spell2Id")
-
-            self.update_spell_label(self.my_team_spell1_labels[i], spell1)
-            self.update_spell_label(self.my_team_spell2_labels[i], spell2)
-
-
-
-        # Red team picks
-        for i, champ in enumerate(red_team):
-            if i >= 5:
-                continue
-            icon_path = self.champ_data.get_champion_icon(champ.get("championId"))
-            if icon_path:
-                pix = QPixmap(icon_path)
-                lbl = self.enemy_team_champ_labels[i]  # FIXED
-                self.pick_original_pixmaps[lbl] = pix
-                self.scale_pixmap_to_label(lbl)
-                lbl.setStyleSheet("border:2px solid #ff0000; background-color: #ffdddd;")
-
-        
-        # RED TEAM SPELLS
-        for i, champ in enumerate(red_team):
-            if i >= 5:
-                continue
-
-            spell1 = champ.get("spell1Id")
-            spell2 = champ.get("spell2Id")
-
-            self.update_spell_label(self.enemy_team_spell1_labels[i], spell1)
-            self.update_spell_label(self.enemy_team_spell2_labels[i], spell2)
-
-
-
-
-        # Update bans properly
-        blue_ban_index = 0
-        red_ban_index = 4
-
-        for group in data.get("actions", []):
-            for action in group:
-                if action.get("type") != "ban" or not action.get("completed"):
-                    continue
-                champ_id = action.get("championId")
-                icon_path = self.champ_data.get_champion_icon(champ_id)
-                if not icon_path:
-                    continue
-                pix = QPixmap(icon_path)  # store original
-
-                team_side = 1 if action.get("isAllyAction") else 2
-                if team_side == 1 and blue_ban_index < 5:  # Blue side bans
-                    lbl = self.my_ban_labels[blue_ban_index]
-                    self.ban_original_pixmaps[lbl] = pix
-                    self.scale_pixmap_to_label(lbl)
-                    lbl.setStyleSheet("border:2px solid #0000ff; background-color: #ddeeff;")
-                    blue_ban_index += 1
-                elif team_side == 2 and red_ban_index >= 0:  # Red side bans
-                    lbl = self.enemy_ban_labels[red_ban_index]
-                    self.ban_original_pixmaps[lbl] = pix
-                    self.scale_pixmap_to_label(lbl)
-                    lbl.setStyleSheet("border:2px solid #ff0000; background-color: #ffdddd;")
-                    red_ban_index -= 1
+        for lbl in self.my_team_rank_labels + self.enemy_team_rank_labels:
+            lbl.setText("")
+        self.scout_results.clear()
+        self.scouting.clear()
+        self.champ_snapshot = EMPTY_SNAPSHOT
+        self.champ_select_latest = None
+        self.icon_fetching.clear()
+        self.icon_retry_at.clear()
 
     def update_spell_label(self, label, spell_id):
-        """Show/hide a spell icon without collapsing the layout."""
-        if not spell_id or spell_id == 0:
+        """
+        Show/hide a spell icon without collapsing the layout. Returns False
+        if the spell's icon isn't available.
+        """
+        icon_path = self.champ_data.find_spell_icon(spell_id) if spell_id else None
+        if icon_path:
+            self.label_icon_paths[label] = icon_path
+            self.scale_pixmap_to_label(label)
+        else:
             # Use a transparent pixmap to keep layout space
-            empty_pix = QPixmap(label.size())
-            empty_pix.fill(Qt.transparent)
-            label.setPixmap(empty_pix)
-            label.show()
-            return
-
-        icon_path = self.champ_data.get_spell_icon(spell_id)
-        if not icon_path:
-            # If icon not found, also fill with transparent
-            empty_pix = QPixmap(label.size())
-            empty_pix.fill(Qt.transparent)
-            label.setPixmap(empty_pix)
-            label.show()
-            return
-
-        pix = QPixmap(icon_path).scaled(
-            label.size(),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-        label.setPixmap(pix)
+            self.label_icon_paths.pop(label, None)
+            label.setPixmap(self.pixmaps.blank(label.width(), label.height()))
         label.show()
+        return bool(icon_path) or not spell_id
 
 
 
@@ -655,7 +1137,7 @@ class MainWindow(QWidget):
             except Exception:
                 pass
 
-        QTimer.singleShot(0, self.scale_emblems)
+        self.schedule_layout()
 
     def resizeEvent(self, event):
         # Track normal geometry when not maximized/fullscreen
@@ -668,24 +1150,36 @@ class MainWindow(QWidget):
 
         # Scale fonts
         self.scale_fonts()
-        
-        # Scale emblems (solo/flex)
-        QTimer.singleShot(0, self.scale_emblems)
-        
-        # Dynamically scale champion picks and bans
-        QTimer.singleShot(0, self.update_box_sizes)
-        
+
+        # Scale emblems (solo/flex) and champion picks/bans, once per event-loop turn
+        self.schedule_layout()
+
         super().resizeEvent(event)
 
 
     def eventFilter(self, obj, event):
         if event.type() == QEvent.Resize:
             if obj == self.solo_emblem or obj == self.flex_emblem:
-                QTimer.singleShot(0, self.scale_emblems)
+                self.schedule_layout()
         return super().eventFilter(obj, event)
 
+    def schedule_layout(self):
+        """Queue one layout pass; any number of calls before it runs coalesce."""
+        if not self.layout_pending:
+            self.layout_pending = True
+            QTimer.singleShot(0, self.run_layout_pass)
+
+    def run_layout_pass(self):
+        self.layout_pending = False
+        with self.metrics.timer("ui_render_seconds", view="layout"):
+            self.scale_emblems()
+            self.update_box_sizes()
+
     def scale_fonts(self):
         font_size = max(12, self.width() // 35)
+        if font_size == self.font_size:
+            return
+        self.font_size = font_size
         font = QFont(self.base_font)
         font.setPointSize(font_size)
         self.solo_text.setFont(font)
@@ -695,21 +1189,20 @@ class MainWindow(QWidget):
         self.summoner_label.setFont(font)
 
     def scale_emblems(self):
-        if self.solo_original_pixmap:
-            lw, lh = self.solo_emblem.width(), self.solo_emblem.height()
-            if lw > 1 and lh > 1:
-                scaled = self.solo_original_pixmap.scaled(
-                    QSize(lw, lh), Qt.KeepAspectRatio, Qt.SmoothTransformation
-                )
-                self.solo_emblem.setPixmap(scaled)
-
-        if self.flex_original_pixmap:
-            lw, lh = self.flex_emblem.width(), self.flex_emblem.height()  # <-- fix here
-            if lw > 1 and lh > 1:
-                scaled = self.flex_original_pixmap.scaled(
-                    QSize(lw, lh), Qt.KeepAspectRatio, Qt.SmoothTransformation
-                )
-                self.flex_emblem.setPixmap(scaled)
+        for label, emblem_path in (
+            (self.solo_emblem, self.solo_emblem_path),
+            (self.flex_emblem, self.flex_emblem_path),
+        ):
+            if not emblem_path:
+                continue
+            lw, lh = label.width(), label.height()
+            if lw <= 1 or lh <= 1:
+                continue
+            # Skip if this emblem is already shown at this size
+            if self.emblem_sizes.get(label) == (emblem_path, lw, lh) and not label.pixmap().isNull():
+                continue
+            label.setPixmap(self.pixmaps.scaled(emblem_path, lw, lh))
+            self.emblem_sizes[label] = (emblem_path, lw, lh)
 
 
     def update_box_sizes(self):
@@ -750,6 +1243,23 @@ class MainWindow(QWidget):
 
         # Compute spacing dynamically (min 5px)
         spacing = max(5, int(pick_size.height() * 0.1))
+
+        # Ban size ~ 75% of pick size
+        ban_size = QSize(int(ban_orig_w * pick_scale * 0.75), int(ban_orig_h * pick_scale * 0.75))
+
+        # Spell size: ~30% of pick box
+        spell_size = QSize(
+            int(pick_size.height() * 0.40),
+            int(pick_size.height() * 0.40)
+        )
+
+        # Same sizes as the last pass: nothing to resize or rescale
+        sizes = (pick_size.width(), pick_size.height(), ban_size.width(), ban_size.height(),
+                 spell_size.width(), spell_size.height(), spacing)
+        if sizes == self.box_sizes:
+            return
+        self.box_sizes = sizes
+
         self.blue_team_layout.setSpacing(spacing)
         self.red_team_layout.setSpacing(spacing)
 
@@ -759,8 +1269,7 @@ class MainWindow(QWidget):
 
             self.scale_pixmap_to_label(lbl)
 
-        # Ban size ~ 75% of pick size
-        ban_size = QSize(int(ban_orig_w * pick_scale * 0.75), int(ban_orig_h * pick_scale * 0.75))
+        # Apply ban sizes
         for lbl in self.my_ban_labels + self.enemy_ban_labels:
             lbl.setFixedSize(ban_size)
             self.scale_pixmap_to_label(lbl)
@@ -769,13 +1278,7 @@ class MainWindow(QWidget):
         self.picks_layout.setContentsMargins(0, spacing, 0, spacing)
         self.bans_layout.setContentsMargins(10, spacing, 10, spacing)
 
-        # Spell size: ~30% of pick box
-        spell_size = QSize(
-            int(pick_size.height() * 0.40),
-            int(pick_size.height() * 0.40)
-        )
-
-
+        # Apply spell sizes
         for lbl in self.my_team_spell1_labels + self.my_team_spell2_labels + \
                 self.enemy_team_spell1_labels + self.enemy_team_spell2_labels:
             lbl.setFixedSize(spell_size)
@@ -790,22 +1293,15 @@ class MainWindow(QWidget):
 
 
     def scale_pixmap_to_label(self, lbl):
-        # Picks
-        if lbl in self.pick_original_pixmaps:
-            pixmap = self.pick_original_pixmaps[lbl]
-        # Bans
-        elif lbl in self.ban_original_pixmaps:
-            pixmap = self.ban_original_pixmaps[lbl]
-        else:
-            pixmap = lbl.pixmap()
+        icon_path = self.label_icon_paths.get(lbl)
+        if icon_path:
+            lbl.setPixmap(self.pixmaps.scaled(icon_path, lbl.width(), lbl.height()))
+            return
 
-        if pixmap:
-            scaled = pixmap.scaled(
-                lbl.width(), lbl.height(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            lbl.setPixmap(scaled)
+        # Empty spell slots keep a transparent placeholder of the label's size
+        pixmap = lbl.pixmap()
+        if pixmap and not pixmap.isNull():
+            lbl.setPixmap(self.pixmaps.blank(lbl.width(), lbl.height()))
 
 
     def reset_champ_select_styles(self):
@@ -829,6 +1325,5 @@ class MainWindow(QWidget):
         for lbl in self.enemy_ban_labels:
             lbl.setStyleSheet(default_ban_red)
 
-        # Clear pixmap caches
-        self.pick_original_pixmaps.clear()
-        self.ban_original_pixmaps.clear()
+        # Forget which icons the labels showed (decoded pixmaps stay cached)
+        self.label_icon_paths.clear()
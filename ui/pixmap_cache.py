@@ -0,0 +1,97 @@
+# ui/pixmap_cache.py
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap
+
+
+class PixmapCache:
+    """
+    LRU cache of decoded icons for the GUI thread.
+
+    Two levels share one memory budget: the decoded original of an asset,
+    keyed by (asset, None), and its smooth-scaled variants, keyed by
+    (asset, width, height). In steady state a redraw is a dict lookup, with
+    no PNG decode and no SmoothTransformation. Assets are identified by
+    their icon path; read_bytes(asset), if given, can supply the encoded
+    image (e.g. from ChampionData's icon pack) instead of reading the file.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, read_bytes=None):
+        self.max_bytes = max_bytes
+        self.read_bytes = read_bytes
+        self._entries = OrderedDict()  # key -> (QPixmap, cost in bytes)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, asset):
+        """Decoded original pixmap of `asset`."""
+        key = (asset, None)
+        pixmap = self._lookup(key)
+        if pixmap is None:
+            data = self.read_bytes(asset) if self.read_bytes else None
+            if data:
+                pixmap = QPixmap()
+                pixmap.loadFromData(data)
+            else:
+                pixmap = QPixmap(asset)
+            self._store(key, pixmap)
+        return pixmap
+
+    def scaled(self, asset, width, height):
+        """`asset` scaled to fit width x height, keeping its aspect ratio."""
+        key = (asset, width, height)
+        pixmap = self._lookup(key)
+        if pixmap is None:
+            pixmap = self.get(asset).scaled(
+                width, height,
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation
+            )
+            self._store(key, pixmap)
+        return pixmap
+
+    def blank(self, width, height):
+        """Transparent placeholder, used to keep an empty label's layout space."""
+        key = (None, width, height)
+        pixmap = self._lookup(key)
+        if pixmap is None:
+            pixmap = QPixmap(max(width, 1), max(height, 1))
+            pixmap.fill(Qt.transparent)
+            self._store(key, pixmap)
+        return pixmap
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # ----------------------------------------------------
+    # LRU bookkeeping
+    # ----------------------------------------------------
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def _store(self, key, pixmap):
+        cost = pixmap.width() * pixmap.height() * max(pixmap.depth(), 1) // 8
+        if cost > self.max_bytes:
+            return  # would evict everything else; just don't keep it
+        self._entries[key] = (pixmap, cost)
+        self._bytes += cost
+        while self._bytes > self.max_bytes:
+            _, (_, old_cost) = self._entries.popitem(last=False)
+            self._bytes -= old_cost
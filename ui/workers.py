@@ -0,0 +1,103 @@
+# ui/workers.py
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class WorkerSignals(QObject):
+    # channel, generation, result / error message / progress update
+    finished = Signal(str, int, object)
+    failed = Signal(str, int, str)
+    progress = Signal(str, int, object)
+
+
+class Worker(QRunnable):
+    """
+    Runs fn() on a pool thread and reports back through WorkerSignals.
+    With `report`, fn is called as fn(report) and may call report(update)
+    any number of times.
+    """
+
+    def __init__(self, channel, generation, fn, report=False):
+        super().__init__()
+        self.setAutoDelete(False)  # TaskRunner owns it, so tryTake() stays safe
+        self.channel = channel
+        self.generation = generation
+        self.fn = fn
+        self.report = report
+        self.signals = WorkerSignals()
+
+    def _report(self, update):
+        self.signals.progress.emit(self.channel, self.generation, update)
+
+    def run(self):
+        try:
+            result = self.fn(self._report) if self.report else self.fn()
+        except Exception as e:
+            self.signals.failed.emit(self.channel, self.generation, str(e))
+        else:
+            self.signals.finished.emit(self.channel, self.generation, result)
+
+
+class TaskRunner(QObject):
+    """
+    Background jobs for the UI, grouped by channel ("search", "champ_select", ...).
+
+    Submitting to a channel supersedes whatever was submitted there before:
+    a job that hasn't started yet is dropped from the queue, and the result
+    of one that is already running is discarded. Callbacks always run on
+    the GUI thread. Jobs submitted with on_progress get a report()
+    callable; their updates are discarded the same way.
+    """
+
+    def __init__(self, parent=None, max_threads=4):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._generation = {}  # channel -> latest generation
+        self._pending = {}     # (channel, generation) -> (worker, on_result, on_error, on_progress)
+
+    def submit(self, channel, fn, on_result=None, on_error=None, on_progress=None):
+        self.cancel(channel)
+        generation = self._generation.get(channel, 0) + 1
+        self._generation[channel] = generation
+
+        worker = Worker(channel, generation, fn, report=on_progress is not None)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+        worker.signals.progress.connect(self._on_progress)
+        self._pending[channel, generation] = (worker, on_result, on_error, on_progress)
+        self.pool.start(worker)
+        return generation
+
+    def cancel(self, channel):
+        """Drop the channel's current job; its result will never be delivered."""
+        generation = self._generation.get(channel)
+        if generation is None:
+            return
+        self._generation[channel] = generation + 1
+        pending = self._pending.get((channel, generation))
+        if pending and self.pool.tryTake(pending[0]):
+            del self._pending[channel, generation]
+
+    def is_busy(self, channel):
+        return (channel, self._generation.get(channel)) in self._pending
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    @Slot(str, int, object)
+    def _on_finished(self, channel, generation, result):
+        pending = self._pending.pop((channel, generation), None)
+        if pending and self._generation.get(channel) == generation and pending[1]:
+            pending[1](result)
+
+    @Slot(str, int, str)
+    def _on_failed(self, channel, generation, error):
+        pending = self._pending.pop((channel, generation), None)
+        if pending and self._generation.get(channel) == generation and pending[2]:
+            pending[2](error)
+
+    @Slot(str, int, object)
+    def _on_progress(self, channel, generation, update):
+        pending = self._pending.get((channel, generation))
+        if pending and self._generation.get(channel) == generation:
+            pending[3](update)
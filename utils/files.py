@@ -0,0 +1,27 @@
+import os
+import tempfile
+
+
+def write_atomic(path, content):
+    """
+    Write a file via a temp file + rename, so readers never see half of it.
+    Every call gets its own temp file next to `path`, so concurrent writers
+    of the same file don't clobber each other; the last rename wins.
+    """
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{name}.", suffix=".tmp", dir=directory or ".")
+    try:
+        if isinstance(content, bytes):
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+        else:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates it owner-only
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,238 @@
+# watch.py
+"""
+Headless watchlist refresher (no Qt).
+
+    python watch.py watchlist.txt --interval 600 --concurrency 8
+
+The watchlist has one Riot ID ("Name#TAG") per line; blank lines and lines
+starting with "#" are ignored. Each account is looked up on the server its
+tagline names ("EUW", "NA1", "KR1", ...), or on --platform. The watchlist
+is read again every cycle, so it can be edited while the watcher runs; a
+cycle in which it can't be read is skipped. Every cycle, accounts whose
+last successful refresh is older than --interval are looked up concurrently
+through RiotAPI (which shares the rate limiter), each result is appended as
+one JSON line to --output, and snapshots are stored in RankedHistory. The
+time of each account's last successful refresh is kept in --state, so a
+restarted watcher picks up where it stopped. With --matches, the match
+history of every refreshed account is synced too (see api.match_ingest).
+With --metrics, request latencies, status codes, cache hit ratios and
+rate-limit waits are written there in Prometheus text format after every
+cycle (for node_exporter's textfile collector). Ctrl+C / SIGTERM finish the
+current result, save the state and exit.
+"""
+import argparse
+import json
+import os
+import signal
+import threading
+import time
+
+from utils.files import write_atomic
+from api.match_ingest import MatchIngester
+from api.ranked_history import RankedHistory
+from api.response_cache import ResponseCache
+from api.riot_api import RiotAPI
+from api.routing import DEFAULT_PLATFORM
+
+# Seconds before an unreadable watchlist (e.g. mid-save) is tried again
+WATCHLIST_RETRY = 5.0
+
+
+def read_watchlist(path):
+    """Riot IDs from a watchlist file as (name, tag) pairs, duplicates removed."""
+    riot_ids = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if "#" not in line:
+                print(f"Skipping watchlist entry without a tag: {line}")
+                continue
+            name, tag = line.rsplit("#", 1)
+            riot_ids.append((name.strip(), tag.strip()))
+    return list(dict.fromkeys(riot_ids))
+
+
+class Watcher:
+    def __init__(self, watchlist_path, interval=600, concurrency=8,
+                 output_path=os.path.join("assets", "watch_results.jsonl"),
+                 state_path=os.path.join("assets", "watch_state.json"),
+                 api=None, history=None, ingester=None, clock=time.time, metrics_path=None):
+        self.watchlist_path = watchlist_path
+        self.interval = interval
+        self.concurrency = concurrency
+        self.output_path = output_path
+        self.state_path = state_path
+        self.api = api or RiotAPI(max_workers=concurrency, cache=ResponseCache())
+        self.history = history or RankedHistory()
+        self.ingester = ingester  # optional MatchIngester
+        self.metrics_path = metrics_path  # optional Prometheus textfile
+        self._clock = clock
+        self.stop_event = threading.Event()
+        self.state = self.read_state()  # "Name#TAG" -> ts of last successful refresh
+        self.attempted = {}  # "Name#TAG" -> ts of last lookup this run, failed ones included
+        self.riot_ids = None  # watchlist as of the last cycle, None if it couldn't be read
+
+        for path in (output_path, state_path, metrics_path or ""):
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # ----------------------------------------------------
+    # Resume state
+    # ----------------------------------------------------
+    def read_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def write_state(self):
+        try:
+            write_atomic(self.state_path, json.dumps(self.state, indent=2))
+        except OSError as e:
+            print("Failed to write watch state:", e)
+
+    # ----------------------------------------------------
+    # Scheduling
+    # ----------------------------------------------------
+    def last_refresh(self, riot_id):
+        # A failed lookup also waits an interval before it is retried
+        return max(self.state.get(riot_id, 0), self.attempted.get(riot_id, 0))
+
+    def due(self, riot_ids, now):
+        """Riot IDs not looked up within the last interval."""
+        return [
+            (name, tag) for name, tag in riot_ids
+            if now - self.last_refresh(f"{name}#{tag}") >= self.interval
+        ]
+
+    def run_cycle(self):
+        """Refresh every due account once. Returns (refreshed, failed)."""
+        try:
+            self.riot_ids = read_watchlist(self.watchlist_path)
+        except OSError as e:
+            print("Failed to read watchlist, skipping this cycle:", e)
+            self.riot_ids = None
+            return 0, 0
+
+        now = self._clock()
+        due = self.due(self.riot_ids, now)
+        if not due:
+            return 0, 0
+
+        refreshed = failed = 0
+        snapshots = []
+        results = self.api.lookup_many(due, max_workers=self.concurrency, fresh=True)
+        try:
+            with open(self.output_path, "a", encoding="utf-8") as out:
+                for (name, tag), status, data in results:
+                    ts = int(self._clock())
+                    riot_id = f"{name}#{tag}"
+                    record = {"ts": ts, "riot_id": riot_id, "status": status}
+                    self.attempted[riot_id] = ts
+                    if status == 200:
+                        record.update(puuid=data["puuid"], platform=data["platform"],
+                                      solo=data["solo"], flex=data["flex"])
+                        snapshots.append((data["puuid"], data, ts))
+                        self.state[riot_id] = ts
+                        refreshed += 1
+                    else:
+                        record["error"] = data
+                        failed += 1
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                    if self.stop_event.is_set():
+                        break
+        finally:
+            results.close()  # cancels lookups that haven't started yet
+            if snapshots:
+                self.history.record_many(snapshots)
+            self.write_state()
+
+        if self.ingester and snapshots and not self.stop_event.is_set():
+            by_platform = {}
+            for _, data, _ in snapshots:
+                by_platform.setdefault(data["platform"], []).append(data["puuid"])
+            new = 0
+            for platform, puuids in by_platform.items():
+                synced = self.ingester.ingest_many(puuids, platform)
+                new += sum(len(ids) for ids in synced.values() if ids)
+            if new:
+                print(f"Stored {new} new match(es)")
+        return refreshed, failed
+
+    def write_metrics(self):
+        if not self.metrics_path:
+            return
+        try:
+            write_atomic(self.metrics_path, self.api.metrics.to_prometheus())
+        except OSError as e:
+            print("Failed to write metrics:", e)
+
+    def run(self, once=False):
+        while not self.stop_event.is_set():
+            started = self._clock()
+            refreshed, failed = self.run_cycle()
+            if refreshed or failed:
+                print(f"Refreshed {refreshed} account(s), {failed} failed "
+                      f"in {self._clock() - started:.1f}s")
+            self.write_metrics()
+            if once:
+                break
+            # Wake up for the next account that becomes due, at most one interval away
+            self.stop_event.wait(self.next_wakeup() - self._clock())
+
+    def next_wakeup(self):
+        now = self._clock()
+        if self.riot_ids is None:
+            return now + min(WATCHLIST_RETRY, self.interval)
+        pending = [self.last_refresh(f"{n}#{t}") + self.interval for n, t in self.riot_ids]
+        return max(min(pending, default=now + self.interval), now + 1)
+
+    def stop(self, *_):
+        self.stop_event.set()
+
+    def close(self):
+        self.history.close()
+        if self.ingester:
+            self.ingester.store.close()
+        if self.api.cache:
+            self.api.cache.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh ranked data for a watchlist of Riot IDs.")
+    parser.add_argument("watchlist", help="file with one Name#TAG per line")
+    parser.add_argument("--interval", type=float, default=600,
+                        help="seconds between refreshes of the same account (default 600)")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="lookups in flight at once (default 8)")
+    parser.add_argument("--output", default=os.path.join("assets", "watch_results.jsonl"),
+                        help="JSONL file results are appended to")
+    parser.add_argument("--state", default=os.path.join("assets", "watch_state.json"),
+                        help="file with each account's last refresh time, for resuming")
+    parser.add_argument("--platform", default=DEFAULT_PLATFORM,
+                        help="server for Riot IDs whose tagline doesn't name one (default euw1)")
+    parser.add_argument("--matches", action="store_true",
+                        help="also sync the match history of refreshed accounts")
+    parser.add_argument("--metrics", help="file to write Prometheus metrics to after every cycle")
+    parser.add_argument("--once", action="store_true", help="run one cycle and exit")
+    args = parser.parse_args()
+
+    api = RiotAPI(max_workers=args.concurrency, cache=ResponseCache(), platform=args.platform)
+    ingester = MatchIngester(api, max_workers=args.concurrency) if args.matches else None
+    watcher = Watcher(args.watchlist, interval=args.interval, concurrency=args.concurrency,
+                      output_path=args.output, state_path=args.state,
+                      api=api, ingester=ingester, metrics_path=args.metrics)
+    signal.signal(signal.SIGINT, watcher.stop)
+    signal.signal(signal.SIGTERM, watcher.stop)
+    try:
+        watcher.run(once=args.once)
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    main()